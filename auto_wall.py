@@ -210,10 +210,6 @@ def main():
         import cv2
         print(f"OpenCV version: {cv2.__version__}")
         
-        update_splash("Loading scikit-learn...")
-        import sklearn
-        print(f"scikit-learn version: {sklearn.__version__}")
-        
         update_splash("Initializing UI...")
         
         # Import the application
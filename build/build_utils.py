@@ -132,7 +132,6 @@ def get_pyinstaller_args(platform: str) -> Tuple[List[str], List[str]]:
         "--distpath=dist",
         "--workpath=build/pyinstaller_work",
         "--collect-all=cv2",
-        "--collect-all=sklearn",
         "--collect-all=numpy",
         "--collect-all=PIL",
         "--collect-all=onnxruntime",
@@ -146,11 +145,6 @@ def get_pyinstaller_args(platform: str) -> Tuple[List[str], List[str]]:
     ]
     
     hidden_imports = [
-        "sklearn.neighbors._partition_nodes",
-        "sklearn.utils._typedefs",
-        "sklearn.utils._heap",
-        "sklearn.utils._sorting",
-        "sklearn.tree._utils",
         "scipy.stats",
         "scipy.sparse.csgraph._validation",
     ]
@@ -57,16 +57,14 @@ def build_macos_app():
 
         # Essential modules for the application
         hidden_imports = [
-            'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'cv2', 'numpy',
-            'sklearn.neighbors._typedefs', 'sklearn.neighbors._partition_nodes',
-            'sklearn.utils._heap', 'sklearn.utils._sorting', 'sklearn.tree._utils'
+            'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'cv2', 'numpy'
         ]
 
         # Fully bundle data files, submodules, and dist-info metadata.
         # rembg/pymatting read their own version via importlib.metadata at
         # import time, so the metadata must be present.
         collect_all_packages = [
-            'cv2', 'sklearn', 'numpy', 'PIL', 'onnxruntime', 'rembg', 'pymatting'
+            'cv2', 'numpy', 'PIL', 'onnxruntime', 'rembg', 'pymatting'
         ]
 
         # Build PyInstaller command - using native macOS app bundle creation
@@ -335,6 +335,7 @@ class BackgroundRemover:
 
     def _on_finished(self, result):
         self.app.bg_removed_image = result
+        self.app.image_processor.invalidate_pipeline_cache()
         if hasattr(self.app, 'bg_removal_panel'):
             self.app.bg_removal_panel.on_removal_finished()
         if hasattr(self.app, 'bg_removal_checkbox') and self.app.bg_removal_checkbox.isChecked():
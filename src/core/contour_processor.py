@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 
 from src.wall_detection.detector import draw_walls
+from src.wall_detection.light_detector import draw_lights_on_image
 from src.wall_detection.mask_editor import thin_contour, thicken_contour
 
 class ContourProcessor:
@@ -56,7 +57,6 @@ class ContourProcessor:
             # Re-draw lights if they exist and light detection is enabled
             if (hasattr(self.app, 'current_lights') and self.app.current_lights and 
                 hasattr(self.app, 'enable_light_detection') and self.app.enable_light_detection.isChecked()):
-                from src.wall_detection.light_detector import draw_lights_on_image
                 
                 # Scale lights to match the display image if necessary
                 lights_to_draw = self.app.current_lights.copy()
@@ -95,7 +95,6 @@ class ContourProcessor:
             # Re-draw lights even when no contours exist
             if (hasattr(self.app, 'current_lights') and self.app.current_lights and 
                 hasattr(self.app, 'enable_light_detection') and self.app.enable_light_detection.isChecked()):
-                from src.wall_detection.light_detector import draw_lights_on_image
                 
                 # Scale lights to match the display image if necessary
                 lights_to_draw = self.app.current_lights.copy()
@@ -145,21 +144,39 @@ class ContourProcessor:
         self.app.selection_manager.clear_selection()
         self.update_display_from_contours()
 
+    def _contour_roi_mask(self, contour, padding=2):
+        """Fill contour into a mask covering only its bounding box.
+
+        The box is padded and clipped to the working image, so the mask holds
+        exactly what a full-image mask would around the contour.
+
+        Returns:
+            Tuple (mask, offset), where offset is the int32 (x, y) of the mask's
+            top-left corner in image coordinates
+        """
+        height, width = self.app.current_image.shape[:2]
+        x, y, w, h = cv2.boundingRect(contour)
+        x0, y0 = max(x - padding, 0), max(y - padding, 0)
+        x1, y1 = min(x + w + padding, width), min(y + h + padding, height)
+        offset = np.array([x0, y0], dtype=np.int32)
+        mask = np.zeros((max(y1 - y0, 1), max(x1 - x0, 1)), dtype=np.uint8)
+        cv2.drawContours(mask, [contour - offset], -1, 255, -1)
+        return mask, offset
+
     def thin_selected_contour(self, contour):
         """Thin a single contour using morphological thinning.
 
         Returns a list of contours (thinning may split one contour into multiple).
         """
-        # Create a mask for the contour
-        mask = np.zeros(self.app.current_image.shape[:2], dtype=np.uint8)
-        cv2.drawContours(mask, [contour], -1, 255, -1)
+        # Create a mask for the contour, cropped to its bounding box
+        mask, offset = self._contour_roi_mask(contour)
 
         # Apply the thinning operation using the imported function
         # Pass the current target width and max iterations settings
         thinned_contours = thin_contour(mask, target_width=self.app.target_width, max_iterations=self.app.max_iterations)
 
         if thinned_contours is not None:
-            return thinned_contours
+            return [c + offset for c in thinned_contours]
         else:
             return [contour]
 
@@ -192,13 +209,12 @@ class ContourProcessor:
 
         Returns a list of contours (dilation may merge nearby regions).
         """
-        mask = np.zeros(self.app.current_image.shape[:2], dtype=np.uint8)
-        cv2.drawContours(mask, [contour], -1, 255, -1)
+        mask, offset = self._contour_roi_mask(contour)
 
         thickened_contours = thicken_contour(mask, target_width=self.app.target_width, max_iterations=self.app.max_iterations)
 
         if thickened_contours is not None:
-            return thickened_contours
+            return [c + offset for c in thickened_contours]
         else:
             return [contour]
 
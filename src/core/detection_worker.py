@@ -0,0 +1,288 @@
+import logging
+import threading
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.wall_detection.detector import (
+    detect_walls, blurred_grayscale, edge_components, color_contours, merge_contours,
+    split_edge_contours, remove_hatching_lines, detect_lights_in_image,
+)
+from src.wall_detection import _kernels
+from src.utils import _geom
+from src.utils.performance import PerformanceTimer, ImageCache, fast_hash
+from src.utils.debug_logger import PIPELINE_LOGGER_NAME
+
+logger = logging.getLogger(PIPELINE_LOGGER_NAME)
+
+
+def _filter_by_area(contours, min_area):
+    """Split contours by area in one pass.
+
+    Returns:
+        Tuple (kept contours with area >= min_area, number filtered out)
+    """
+    if not contours:
+        return [], 0
+    areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+    keep = np.flatnonzero(areas >= min_area)
+    return [contours[i] for i in keep], len(contours) - len(keep)
+
+
+def run_detection_pipeline(params, worker=None):
+    """Run the wall/light detection pipeline on a snapshot of the UI parameters.
+
+    Only touches the arrays and plain values in params, never Qt widgets, so it
+    is safe to call from a worker thread.
+
+    Returns:
+        Tuple (processed_image, contours, lights) at working resolution, or
+        None if the worker received a newer request and the run was abandoned
+    """
+    # Every stage below returns new arrays, so the snapshot is only read
+    processed_image = params['image']
+    working_min_area = params['working_min_area']
+
+    # Apply hatching removal if enabled
+    if params['hatching'] is not None:
+        hatching_color_bgr, hatching_threshold, hatching_width = params['hatching']
+        logger.debug("Removing hatching lines: Color=%s, Threshold=%.1f, Width=%s",
+                     hatching_color_bgr, hatching_threshold, hatching_width)
+        processed_image = remove_hatching_lines(
+            processed_image,
+            hatching_color_bgr,
+            hatching_threshold,
+            hatching_width
+        )
+
+    if worker is not None and worker.superseded():
+        return None
+
+    wall_colors_with_thresholds = params['wall_colors']
+    if wall_colors_with_thresholds:
+        logger.debug("Using %d colors for detection with individual thresholds", len(wall_colors_with_thresholds))
+
+    # Create cache key for detection parameters
+    detection_params = {
+        'working_min_area': working_min_area,
+        'blur': params['blur'],
+        'canny1': params['canny1'],
+        'canny2': params['canny2'],
+        'edge_margin': params['edge_margin'],
+        'wall_colors': wall_colors_with_thresholds,
+        'default_threshold': params['default_threshold'],
+        'merge_contours': params['merge_contours'],
+        'min_merge_distance': params['min_merge_distance'],
+        'hatching_enabled': params['hatching'] is not None,
+        'hatching_params': params['hatching'],
+        'bg_removal_enabled': params['bg_removal_enabled'],
+        # Hash the first 1KB for speed; slice before tobytes() so only those bytes are copied
+        'image_hash': fast_hash(processed_image.ravel()[:1000].tobytes())
+    }
+
+    cache_key = fast_hash(tuple(sorted(detection_params.items())))
+
+    # Check cache first
+    cached_result = worker.detection_cache.get(cache_key) if worker is not None else None
+    if cached_result is not None and worker.last_detection_params == detection_params:
+        logger.debug("[CACHE] Using cached detection result")
+        contours = cached_result
+    else:
+        # Reuse the area-independent stages of this image: the edge components
+        # while only the area or margin change (the blur while only Canny
+        # changes), or the colour contours while only the area changes
+        components = color_regions = None
+        if worker is not None:
+            if wall_colors_with_thresholds is not None:
+                color_regions = worker.color_regions_for(
+                    params['image'], params['hatching'], wall_colors_with_thresholds,
+                    params['default_threshold'], processed_image)
+            else:
+                components = worker.components_for(
+                    params['image'], params['hatching'], params['blur'],
+                    params['canny1'], params['canny2'], processed_image)
+        
+        # Process the image directly with detect_walls
+        with PerformanceTimer("Wall detection"):
+            contours = detect_walls(
+                processed_image,
+                min_contour_area=working_min_area,
+                max_contour_area=None,
+                blur_kernel_size=params['blur'],
+                canny_threshold1=params['canny1'],
+                canny_threshold2=params['canny2'],
+                edge_margin=params['edge_margin'],
+                wall_colors=wall_colors_with_thresholds,
+                color_threshold=params['default_threshold'],
+                components=components,
+                color_regions=color_regions
+            )
+
+        # Cache the result
+        if worker is not None:
+            worker.detection_cache.put(cache_key, contours.copy() if contours else [])
+            worker.last_detection_params = detection_params
+
+    logger.debug("Detected %d contours before merging", len(contours))
+
+    if worker is not None and worker.superseded():
+        return None
+
+    # Merge before Min Area if specified
+    if params['merge_contours']:
+        contours = merge_contours(
+            processed_image,
+            contours,
+            min_merge_distance=params['min_merge_distance']
+        )
+        logger.debug("After merge before min area: %d contours", len(contours))
+
+    # Filter contours by area BEFORE splitting edges
+    contours, _ = _filter_by_area(contours, working_min_area)
+    logger.debug("After min area filter: %d contours", len(contours))
+
+    # Split contours that touch image edges AFTER area filtering, but only if not in color detection mode
+    if not params['color_detection']:
+        split_contours = split_edge_contours(processed_image, contours)
+
+        # Use a much lower threshold for split contours to keep them all
+        # Use absolute minimum value instead of relative to min_area
+        min_split_area = 5.0 * (params['scale_factor'] * params['scale_factor'])  # Scale with image
+        contours, filtered_count = _filter_by_area(split_contours, min_split_area)
+        logger.debug("After edge splitting: kept %d, filtered %d tiny fragments", len(contours), filtered_count)
+
+    # Light detection - only perform if enabled
+    current_lights = []
+    if params['lights'] is not None:
+        if worker is not None and worker.superseded():
+            return None
+        brightness_threshold, light_min_area, light_max_area, light_merge_distance, light_colors = params['lights']
+        with PerformanceTimer("Light detection"):
+            current_lights = detect_lights_in_image(
+                processed_image,
+                brightness_threshold=brightness_threshold,
+                min_area=light_min_area,
+                max_area=light_max_area,
+                enable_lights=True,
+                grid_size=70.0,
+                light_colors=light_colors if light_colors else None,
+                merge_distance=light_merge_distance,
+                scale_factor=params['scale_factor']
+            )
+
+    return processed_image, contours, current_lights
+
+
+class DetectionWorker(QObject):
+    """Runs the detection pipeline on a persistent thread.
+
+    Requests go through a single-slot mailbox: submitting while a run is in
+    progress replaces any older pending request, so only the latest slider
+    state is ever processed after the current run finishes. A run in
+    progress checks superseded() between pipeline stages and is abandoned
+    as soon as a newer request arrives.
+    """
+    resultReady = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        self._clear_cache = False
+        self._stopped = False
+
+        # Only touched from the worker thread
+        self.detection_cache = ImageCache(max_size=8)
+        self.last_detection_params = None
+        self._reset_stage_caches()
+
+    def _reset_stage_caches(self):
+        self._stage_source = None  # (source image, hatching params) the stage caches are for
+        self._blur_cache = {}  # blur kernel size -> blurred grayscale
+        self._components = None  # ((blur, canny1, canny2), edge components)
+        self._color_regions = None  # ((wall colours, default threshold), colour contours)
+
+    def _use_stage_source(self, source_image, hatching):
+        """Drop the stage caches if they were built for another image or hatching setting."""
+        if (self._stage_source is None or self._stage_source[0] is not source_image
+                or self._stage_source[1] != hatching):
+            self._reset_stage_caches()
+            self._stage_source = (source_image, hatching)
+
+    def blurred_for(self, source_image, hatching, blur, processed_image):
+        """Blurred grayscale of processed_image, reused per blur size for the same source."""
+        self._use_stage_source(source_image, hatching)
+        blurred = self._blur_cache.get(blur)
+        if blurred is None:
+            blurred = self._blur_cache[blur] = blurred_grayscale(processed_image, blur)
+        return blurred
+
+    def components_for(self, source_image, hatching, blur, canny1, canny2, processed_image):
+        """Edge components of processed_image, reused while only area or margin change."""
+        blurred = self.blurred_for(source_image, hatching, blur, processed_image)
+        key = (blur, canny1, canny2)
+        if self._components is None or self._components[0] != key:
+            self._components = (key, edge_components(blurred, canny1, canny2))
+        return self._components[1]
+
+    def color_regions_for(self, source_image, hatching, wall_colors, default_threshold, processed_image):
+        """Colour contours of processed_image, reused while only the area changes."""
+        self._use_stage_source(source_image, hatching)
+        key = (wall_colors, default_threshold)
+        if self._color_regions is None or self._color_regions[0] != key:
+            self._color_regions = (key, color_contours(processed_image, wall_colors, default_threshold))
+        return self._color_regions[1]
+
+    def submit(self, request_id, params):
+        """Queue params for processing, dropping any older pending request."""
+        with self._lock:
+            self._pending = (request_id, params)
+        self._wake.set()
+
+    def superseded(self):
+        """True once a newer request is waiting or the worker is stopping."""
+        return self._pending is not None or self._stopped
+
+    def clear_cache(self):
+        """Ask the worker to drop its detection cache before the next run."""
+        with self._lock:
+            self._clear_cache = True
+
+    def stop(self):
+        """Make run() return after the current job."""
+        self._stopped = True
+        self._wake.set()
+
+    def run(self):
+        # JIT-compile the numba kernels here rather than on the GUI thread
+        _kernels.warm_up()
+        _geom.warm_up()
+        while not self._stopped:
+            self._wake.wait()
+            with self._lock:
+                self._wake.clear()
+                job, self._pending = self._pending, None
+                clear_cache, self._clear_cache = self._clear_cache, False
+
+            if clear_cache:
+                self.detection_cache.clear()
+                self.last_detection_params = None
+                self._reset_stage_caches()
+
+            if job is None or self._stopped:
+                continue
+
+            request_id, params = job
+            try:
+                with PerformanceTimer("Detection pipeline"):
+                    result = run_detection_pipeline(params, self)
+            except Exception as e:
+                self.error.emit(request_id, str(e))
+                continue
+            if result is None:
+                logger.debug("[DETECT] Request %d superseded, abandoned", request_id)
+                continue
+            self.resultReady.emit(request_id, result)
@@ -1,29 +1,76 @@
 import os
+import copy
+import logging
+from collections import OrderedDict
 import cv2
-import urllib.request
-import requests
+import urllib.parse
 import io
 import numpy as np
 
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication
 from src.wall_detection.image_utils import load_image, convert_to_rgb, save_image
-from src.wall_detection.detector import detect_walls, draw_walls, merge_contours, split_edge_contours, remove_hatching_lines, detect_lights_in_image
+from src.wall_detection.detector import draw_walls, detect_lights_in_image
 from src.wall_detection.light_detector import draw_lights_on_image
 from src.wall_detection.mask_editor import blend_image_with_mask
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread
 from PyQt6.QtGui import QPixmap, QImage, QColor
-from src.utils.performance import PerformanceTimer, debounce, ImageCache, fast_hash
+from src.utils.performance import debounce
+from src.core.detection_worker import DetectionWorker
+from src.utils.debug_logger import PIPELINE_LOGGER_NAME
+
+pipeline_logger = logging.getLogger(PIPELINE_LOGGER_NAME)
 
 class ImageProcessor:
     def __init__(self, app):
         self.app = app
-        # Initialize performance optimizations
-        self.detection_cache = ImageCache(max_size=8)
-        self.last_detection_params = None
+        # Detection runs on a persistent worker thread, started on first use
+        self.detection_thread = None
+        self.detection_worker = None
+        self._detection_request_id = 0
+        self._pending_detections = {}
+        
+        # RGB scratch buffer and the QImage viewing it, reused across redraws
+        self._display_buf = None
+        self._display_qimg = None
+        
+        # Memoized results of the full detection pipeline, keyed by every input
+        # that affects the output, so slider round-trips skip re-detection
+        self._pipeline_cache = OrderedDict()
+        self._pipeline_cache_size = 8
+        
+        # Working images already made from the current original, keyed by
+        # 'full' or the max working dimension, so resolution toggles don't resize
+        self._working_cache = {}
+        self._working_cache_source = None
+        
+        # (bgr, threshold) pairs per colour list widget, dropped whenever the
+        # list's model reports a change
+        self._color_list_cache = {}
         
         # Create debounced version of update_image
         self.debounced_update = debounce(delay_ms=250)(self._update_image_internal)
 
+    def _color_list_bgr(self, list_widget):
+        """(bgr, threshold) pairs for the colours in list_widget, rebuilt only after it changes."""
+        cached = self._color_list_cache.get(list_widget)
+        if cached is not None:
+            return cached
+        if list_widget not in self._color_list_cache:
+            model = list_widget.model()
+            invalidate = lambda *_: self._color_list_cache.__setitem__(list_widget, None)
+            for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved,
+                           model.dataChanged, model.modelReset):
+                signal.connect(invalidate)
+        colors = []
+        for i in range(list_widget.count()):
+            color_data = list_widget.item(i).data(Qt.ItemDataRole.UserRole)
+            if color_data:
+                # Convert Qt QColor to OpenCV BGR color and pair with threshold
+                color = color_data["color"]
+                colors.append(((color.blue(), color.green(), color.red()), color_data["threshold"]))
+        self._color_list_cache[list_widget] = colors
+        return colors
+
     def _is_bg_preview_active(self):
         """Check if background removal preview is currently active."""
         return (hasattr(self.app, 'bg_removal_checkbox')
@@ -48,263 +95,264 @@ class ImageProcessor:
             return self.app.original_image.copy()
         return fallback
 
-    def update_image(self):
-        """Update the displayed image based on the current settings (debounced)."""
-        # Use debounced version to prevent rapid successive calls
-        self.debounced_update()
+    def invalidate_pipeline_cache(self):
+        """Drop memoized pipeline results, e.g. after the working image changes."""
+        self._pipeline_cache.clear()
+        if self.detection_worker is not None:
+            self.detection_worker.clear_cache()
 
-    def _update_image_internal(self):
-        """Internal update method with performance optimizations."""
-        if self.app.current_image is None:
+    def _ensure_detection_thread(self):
+        """Start the persistent detection worker thread on first use."""
+        if self.detection_thread is not None:
             return
-            
-        # If we're in Draw mode (edit_mask_mode_enabled), show the mask layer instead of detection
-        if self.app.edit_mask_mode_enabled and hasattr(self.app, 'mask_processor'):
-            self.app.mask_processor.update_display_with_mask()
+        self.detection_thread = QThread()
+        self.detection_worker = DetectionWorker()
+        self.detection_worker.moveToThread(self.detection_thread)
+        self.detection_thread.started.connect(self.detection_worker.run)
+        self.detection_worker.resultReady.connect(self._on_detection_result)
+        self.detection_worker.error.connect(self._on_detection_error)
+        self.detection_thread.start()
+
+    def stop_detection_thread(self):
+        """Stop the detection worker thread, waiting for any run in progress."""
+        if self.detection_thread is None:
             return
+        self.detection_worker.stop()
+        self.detection_thread.quit()
+        self.detection_thread.wait(5000)
+        self.detection_thread = None
+        self.detection_worker = None
 
-        with PerformanceTimer("Full image update"):
-            # Get slider values
-            blur = self.app.sliders["Smoothing"]['slider'].value()
-            
-            # Handle special case for blur=1 (no blur) and ensure odd values
-            if blur > 1 and blur % 2 == 0:
-                blur += 1
-        
-        canny1 = self.app.sliders["Edge Sensitivity"]['slider'].value()
-        canny2 = self.app.sliders["Edge Threshold"]['slider'].value()
-        edge_margin = self.app.sliders["Edge Margin"]['slider'].value()
-        
-        # Get min_merge_distance as a float value
-        min_merge_distance = self.app.sliders["Min Merge Distance"]['slider'].value() * 0.1
-        
-        # Calculate min area based on mode (percentage or pixels)
+    def _min_area_thresholds(self):
+        """Turn the Min Area slider into pixel thresholds.
+
+        Returns:
+            Tuple (min_area, working_min_area, min_area_percentage), where
+            working_min_area is the integer contour-area threshold at working
+            resolution that the pipeline compares against
+        """
         min_area_value = self.app.sliders["Min Area"]['slider'].value()
         image_area = self.app.current_image.shape[0] * self.app.current_image.shape[1]
         
         if hasattr(self.app, 'using_pixels_mode') and self.app.using_pixels_mode:
             # Min area is in pixels (1 to 1000)
             min_area = min_area_value
-            working_min_area = min_area
             # For display/logging purposes
             min_area_percentage = (min_area / image_area) * 100.0
         else:
             # Min area is a percentage (0.0001% to 1%)
             min_area_percentage = min_area_value * 0.001
             min_area = int(image_area * min_area_percentage / 100.0)
-            working_min_area = min_area
         
         # If we're working with a scaled image, the min area needs to be scaled too
-        if self.app.scale_factor != 1.0 and not (hasattr(self.app, 'using_pixels_mode') and self.app.using_pixels_mode):
-            # Only scale min_area if we're using percentages
-            working_min_area = int(min_area * self.app.scale_factor * self.app.scale_factor)
-        elif self.app.scale_factor != 1.0:
-            # If using pixels mode, scale the pixels to the working image size
+        working_min_area = min_area
+        if self.app.scale_factor != 1.0:
             working_min_area = int(min_area * self.app.scale_factor * self.app.scale_factor)
+        return min_area, working_min_area, min_area_percentage
+
+    def _collect_pipeline_params(self):
+        """Snapshot every UI setting the detection pipeline depends on."""
+        # Get slider values
+        blur = self.app.sliders["Smoothing"]['slider'].value()
+        
+        # Handle special case for blur=1 (no blur) and ensure odd values
+        if blur > 1 and blur % 2 == 0:
+            blur += 1
+        
+        canny1 = self.app.sliders["Edge Sensitivity"]['slider'].value()
+        canny2 = self.app.sliders["Edge Threshold"]['slider'].value()
+        edge_margin = self.app.sliders["Edge Margin"]['slider'].value()
+        
+        # Get min_merge_distance as a float value
+        min_merge_distance = self.app.sliders["Min Merge Distance"]['slider'].value() * 0.1
+        
+        min_area, working_min_area, min_area_percentage = self._min_area_thresholds()
         
         # Use background-removed image if available and enabled
-        if (hasattr(self.app, 'bg_removal_checkbox')
-                and self.app.bg_removal_checkbox.isChecked()
-                and self.app.bg_removed_image is not None):
-            processed_image = self.app.bg_removed_image.copy()
-        else:
-            processed_image = self.app.current_image.copy()
+        bg_removal_enabled = (hasattr(self.app, 'bg_removal_checkbox')
+                              and self.app.bg_removal_checkbox.isChecked()
+                              and self.app.bg_removed_image is not None)
+        source_image = self.app.bg_removed_image if bg_removal_enabled else self.app.current_image
         
-        # Apply hatching removal if enabled
+        # Convert QColor to BGR tuple for OpenCV
+        hatching = None
         if self.app.remove_hatching_checkbox.isChecked():
-            # Convert QColor to BGR tuple for OpenCV
             hatching_color_bgr = (
                 self.app.hatching_color.blue(),
                 self.app.hatching_color.green(),
                 self.app.hatching_color.red()
             )
-            print(f"Removing hatching lines: Color={hatching_color_bgr}, Threshold={self.app.hatching_threshold:.1f}, Width={self.app.hatching_width}")
-            
-            # Apply the hatching removal
-            from src.wall_detection.detector import remove_hatching_lines
-            processed_image = remove_hatching_lines(
-                processed_image, 
-                hatching_color_bgr, 
-                self.app.hatching_threshold, 
-                self.app.hatching_width
-            )
+            hatching = (hatching_color_bgr, self.app.hatching_threshold, self.app.hatching_width)
         
         # Set up color detection parameters with per-color thresholds
         wall_colors_with_thresholds = None
-        default_threshold = 0
-        
         if self.app.color_detection_radio.isChecked() and self.app.wall_colors_list.count() > 0:
-            # Extract all colors and thresholds from the list widget
-            wall_colors_with_thresholds = []
-            for i in range(self.app.wall_colors_list.count()):
-                item = self.app.wall_colors_list.item(i)
-                color_data = item.data(Qt.ItemDataRole.UserRole)
-                color = color_data["color"]
-                threshold = color_data["threshold"]
-                
-                # Convert Qt QColor to OpenCV BGR color and pair with threshold
-                bgr_color = (
-                    color.blue(),
-                    color.green(),
-                    color.red()
-                )
-                wall_colors_with_thresholds.append((bgr_color, threshold))
-            
-            print(f"Using {len(wall_colors_with_thresholds)} colors for detection with individual thresholds")
-          # Debug output of parameters
+            wall_colors_with_thresholds = list(self._color_list_bgr(self.app.wall_colors_list))
+        
+        # Light detection - only perform if enabled
+        lights = None
+        if hasattr(self.app, 'enable_light_detection') and self.app.enable_light_detection.isChecked():
+            # Collect light colors from the UI if any are specified
+            light_colors = []
+            if hasattr(self.app, 'light_colors_list'):
+                light_colors = list(self._color_list_bgr(self.app.light_colors_list))
+            lights = (
+                self.app.light_brightness_slider.value() / 100.0,
+                self.app.light_min_size_slider.value(),
+                self.app.light_max_size_slider.value(),
+                self.app.light_merge_distance_slider.value(),
+                light_colors,
+            )
+        
+        # Debug output of parameters
         if hasattr(self.app, 'using_pixels_mode') and self.app.using_pixels_mode:
-            print(f"Parameters: min_area={min_area} pixels (working: {working_min_area}), "
-                  f"blur={blur}, canny1={canny1}, canny2={canny2}, edge_margin={edge_margin}")
+            pipeline_logger.debug("Parameters: min_area=%s pixels (working: %s), blur=%s, canny1=%s, canny2=%s, edge_margin=%s",
+                                  min_area, working_min_area, blur, canny1, canny2, edge_margin)
         else:
-            print(f"Parameters: min_area={min_area} (working: {working_min_area}, {min_area_percentage:.4f}% of image), "
-                  f"blur={blur}, canny1={canny1}, canny2={canny2}, edge_margin={edge_margin}")
-
-        # Create cache key for detection parameters
-        detection_params = {
+            pipeline_logger.debug("Parameters: min_area=%s (working: %s, %.4f%% of image), blur=%s, canny1=%s, canny2=%s, edge_margin=%s",
+                                  min_area, working_min_area, min_area_percentage, blur, canny1, canny2, edge_margin)
+        
+        return {
+            'image': source_image,
+            'scale_factor': self.app.scale_factor,
             'working_min_area': working_min_area,
             'blur': blur,
             'canny1': canny1,
             'canny2': canny2,
             'edge_margin': edge_margin,
-            'wall_colors': wall_colors_with_thresholds,
-            'default_threshold': default_threshold,
             'merge_contours': self.app.merge_contours.isChecked(),
             'min_merge_distance': min_merge_distance,
-            'hatching_enabled': self.app.remove_hatching_checkbox.isChecked(),
-            'hatching_params': (self.app.hatching_color.rgb(), self.app.hatching_threshold, self.app.hatching_width) if self.app.remove_hatching_checkbox.isChecked() else None,
-            'bg_removal_enabled': hasattr(self.app, 'bg_removal_checkbox') and self.app.bg_removal_checkbox.isChecked() and self.app.bg_removed_image is not None,
-            'image_hash': fast_hash(processed_image.tobytes()[:1000])  # Hash first 1KB for speed
+            'color_detection': self.app.color_detection_radio.isChecked(),
+            'wall_colors': wall_colors_with_thresholds,
+            'default_threshold': 0,
+            'hatching': hatching,
+            'bg_removal_enabled': bg_removal_enabled,
+            'lights': lights,
         }
-        
-        cache_key = fast_hash(tuple(sorted(detection_params.items())))
-        
-        # Check cache first
-        cached_result = self.detection_cache.get(cache_key)
-        if cached_result is not None and self.last_detection_params == detection_params:
-            print("[CACHE] Using cached detection result")
-            contours = cached_result
-        else:
-            # Process the image directly with detect_walls
-            with PerformanceTimer("Wall detection"):
-                contours = detect_walls(
-                    processed_image,
-                    min_contour_area=working_min_area,
-                    max_contour_area=None,
-                    blur_kernel_size=blur,
-                    canny_threshold1=canny1,
-                    canny_threshold2=canny2,
-                    edge_margin=edge_margin,
-                    wall_colors=wall_colors_with_thresholds,
-                    color_threshold=default_threshold
-                )
-            
-            # Cache the result
-            self.detection_cache.put(cache_key, contours.copy() if contours else [])
-            self.last_detection_params = detection_params
-        
-        print(f"Detected {len(contours)} contours before merging")
-
-        # Merge before Min Area if specified
-        if self.app.merge_contours.isChecked():
-            contours = merge_contours(
-                processed_image, 
-                contours, 
-                min_merge_distance=min_merge_distance
-            )
-            print(f"After merge before min area: {len(contours)} contours")
-        
-        # Filter contours by area BEFORE splitting edges
-        contours = [c for c in contours if cv2.contourArea(c) >= working_min_area]
-        print(f"After min area filter: {len(contours)} contours")
 
-        # Split contours that touch image edges AFTER area filtering, but only if not in color detection mode
-        if not self.app.color_detection_radio.isChecked():
-            split_contours = split_edge_contours(processed_image, contours)
+    def _pipeline_cache_key(self, params):
+        """Build a hashable key from every input that affects the pipeline output."""
+        def freeze(value):
+            if isinstance(value, (list, tuple)):
+                return tuple(freeze(v) for v in value)
+            return value
+        
+        return (id(params['image']), self._is_bg_preview_active()) + tuple(
+            freeze(value) for name, value in sorted(params.items()) if name != 'image'
+        )
 
-            # Use a much lower threshold for split contours to keep them all
-            # Use absolute minimum value instead of relative to min_area
-            min_split_area = 5.0 * (self.app.scale_factor * self.app.scale_factor)  # Scale with image
-            filtered_contours = []
-            
-            # Keep track of how many contours were kept vs filtered
-            kept_count = 0
-            filtered_count = 0
-            
-            for contour in split_contours:
-                area = cv2.contourArea(contour)
-                if area >= min_split_area:
-                    filtered_contours.append(contour)
-                    kept_count += 1
-                else:
-                    filtered_count += 1
-            
-            contours = filtered_contours
-            print(f"After edge splitting: kept {kept_count}, filtered {filtered_count} tiny fragments")        # Save the current contours for interactive editing (these are at working resolution)
+    def _apply_pipeline_result(self, processed_image, contours, lights):
+        """Publish a pipeline result to the app and redraw."""
         self.app.current_contours = contours
+        self.app.current_lights = lights
+        self.app.processed_image = processed_image
 
-        # Light detection - only perform if enabled and in appropriate detection mode  
-        current_lights = []
-        if hasattr(self.app, 'enable_light_detection') and self.app.enable_light_detection.isChecked():
-            # Get light detection parameters from the UI sliders
-            brightness_threshold = self.app.light_brightness_slider.value() / 100.0
-            light_min_area = self.app.light_min_size_slider.value()
-            light_max_area = self.app.light_max_size_slider.value()
-            light_merge_distance = self.app.light_merge_distance_slider.value()
+        # Save the original image for highlighting
+        if self.app.processed_image is not None:
+            self.app.original_processed_image = self.app.processed_image.copy()
             
-            # Collect light colors from the UI if any are specified
-            light_colors = []
-            if hasattr(self.app, 'light_colors_list') and self.app.light_colors_list.count() > 0:
-                for i in range(self.app.light_colors_list.count()):
-                    item = self.app.light_colors_list.item(i)
-                    color_data = item.data(Qt.ItemDataRole.UserRole)
-                    if color_data:
-                        color = color_data["color"]
-                        threshold = color_data["threshold"]
-                        # Convert QColor to BGR tuple for detection
-                        bgr_color = (color.blue(), color.green(), color.red())
-                        light_colors.append((bgr_color, threshold))
+        # Clear any existing selection when re-detecting
+        self.app.selection_manager.clear_selection()
+        # Reset highlighted contour when re-detecting
+        self.app.highlighted_contour_index = -1
+        # Display the image with grid overlay
+        self.app.refresh_display()
+
+    def update_image(self):
+        """Update the displayed image based on the current settings (debounced)."""
+        # Use debounced version to prevent rapid successive calls
+        self.debounced_update()
+
+    def _update_image_internal(self):
+        """Snapshot the settings and hand detection to the worker thread."""
+        if self.app.current_image is None:
+            return
             
-            # Detect lights in the working image
-            with PerformanceTimer("Light detection"):
-                current_lights = detect_lights_in_image(
-                    processed_image,
-                    brightness_threshold=brightness_threshold,
-                    min_area=light_min_area,
-                    max_area=light_max_area,
-                    enable_lights=True,
-                    grid_size=70.0,
-                    light_colors=light_colors if light_colors else None,
-                    merge_distance=light_merge_distance,
-                    scale_factor=self.app.scale_factor
-                )
-        
-        # Store detected lights for interactive editing
-        self.app.current_lights = current_lights
+        # If we're in Draw mode (edit_mask_mode_enabled), show the mask layer instead of detection
+        if self.app.edit_mask_mode_enabled and hasattr(self.app, 'mask_processor'):
+            self.app.mask_processor.update_display_with_mask()
+            return
+
+        params = self._collect_pipeline_params()
+        
+        # Reuse a memoized result if nothing that affects the output has changed
+        pipeline_key = self._pipeline_cache_key(params)
+        cached_pipeline = self._pipeline_cache.get(pipeline_key)
+        if cached_pipeline is not None:
+            self._pipeline_cache.move_to_end(pipeline_key)
+            pipeline_logger.debug("[CACHE] Using cached pipeline result")
+            processed, contours, lights = cached_pipeline
+            self._detection_request_id += 1
+            self._apply_pipeline_result(processed.copy(), list(contours), copy.deepcopy(lights))
+            return
+        
+        # Only the most recent request is ever drawn; older results are just cached
+        self._detection_request_id += 1
+        self._pending_detections[self._detection_request_id] = (
+            pipeline_key, self.app.current_image, self.app.original_image, self.app.scale_factor
+        )
+        self._ensure_detection_thread()
+        self.detection_worker.submit(self._detection_request_id, params)
+
+    def _on_detection_error(self, request_id, error_msg):
+        self._pending_detections.pop(request_id, None)
+        print(f"Wall detection error: {error_msg}")
 
+    def _on_detection_result(self, request_id, result):
+        """Draw a finished detection result on the GUI thread."""
+        pending = self._pending_detections.pop(request_id, None)
+        if pending is None:
+            return
+        pipeline_key, working_image, original_image, scale_factor = pending
+        
+        # Drop bookkeeping for requests the worker skipped in favour of this one
+        for stale_id in [i for i in self._pending_detections if i < request_id]:
+            del self._pending_detections[stale_id]
+        
+        # Ignore results for an image that has since been replaced
+        if working_image is not self.app.current_image or original_image is not self.app.original_image:
+            return
+        
+        processed_image, contours, current_lights = result
+        if request_id != self._detection_request_id or self.app.edit_mask_mode_enabled:
+            # Superseded by a newer request, or the user switched to Draw mode
+            return
+        
+        display_image = self._render_detection(processed_image, contours, current_lights, scale_factor)
+        
+        # Memoize the result, evicting the least recently used entry
+        self._pipeline_cache[pipeline_key] = (
+            display_image,
+            list(contours),
+            copy.deepcopy(current_lights),
+        )
+        if len(self._pipeline_cache) > self._pipeline_cache_size:
+            self._pipeline_cache.pop(next(iter(self._pipeline_cache)))
+
+        self._apply_pipeline_result(display_image.copy(), contours, current_lights)
+
+    def _render_detection(self, processed_image, contours, current_lights, scale_factor):
+        """Draw detected walls and lights onto the display-resolution base image."""
         # Determine base image for display (bg-removed preview or original)
         base_display_image = self._get_display_base_image(processed_image)
 
         # Ensure contours are not empty
         if not contours:
-            print("No contours found after processing.")
-            self.app.processed_image = base_display_image.copy()
+            pipeline_logger.debug("No contours found after processing.")
+            display_image = base_display_image.copy()
         else:
             # Scale contours up to original resolution for display
-            if self.app.scale_factor != 1.0 and self.app.original_image is not None:
-                display_contours = self.app.contour_processor.scale_contours_to_original(contours, self.app.scale_factor)
+            if scale_factor != 1.0 and self.app.original_image is not None:
+                display_contours = self.app.contour_processor.scale_contours_to_original(contours, scale_factor)
                 display_image = draw_walls(base_display_image, display_contours)
             else:
                 display_image = draw_walls(processed_image if not self._is_bg_preview_active() else base_display_image, contours)
 
-            self.app.processed_image = display_image
-
         # Draw lights on the processed image if light detection is enabled and lights were detected
         if current_lights and len(current_lights) > 0:
-            from src.wall_detection.light_detector import draw_lights_on_image
-            
             # Scale lights to match the display image if necessary
             lights_to_draw = current_lights.copy()
-            if self.app.scale_factor != 1.0 and self.app.original_image is not None:
+            if scale_factor != 1.0 and self.app.original_image is not None:
                 # Scale light positions to match the original image size
                 for light in lights_to_draw:
                     if "position" in light:
@@ -313,33 +361,41 @@ class ImageProcessor:
                         pixel_y = light["position"]["y"] * 70.0
                         
                         # Scale to original image size
-                        scaled_x = pixel_x * self.app.scale_factor
-                        scaled_y = pixel_y * self.app.scale_factor
+                        scaled_x = pixel_x * scale_factor
+                        scaled_y = pixel_y * scale_factor
                         
                         # Convert back to grid coordinates for drawing
                         light["position"]["x"] = scaled_x / 70.0
                         light["position"]["y"] = scaled_y / 70.0
             
             # Draw the lights on the processed image
-            self.app.processed_image = draw_lights_on_image(
-                self.app.processed_image,
+            display_image = draw_lights_on_image(
+                display_image,
                 lights_to_draw,
                 grid_size=70.0,
                 show_range=False,  # Don't show range circles in detection mode
                 alpha=0.8  # More visible in detection mode
             )
 
-        # Save the original image for highlighting
-        if self.app.processed_image is not None:
-            self.app.original_processed_image = self.app.processed_image.copy()
-            
-        # Clear any existing selection when re-detecting
-        self.app.selection_manager.clear_selection()
-        # Reset highlighted contour when re-detecting
-        self.app.highlighted_contour_index = -1
-          # Display the image with grid overlay
-        self.app.refresh_display()
+        return display_image
         
+    def _to_display_qimage(self, image):
+        """Convert image to RGB in a persistent buffer wrapped by a persistent QImage.
+
+        The buffer is only reallocated when the image size changes, so repeated
+        redraws of the same image reuse one allocation.
+        """
+        height, width = image.shape[:2]
+        if self._display_buf is None or self._display_buf.shape[:2] != (height, width):
+            self._display_buf = np.empty((height, width, 3), np.uint8)
+            self._display_qimg = QImage(self._display_buf.data, width, height, 3 * width, QImage.Format.Format_RGB888)
+        
+        if image.ndim == 3 and image.shape[2] == 3 and image.dtype == np.uint8:
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._display_buf)
+        else:
+            self._display_buf[...] = convert_to_rgb(image)
+        return self._display_qimg
+
     def display_image(self, image, preserve_view=False, region=None):
         """Display an image on the image label.
         
@@ -355,18 +411,13 @@ class ImageProcessor:
         # If region is specified and the image label supports region updates, use that method
         if region is not None and hasattr(self.app.image_label, 'update_region'):
             x, y, width, height = region
-            # Extract the region from the image
-            region_image = image[y:y+height, x:x+width].copy()
-            # Convert to RGB for consistent processing
-            region_rgb = convert_to_rgb(region_image)
+            # Convert the region to RGB; the conversion already makes a new array
+            region_rgb = convert_to_rgb(image[y:y+height, x:x+width])
             # Update just that region
             self.app.image_label.update_region(region_rgb, x, y, width, height)
             return
             
-        rgb_image = convert_to_rgb(image)
-        height, width, channel = rgb_image.shape
-        bytes_per_line = channel * width
-        q_image = QImage(rgb_image.data.tobytes(), width, height, bytes_per_line, QImage.Format.Format_RGB888)
+        q_image = self._to_display_qimage(image)
         pixmap = QPixmap.fromImage(q_image)
         
         # If the image label supports zoom and pan, use the new method
@@ -409,6 +460,7 @@ class ImageProcessor:
             
             # Create a scaled down version for processing if needed
             self.app.current_image, self.app.scale_factor = self.create_working_image(self.app.original_image)
+            self.invalidate_pipeline_cache()
             
             print(f"Image prepared: Original size {self.app.original_image.shape}, Working size {self.app.current_image.shape}, Scale factor {self.app.scale_factor}")
             
@@ -442,6 +494,9 @@ class ImageProcessor:
         if not clipboard_text:
             QMessageBox.warning(self.app, "Invalid URL", "Clipboard is empty")
             return
+        
+        # Imported here: requests is slow to import and only needed for URLs
+        import requests
             
         try:
             # Check if it's a valid URL
@@ -473,6 +528,7 @@ class ImageProcessor:
             # Load the image into the application
             self.app.original_image = img
             self.app.current_image, self.app.scale_factor = self.create_working_image(self.app.original_image)
+            self.invalidate_pipeline_cache()
             
             print(f"Image loaded from URL: Original size {self.app.original_image.shape}, Working size {self.app.current_image.shape}, Scale factor {self.app.scale_factor}")
             
@@ -502,7 +558,20 @@ class ImageProcessor:
             QMessageBox.warning(self.app, "Error", f"Failed to load image from URL:\n{str(e)}")
 
     def create_working_image(self, image):
-        """Create a working copy of the image, scaling it down if it's too large."""
+        """Create a working copy of the image, scaling it down if it's too large.
+
+        Results are memoized per resolution setting for the same source image.
+        """
+        key = 'full' if self.app.high_res_checkbox.isChecked() else self.app.max_working_dimension
+        if self._working_cache_source is not image:
+            self._working_cache = {}
+            self._working_cache_source = image
+        if key not in self._working_cache:
+            self._working_cache[key] = self._make_working_image(image)
+        return self._working_cache[key]
+
+    def _make_working_image(self, image):
+        """Copy or INTER_AREA-downscale image to the current working resolution."""
         # Check if we should use full resolution
         if self.app.high_res_checkbox.isChecked():
             return image.copy(), 1.0
@@ -575,6 +644,7 @@ class ImageProcessor:
         # Recreate the working image with the current checkbox state
         self.app.current_image, self.app.scale_factor = self.create_working_image(self.app.original_image)
         self.app.bg_removed_image = None
+        self.invalidate_pipeline_cache()
         print(f"Resolution changed: Working size {self.app.current_image.shape}, Scale factor {self.app.scale_factor}")
         
         # Update the image with new resolution
@@ -615,7 +685,6 @@ class ImageProcessor:
         working_image = self.app.current_image
         
         # Detect lights in the working image
-        from src.wall_detection.detector import detect_lights_in_image
         current_lights = detect_lights_in_image(
             working_image,
             brightness_threshold=brightness_threshold,
@@ -1,8 +1,43 @@
+import cv2
 import numpy as np
-import copy
 from src.wall_detection.mask_editor import create_mask_from_contours, blend_image_with_mask
 
 
+# Image fields of a history state that are stored as patches once a newer state exists
+_DELTA_KEYS = ('mask', 'original_image')
+
+# Oldest undo states are dropped once the history holds more than this
+_MAX_HISTORY_BYTES = 512 * 1024 * 1024
+
+def _diff_patch(old, new):
+    """Return (bbox, png) where png is old[bbox] PNG-encoded, bbox covering every
+    pixel where old differs from new, or None if the arrays can't be diffed and
+    old must be kept whole. png is None when nothing differs."""
+    if old is None or new is None or old.shape != new.shape:
+        return None
+    diff = cv2.absdiff(old, new)
+    if diff.ndim == 3:
+        diff = diff.max(axis=2)
+    points = cv2.findNonZero(diff)
+    if points is None:
+        return (0, 0, 0, 0), None
+    x, y, w, h = cv2.boundingRect(points)
+    # Masks and rendered images compress well; level 1 keeps encoding fast
+    ok, png = cv2.imencode('.png', old[y:y+h, x:x+w], [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    if not ok:
+        return None
+    return (x, y, w, h), png
+
+def _state_nbytes(state):
+    """Approximate memory held by a history state's images, patches and contours."""
+    total = sum(contour.nbytes for contour in state.get('contours', ()))
+    for key in _DELTA_KEYS:
+        value = state.get(key)
+        if key in state['patched']:
+            value = value[1]
+        if value is not None:
+            total += value.nbytes
+    return total
 
 class MaskProcessor:
     def __init__(self, app):
@@ -85,22 +120,16 @@ class MaskProcessor:
                 # We still need to update the full image in the background to maintain proper state
                 # But we don't need to redisplay it since we already updated the region
                 full_display_image = blend_image_with_mask(display_base_image, self.app.mask_layer)
-                self.app.last_preview_image = full_display_image.copy()
-                self.app.processed_image = full_display_image.copy()
+                self.app.last_preview_image = self.app.processed_image = full_display_image
                 return
         
         # If no region specified or region update not supported, update the full image
         display_image = blend_image_with_mask(display_base_image, self.app.mask_layer)
-        # Store for refresh_display
-        self.app.processed_image = display_image.copy()
+        # The fresh blend is both the image refresh_display shows and the
+        # baseline for brush previews; both only ever copy it before drawing
+        self.app.last_preview_image = self.app.processed_image = display_image
         # Display the blended image
         self.app.refresh_display()
-        
-        # Store this as the baseline image for brush preview
-        self.app.last_preview_image = display_image.copy()
-        
-        # Important: Also update the processed_image
-        self.app.processed_image = display_image.copy()
 
     # State management
     def save_state(self):
@@ -117,14 +146,33 @@ class MaskProcessor:
                 'original_image': None if self.app.original_processed_image is None else self.app.original_processed_image.copy()
             }
         else:
+            # Contour arrays are replaced, never edited in place, so a shallow copy is enough
             state = {
                 'mode': 'contour',
-                'contours': copy.deepcopy(self.app.current_contours),
+                'contours': list(self.app.current_contours or []),
                 'original_image': None if self.app.original_processed_image is None else self.app.original_processed_image.copy()
             }
+        state['patched'] = set()
+        
+        # Only the newest state is kept whole; store the previous one as the
+        # regions where it differs from this one
+        if self.app.history:
+            prev_state = self.app.history[-1]
+            for key in _DELTA_KEYS:
+                if key in prev_state and key in state:
+                    patch = _diff_patch(prev_state[key], state[key])
+                    if patch is not None:
+                        prev_state[key] = patch
+                        prev_state['patched'].add(key)
         
         # Add state to history
         self.app.history.append(state)
+
+        # Each patch only depends on the state after it, so the oldest states
+        # can be dropped to keep large images from piling up
+        history_bytes = sum(_state_nbytes(s) for s in self.app.history)
+        while len(self.app.history) > 2 and history_bytes > _MAX_HISTORY_BYTES:
+            history_bytes -= _state_nbytes(self.app.history.popleft())
         
         # Enable the unified undo button once we have history
         if hasattr(self.app, 'undo_button'):
@@ -142,7 +190,7 @@ class MaskProcessor:
         print(f"Undoing action. History size before: {len(self.app.history)}")
         
         # Pop the most recent state (we don't need it anymore)
-        self.app.history.pop()
+        newest_state = self.app.history.pop()
         
         # If no more history, disable undo button
         if not self.app.history:
@@ -155,6 +203,15 @@ class MaskProcessor:
         # Get the previous state (now the last item in the queue)
         prev_state = self.app.history[-1]
         
+        # Rebuild its patched images on top of the popped state, which it was diffed against
+        for key in prev_state['patched']:
+            (x, y, w, h), png = prev_state[key]
+            full = newest_state[key]
+            if png is not None:
+                full[y:y+h, x:x+w] = cv2.imdecode(png, cv2.IMREAD_UNCHANGED).reshape(full[y:y+h, x:x+w].shape)
+            prev_state[key] = full
+        prev_state['patched'] = set()
+        
         # Restore based on the mode of the previous state
         if prev_state['mode'] == 'mask':
             self.app.mask_layer = prev_state['mask'].copy()
@@ -175,7 +232,7 @@ class MaskProcessor:
             print("Restored previous mask state")
             
         else:  # contour mode
-            self.app.current_contours = copy.deepcopy(prev_state['contours'])
+            self.app.current_contours = list(prev_state['contours'])
             
             if prev_state['original_image'] is not None:
                 self.app.original_processed_image = prev_state['original_image'].copy()
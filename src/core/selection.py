@@ -1,9 +1,14 @@
 import cv2
 import numpy as np
-from sklearn.cluster import KMeans
 from PyQt6.QtGui import QColor
 
-from src.utils.geometry import convert_to_image_coordinates, point_to_line_distance, line_segments_intersect
+from src.utils.geometry import (
+    convert_to_image_coordinates, find_contour_near_point, contours_overlapping_rect,
+    contour_touches_rect, contour_has_point_in_rect,
+)
+
+# Most pixels fed to k-means when extracting colours from a selection
+MAX_KMEANS_PIXELS = 10000
 
 class SelectionManager:
     def __init__(self, app):
@@ -37,6 +42,7 @@ class SelectionManager:
         self.app.selecting_colors = False
         self.app.color_selection_start = None
         self.app.color_selection_current = None
+        self.app.image_label.clear_selection_overlay()
         
         if self.app.processed_image is not None and self.app.original_processed_image is not None:
             self.app.processed_image = self.app.original_processed_image.copy()
@@ -51,25 +57,10 @@ class SelectionManager:
             return
             
         if self.app.deletion_mode_enabled:
-            # Check if click is on a contour edge
-            min_distance = float('inf')
-            found_contour_index = -1
-            
-            for i, contour in enumerate(self.app.current_contours):
-                contour_points = contour.reshape(-1, 2)
-                
-                for j in range(len(contour_points)):
-                    p1 = contour_points[j]
-                    p2 = contour_points[(j + 1) % len(contour_points)]
-                    distance = point_to_line_distance(img_x, img_y, p1[0], p1[1], p2[0], p2[1])
-                    
-                    # If point is close enough to a line segment
-                    if distance < 5 and distance < min_distance:  # Threshold for line detection (pixels)
-                        min_distance = distance
-                        found_contour_index = i
-            
-            # If click is on a contour edge, handle as single click
-            if found_contour_index != -1:
+            # If click is on a contour edge (already highlighted by hover, or found now),
+            # handle as single click
+            if (self.app.highlighted_contour_index != -1
+                    or find_contour_near_point(self.app, img_x, img_y) != -1):
                 self.handle_deletion_click(x, y)
                 return
                 
@@ -85,25 +76,10 @@ class SelectionManager:
             self.app.color_selection_start = (img_x, img_y)
             self.app.color_selection_current = (img_x, img_y)
         elif self.app.thin_mode_enabled or self.app.thicken_mode_enabled:
-            # Check if click is on a contour edge
-            min_distance = float('inf')
-            found_contour_index = -1
-
-            for i, contour in enumerate(self.app.current_contours):
-                contour_points = contour.reshape(-1, 2)
-
-                for j in range(len(contour_points)):
-                    p1 = contour_points[j]
-                    p2 = contour_points[(j + 1) % len(contour_points)]
-                    distance = point_to_line_distance(img_x, img_y, p1[0], p1[1], p2[0], p2[1])
-
-                    # If point is close enough to a line segment
-                    if distance < 5 and distance < min_distance:  # Threshold for line detection (pixels)
-                        min_distance = distance
-                        found_contour_index = i
-
-            # If click is on a contour edge, handle as single click
-            if found_contour_index != -1:
+            # If click is on a contour edge (already highlighted by hover, or found now),
+            # handle as single click
+            if (self.app.highlighted_contour_index != -1
+                    or find_contour_near_point(self.app, img_x, img_y) != -1):
                 self.handle_resize_click(x, y)
                 return
 
@@ -136,9 +112,6 @@ class SelectionManager:
         """Update the display with the selection rectangle and highlighted contours."""
         if not self.app.selecting or self.app.original_processed_image is None:
             return
-            
-        # Start with the original image
-        self.app.processed_image = self.app.original_processed_image.copy()
         
         # Calculate selection rectangle
         x1 = min(self.app.selection_start_img[0], self.app.selection_current_img[0])
@@ -146,67 +119,38 @@ class SelectionManager:
         x2 = max(self.app.selection_start_img[0], self.app.selection_current_img[0])
         y2 = max(self.app.selection_start_img[1], self.app.selection_current_img[1])
         
-        # Draw semi-transparent selection rectangle
-        overlay = self.app.processed_image.copy()
-        cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 100, 200), 2)
-        cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 100, 200), -1)
-        cv2.addWeighted(overlay, 0.3, self.app.processed_image, 0.7, 0, self.app.processed_image)        # Find and highlight contours within the selection - only using edge detection
+        # Find contours within the selection - only using edge detection
         self.app.selected_contour_indices = []
+        selected_contours = []
         
-        # Get contours at display resolution for accurate selection highlighting
-        if self.app.scale_factor != 1.0 and self.app.original_image is not None:
-            # Scale contours to display resolution for accurate selection highlighting
-            display_contours = self.app.contour_processor.scale_contours_to_original(self.app.current_contours, self.app.scale_factor)
+        # Only contours whose bounding box reaches the rectangle can be selected
+        scale = self.app.scale_factor
+        if scale != 1.0 and self.app.original_image is not None:
+            # Display pixel x covers working [x*scale, (x+1)*scale); the margin
+            # absorbs rounding in scale_contours_to_original
+            candidates = contours_overlapping_rect(self.app, x1 * scale, y1 * scale,
+                                                   (x2 + 1) * scale, (y2 + 1) * scale, margin=1)
+            # Scale the candidates to display resolution for accurate selection highlighting
+            display_contours = self.app.contour_processor.scale_contours_to_original(
+                [self.app.current_contours[i] for i in candidates], scale)
         else:
-            display_contours = self.app.current_contours
+            candidates = contours_overlapping_rect(self.app, x1, y1, x2, y2)
+            display_contours = [self.app.current_contours[i] for i in candidates]
         
-        for i, contour in enumerate(display_contours):
-            contour_points = contour.reshape(-1, 2)
-            for j in range(len(contour_points)):
-                p1 = contour_points[j]
-                p2 = contour_points[(j + 1) % len(contour_points)]
-                
-                # Check if any part of this line segment is in the selection rectangle
-                # First check if either endpoint is in the rectangle
-                if ((x1 <= p1[0] <= x2 and y1 <= p1[1] <= y2) or 
-                    (x1 <= p2[0] <= x2 and y1 <= p2[1] <= y2)):
-                    self.app.selected_contour_indices.append(i)
-                    # Highlight with different colors based on mode
-                    highlight_color = (0, 0, 255) if self.app.deletion_mode_enabled else (255, 0, 255)  # Red for delete, Magenta for thin
-                    cv2.drawContours(self.app.processed_image, [contour], 0, highlight_color, 2)
-                    break
-                
-                # If neither endpoint is in the rectangle, check if the line intersects the rectangle
-                # by checking against all four edges of the rectangle
-                rect_edges = [
-                    ((x1, y1), (x2, y1)),  # Top edge
-                    ((x2, y1), (x2, y2)),  # Right edge
-                    ((x2, y2), (x1, y2)),  # Bottom edge
-                    ((x1, y2), (x1, y1))   # Left edge
-                ]
-                
-                for rect_p1, rect_p2 in rect_edges:
-                    if line_segments_intersect(self.app, p1[0], p1[1], p2[0], p2[1], 
-                                                  rect_p1[0], rect_p1[1], rect_p2[0], rect_p2[1]):
-                        self.app.selected_contour_indices.append(i)
-                        # Highlight with different colors based on mode
-                        highlight_color = (0, 0, 255) if self.app.deletion_mode_enabled else (255, 0, 255)
-                        cv2.drawContours(self.app.processed_image, [contour], 0, highlight_color, 2)
-                        break
-                # If we've already added this contour, no need to check more line segments
-                if i in self.app.selected_contour_indices:
-                    break
-                    
-        # Display the updated image
-        self.app.refresh_display()
+        for i, contour in zip(candidates, display_contours):
+            if contour_touches_rect(contour, x1, y1, x2, y2):
+                self.app.selected_contour_indices.append(i)
+                selected_contours.append(contour)
+        
+        # Draw the rectangle and highlights over the image instead of into it
+        highlight_color = (0, 0, 255) if self.app.deletion_mode_enabled else (255, 0, 255)  # Red for delete, Magenta for thin
+        self.app.image_label.set_selection_overlay(
+            (x1, y1, x2, y2), (0, 100, 200), selected_contours, highlight_color)
 
     def update_color_selection_display(self):
         """Update the display with the color selection rectangle."""
         if not self.app.selecting_colors or self.app.original_processed_image is None:
             return
-            
-        # Start with the original image
-        self.app.processed_image = self.app.original_processed_image.copy()
         
         # Calculate selection rectangle
         x1 = min(self.app.color_selection_start[0], self.app.color_selection_current[0])
@@ -214,14 +158,8 @@ class SelectionManager:
         x2 = max(self.app.color_selection_start[0], self.app.color_selection_current[0])
         y2 = max(self.app.color_selection_start[1], self.app.color_selection_current[1])
         
-        # Draw semi-transparent selection rectangle
-        overlay = self.app.processed_image.copy()
-        cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 200, 255), 2)
-        cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 200, 255), -1)
-        cv2.addWeighted(overlay, 0.3, self.app.processed_image, 0.7, 0, self.app.processed_image)
-                    
-        # Display the updated image
-        self.app.refresh_display()
+        # Draw the semi-transparent selection rectangle over the image
+        self.app.image_label.set_selection_overlay((x1, y1, x2, y2), (0, 200, 255))
 
     def end_selection(self, x, y):
         """Complete the selection and process it according to the current mode."""        # Convert to image coordinates
@@ -253,13 +191,12 @@ class SelectionManager:
             # Find contours within the selection
             self.app.selected_contour_indices = []
             
-            for i, contour in enumerate(self.app.current_contours):
+            candidates = contours_overlapping_rect(self.app, working_x1, working_y1, working_x2, working_y2)
+            for i in candidates:
                 # Check if contour is at least partially within selection rectangle
-                for point in contour:
-                    px, py = point[0]
-                    if working_x1 <= px <= working_x2 and working_y1 <= py <= working_y2:
-                        self.app.selected_contour_indices.append(i)
-                        break
+                if contour_has_point_in_rect(self.app.current_contours[i], working_x1, working_y1,
+                                             working_x2, working_y2):
+                    self.app.selected_contour_indices.append(i)
             
             # If we have selected contours, delete them immediately
             if self.app.selected_contour_indices:
@@ -304,12 +241,11 @@ class SelectionManager:
             # Find contours within the selection
             self.app.selected_contour_indices = []
 
-            for i, contour in enumerate(self.app.current_contours):
-                for point in contour:
-                    px, py = point[0]
-                    if working_x1 <= px <= working_x2 and working_y1 <= py <= working_y2:
-                        self.app.selected_contour_indices.append(i)
-                        break
+            candidates = contours_overlapping_rect(self.app, working_x1, working_y1, working_x2, working_y2)
+            for i in candidates:
+                if contour_has_point_in_rect(self.app.current_contours[i], working_x1, working_y1,
+                                             working_x2, working_y2):
+                    self.app.selected_contour_indices.append(i)
 
             if self.app.selected_contour_indices:
                 if self.app.thin_mode_enabled:
@@ -361,10 +297,16 @@ class SelectionManager:
             if len(unique_pixels) < num_colors:
                 print(f"Selected area contains only {len(unique_pixels)} unique color(s)")
         else:
+            # Cluster a random sample of large selections; the centres barely move
+            # and k-means streams far less data per iteration
+            if len(pixels) > MAX_KMEANS_PIXELS:
+                sample = np.random.default_rng().choice(len(pixels), MAX_KMEANS_PIXELS, replace=False)
+                pixels = pixels[sample]
+            
             # Use K-means clustering to find the dominant colors
-            kmeans = KMeans(n_clusters=actual_num_colors, n_init=10)
-            kmeans.fit(pixels)
-            colors = kmeans.cluster_centers_
+            criteria = (cv2.TERM_CRITERIA_MAX_ITER + cv2.TERM_CRITERIA_EPS, 10, 1.0)
+            _, _, colors = cv2.kmeans(pixels.astype(np.float32), actual_num_colors, None,
+                                      criteria, 3, cv2.KMEANS_PP_CENTERS)
         
         # Add each color to the color list
         for color in colors:
@@ -407,31 +349,8 @@ class SelectionManager:
             self.app.contour_processor.update_display_from_contours()
             return
         
-        # Convert to working coordinates for contour matching if needed
-        # img_x, img_y are in display image coordinates (full resolution)
-        # but contours are in working resolution, so scale down if necessary
-        working_x, working_y = img_x, img_y
-        if self.app.scale_factor != 1.0 and self.app.original_image is not None:
-            working_x = int(img_x * self.app.scale_factor)
-            working_y = int(img_y * self.app.scale_factor)
-        
-        # Find contours where the click is on or near an edge
-        min_distance = float('inf')
-        closest_contour_index = -1
-        
-        # Check if click is on or near a contour edge
-        for i, contour in enumerate(self.app.current_contours):
-            contour_points = contour.reshape(-1, 2)
-            
-            for j in range(len(contour_points)):
-                p1 = contour_points[j]
-                p2 = contour_points[(j + 1) % len(contour_points)]
-                distance = point_to_line_distance(working_x, working_y, p1[0], p1[1], p2[0], p2[1])
-                
-                # If point is close enough to a line segment
-                if distance < 5 and distance < min_distance:  # Threshold for line detection (pixels)
-                    min_distance = distance
-                    closest_contour_index = i
+        # Find the contour whose edge the click is on or near
+        closest_contour_index = find_contour_near_point(self.app, img_x, img_y)
         
         # If click is on or near an edge, delete that contour
         if closest_contour_index != -1:
@@ -473,25 +392,7 @@ class SelectionManager:
             self.app.contour_processor.update_display_from_contours()
             return
 
-        working_x, working_y = img_x, img_y
-        if self.app.scale_factor != 1.0 and self.app.original_image is not None:
-            working_x = int(img_x * self.app.scale_factor)
-            working_y = int(img_y * self.app.scale_factor)
-
-        min_distance = float('inf')
-        closest_contour_index = -1
-
-        for i, contour in enumerate(self.app.current_contours):
-            contour_points = contour.reshape(-1, 2)
-
-            for j in range(len(contour_points)):
-                p1 = contour_points[j]
-                p2 = contour_points[(j + 1) % len(contour_points)]
-                distance = point_to_line_distance(working_x, working_y, p1[0], p1[1], p2[0], p2[1])
-
-                if distance < 5 and distance < min_distance:
-                    min_distance = distance
-                    closest_contour_index = i
+        closest_contour_index = find_contour_near_point(self.app, img_x, img_y)
 
         if closest_contour_index != -1:
             print(f"{action_name} contour {closest_contour_index} (edge clicked)")
@@ -1,3 +1,4 @@
+import functools
 import sys
 import os
 import cv2
@@ -6,13 +7,13 @@ import cv2
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QPushButton, QWidget, 
+    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QWidget, 
     QCheckBox, QRadioButton, QButtonGroup, QListWidget,
     QScrollArea, QSizePolicy, QDialog, QFrame, QSpinBox, QDoubleSpinBox,
     QGridLayout, QComboBox, QMessageBox, QGroupBox, QFileDialog, QInputDialog, QDialogButtonBox
 )
-from PyQt6.QtCore import Qt, QPoint, QSize
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QGuiApplication, QKeySequence, QShortcut, QIcon
+from PyQt6.QtCore import Qt, QPoint, QSize, QTimer, QUrl
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QGuiApplication, QKeySequence, QIcon, QDesktopServices
 from collections import deque
 
 from src.utils.update_checker import check_for_updates, open_update_url
@@ -29,28 +30,39 @@ from src.core.mask_processor import MaskProcessor
 from src.core.background_remover import BackgroundRemover
 from src.gui.background_removal_panel import BackgroundRemovalPanel
 
-from src.utils.ui_helpers import apply_stylesheet
+from src.gui.widgets import LabeledSlider
+from src.utils.ui_helpers import apply_stylesheet, connect_slider_settled, set_color_swatch
 
 
-def _link_slider_spinbox(slider, spinbox, to_display=None, to_slider=None):
-    """Wire a QSlider and QSpinBox/QDoubleSpinBox bidirectionally.
-
-    to_display: int → spinbox-value (default: identity)
-    to_slider:  spinbox-value → int (default: round)
-    """
-    if to_display is None:
-        to_display = lambda v: v
-    if to_slider is None:
-        to_slider = lambda v: int(round(v))
-
-    def _on_slider(v):
-        spinbox.blockSignals(True)
-        spinbox.setValue(to_display(v))
-        spinbox.blockSignals(False)
+# Left toolbar: (attribute, label, icon in resources/, tooltip), in button group id order
+_TOOL_BUTTONS = (
+    ('detect_tool_btn', " Detect", 'quickview-icon.svg', "Wall Detection Tool"),
+    ('paint_tool_btn', " Draw", 'pen-tool-vector-design-icon.svg', "Draw/Edit Mask Tool"),
+    ('uvtt_tool_btn', " Walls", 'marquee-rectangle-tool-icon.svg', "UVTT Wall Editor"),
+)
 
-    slider.valueChanged.connect(_on_slider)
-    spinbox.valueChanged.connect(lambda v: slider.setValue(to_slider(v)))
 
+@functools.lru_cache(maxsize=1)
+def _update_icon_pixmap():
+    """Paint the 24x24 update arrow once; later windows reuse the pixmap."""
+    update_icon = QPixmap(24, 24)
+    update_icon.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(update_icon)
+    painter.setPen(Qt.GlobalColor.white)
+    painter.setBrush(Qt.GlobalColor.white)
+    # Draw an upward arrow
+    arrow_points = [
+        QPoint(12, 6),
+        QPoint(8, 10),
+        QPoint(10, 10),
+        QPoint(10, 18),
+        QPoint(14, 18),
+        QPoint(14, 10),
+        QPoint(16, 10)
+    ]
+    painter.drawPolygon(arrow_points)
+    painter.end()
+    return update_icon
 
 
 class WallDetectionApp(QMainWindow):
@@ -60,6 +72,7 @@ class WallDetectionApp(QMainWindow):
         self.github_repo = github_repo
         self.update_available = False
         self.update_url = ""
+        self.update_notification = None  # Built by setup_update_notification() once an update is found
 
         self.drawing_tools = DrawingTools(self)
         self.preset_manager = PresetManager(self)
@@ -71,9 +84,11 @@ class WallDetectionApp(QMainWindow):
         self.mask_processor = MaskProcessor(self)
         self.background_remover = BackgroundRemover(self)
         self.bg_removal_panel = BackgroundRemovalPanel(self)
-        # Set up unified undo shortcut
-        self.undo_shortcut = QShortcut(QKeySequence.StandardKey.Undo, self)
-        self.undo_shortcut.activated.connect(self.unified_undo)
+        # Redraw the image view once a window resize settles, not per step
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(80)
+        self._resize_timer.timeout.connect(self._deferred_resize_redraw)
         
         # Zoom shortcuts handled by menu actions
         
@@ -89,11 +104,8 @@ class WallDetectionApp(QMainWindow):
         self.initialize_state()
         self.setup_ui()
 
-        # Load presets on startup
-        self.preset_manager.load_presets_from_file()
-        # Populate preset combo boxes after loading presets
-        self.preset_manager.update_detection_preset_combo()
-        self.preset_manager.update_export_preset_combo()
+        # Load presets off the GUI thread; the preset combo boxes are filled when done
+        self.preset_manager.load_presets_in_background()
 
         apply_stylesheet(self)
         check_for_updates(self)
@@ -105,6 +117,14 @@ class WallDetectionApp(QMainWindow):
         self.scale_factor = 1.0     # Scale factor between original and working image
         self.processed_image = None
         self.current_contours = []
+        self._contour_bboxes = None  # Cached (M,4) contour bounding boxes for hit-testing
+        self._contour_grid = None  # Grid cell -> contour indices, built with the boxes
+        self._contour_bboxes_source = None  # Contours the cached boxes were built from
+        self._contour_flat_points = None  # All contour points concatenated
+        self._contour_offsets = None  # Start of each contour in _contour_flat_points
+        self._contour_hit_points = None  # Simplified contour points concatenated, for hit-testing
+        self._contour_hit_offsets = None  # Start of each contour in _contour_hit_points
+        self._contours_union_bbox = None  # Box around every contour, for quick rejects
         self.current_lights = []   # Detected light points
         self.display_scale_factor = 1.0
         self.display_offset = (0, 0)
@@ -194,7 +214,9 @@ class WallDetectionApp(QMainWindow):
 
         
         # History tracking for undo feature
-        self.history = deque(maxlen=5)  # Store up to 5 previous states
+        # Older states are stored as PNG-compressed diffs against the next one, so deeper history is cheap
+        self.max_undo_history = 50
+        self.history = deque(maxlen=self.max_undo_history)
         
         # UVTT-related attributes
         self.uvtt_walls_preview = None
@@ -286,9 +308,10 @@ class WallDetectionApp(QMainWindow):
         # Edit menu
         edit_menu = menubar.addMenu('&Edit')
         
-        # Undo action (shortcut handled by QShortcut in __init__)
-        undo_action = edit_menu.addAction('&Undo')
-        undo_action.triggered.connect(self.unified_undo)
+        # Undo action; its shortcut is the only Ctrl+Z binding
+        self.undo_action = edit_menu.addAction('&Undo')
+        self.undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.undo_action.triggered.connect(self.unified_undo)
         
         # Clear Walls action
         clear_walls_action = edit_menu.addAction('&Clear Walls')
@@ -367,36 +390,17 @@ class WallDetectionApp(QMainWindow):
             # Running as script
             resources_dir = os.path.join(os.path.dirname(__file__), '../../resources')
         
-        # Detection tool
-        self.detect_tool_btn = QPushButton(" Detect")
-        detect_icon = QIcon(os.path.join(resources_dir, 'quickview-icon.svg'))
-        self.detect_tool_btn.setIcon(detect_icon)
-        self.detect_tool_btn.setIconSize(QSize(24, 24))
-        self.detect_tool_btn.setCheckable(True)
+        # One checkable button per tool; the button group id is the table index
+        for tool_id, (attr, text, icon_file, tooltip) in enumerate(_TOOL_BUTTONS):
+            button = QPushButton(text)
+            button.setIcon(QIcon(os.path.join(resources_dir, icon_file)))
+            button.setIconSize(QSize(24, 24))
+            button.setCheckable(True)
+            button.setToolTip(tooltip)
+            self.tool_group.addButton(button, tool_id)
+            self.left_layout.addWidget(button)
+            setattr(self, attr, button)
         self.detect_tool_btn.setChecked(True)
-        self.detect_tool_btn.setToolTip("Wall Detection Tool")
-        self.tool_group.addButton(self.detect_tool_btn, 0)
-        self.left_layout.addWidget(self.detect_tool_btn)
-        
-        # Paint/Edit tool
-        self.paint_tool_btn = QPushButton(" Draw")
-        draw_icon = QIcon(os.path.join(resources_dir, 'pen-tool-vector-design-icon.svg'))
-        self.paint_tool_btn.setIcon(draw_icon)
-        self.paint_tool_btn.setIconSize(QSize(24, 24))
-        self.paint_tool_btn.setCheckable(True)
-        self.paint_tool_btn.setToolTip("Draw/Edit Mask Tool")
-        self.tool_group.addButton(self.paint_tool_btn, 1)
-        self.left_layout.addWidget(self.paint_tool_btn)
-        
-        # UVTT Editor tool
-        self.uvtt_tool_btn = QPushButton(" Walls")
-        walls_icon = QIcon(os.path.join(resources_dir, 'marquee-rectangle-tool-icon.svg'))
-        self.uvtt_tool_btn.setIcon(walls_icon)
-        self.uvtt_tool_btn.setIconSize(QSize(24, 24))
-        self.uvtt_tool_btn.setCheckable(True)
-        self.uvtt_tool_btn.setToolTip("UVTT Wall Editor")
-        self.tool_group.addButton(self.uvtt_tool_btn, 2)
-        self.left_layout.addWidget(self.uvtt_tool_btn)
         
         self.left_layout.addStretch()
         
@@ -428,13 +432,10 @@ class WallDetectionApp(QMainWindow):
         
         self.image_layout.addWidget(self.scroll_area)
         
-        # Add update notification to image area (will be positioned in bottom left)
-        self.setup_update_notification()
-        
         self.main_layout.addWidget(self.image_container, 1)  # Give it stretch factor 1
         
     def setup_update_notification(self):
-        """Create and position the update notification in the bottom left."""
+        """Create the update notification in the image area; only called once an update is found."""
         # Create the update notification widget (initially hidden)
         self.update_notification = QWidget(self.image_container)
         self.update_notification.setObjectName("updateNotification")
@@ -444,24 +445,7 @@ class WallDetectionApp(QMainWindow):
         
         # Add an icon for the update notification
         update_icon_label = QLabel()
-        update_icon = QPixmap(24, 24)
-        update_icon.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(update_icon)
-        painter.setPen(Qt.GlobalColor.white)
-        painter.setBrush(Qt.GlobalColor.white)
-        # Draw an upward arrow
-        arrow_points = [
-            QPoint(12, 6),
-            QPoint(8, 10),
-            QPoint(10, 10),
-            QPoint(10, 18),
-            QPoint(14, 18),
-            QPoint(14, 10),
-            QPoint(16, 10)
-        ]
-        painter.drawPolygon(arrow_points)
-        painter.end()
-        update_icon_label.setPixmap(update_icon)
+        update_icon_label.setPixmap(_update_icon_pixmap())
         update_layout.addWidget(update_icon_label)
         
         # Add text for the update notification - make it shorter to leave room
@@ -489,7 +473,7 @@ class WallDetectionApp(QMainWindow):
         
     def position_update_notification(self):
         """Position the update notification in the bottom left of the image container."""
-        if hasattr(self, 'update_notification') and self.update_notification.isVisible():
+        if self.update_notification is not None and self.update_notification.isVisible():
             # Ensure the widget is properly sized first
             self.update_notification.adjustSize()
             
@@ -504,7 +488,19 @@ class WallDetectionApp(QMainWindow):
         super().resizeEvent(event)
         # Reposition the update notification when window is resized
         self.position_update_notification()
-        
+        self._resize_timer.start()
+
+    def _deferred_resize_redraw(self):
+        """Recompose the image view at the settled window size."""
+        if hasattr(self, 'image_label') and self.image_label.base_pixmap is not None:
+            self.image_label.update_display()
+
+    def closeEvent(self, event):
+        """Stop background workers and write pending preset edits before the window closes."""
+        self.preset_manager.flush_pending_save()
+        self.image_processor.stop_detection_thread()
+        super().closeEvent(event)
+
     def setup_right_properties_panel(self):
         """Create the right panel with tool properties and settings."""
         # # Right panel container with scroll area
@@ -632,46 +628,18 @@ class WallDetectionApp(QMainWindow):
         self.thin_layout.setContentsMargins(0, 0, 0, 0)
         
         # Target width control
-        self.target_width_layout = QHBoxLayout()
-        self.target_width_label = QLabel("Target Width:")
-        self.target_width_layout.addWidget(self.target_width_label)
-        
-        self.target_width_slider = QSlider(Qt.Orientation.Horizontal)
-        self.target_width_slider.setMinimum(1)
-        self.target_width_slider.setMaximum(10)
-        self.target_width_slider.setValue(5)
-        self.target_width_slider.valueChanged.connect(self.detection_panel.update_target_width)
-        self.target_width_layout.addWidget(self.target_width_slider)
-
-        self.target_width_value = QSpinBox()
-        self.target_width_value.setMinimum(1)
-        self.target_width_value.setMaximum(10)
-        self.target_width_value.setValue(5)
-        self.target_width_value.setFixedWidth(60)
-        self.target_width_layout.addWidget(self.target_width_value)
-        _link_slider_spinbox(self.target_width_slider, self.target_width_value)
-        self.thin_layout.addLayout(self.target_width_layout)
+        self.target_width_control = LabeledSlider("Target Width:", 1, 10, 5)
+        self.target_width_slider = self.target_width_control.slider
+        self.target_width_value = self.target_width_control.spinbox
+        self.target_width_control.valueChanged.connect(self.detection_panel.update_target_width)
+        self.thin_layout.addWidget(self.target_width_control)
         
         # Max iterations control
-        self.max_iterations_layout = QHBoxLayout()
-        self.max_iterations_label = QLabel("Max Iterations:")
-        self.max_iterations_layout.addWidget(self.max_iterations_label)
-        
-        self.max_iterations_slider = QSlider(Qt.Orientation.Horizontal)
-        self.max_iterations_slider.setMinimum(1)
-        self.max_iterations_slider.setMaximum(20)
-        self.max_iterations_slider.setValue(3)
-        self.max_iterations_slider.valueChanged.connect(self.detection_panel.update_max_iterations)
-        self.max_iterations_layout.addWidget(self.max_iterations_slider)
-
-        self.max_iterations_value = QSpinBox()
-        self.max_iterations_value.setMinimum(1)
-        self.max_iterations_value.setMaximum(20)
-        self.max_iterations_value.setValue(3)
-        self.max_iterations_value.setFixedWidth(60)
-        self.max_iterations_layout.addWidget(self.max_iterations_value)
-        _link_slider_spinbox(self.max_iterations_slider, self.max_iterations_value)
-        self.thin_layout.addLayout(self.max_iterations_layout)
+        self.max_iterations_control = LabeledSlider("Max Iterations:", 1, 20, 3)
+        self.max_iterations_slider = self.max_iterations_control.slider
+        self.max_iterations_value = self.max_iterations_control.spinbox
+        self.max_iterations_control.valueChanged.connect(self.detection_panel.update_max_iterations)
+        self.thin_layout.addWidget(self.max_iterations_control)
 
         # Add a separator at the bottom of thinning options
         separator = QFrame()
@@ -797,56 +765,25 @@ class WallDetectionApp(QMainWindow):
         self.hatching_color_button = QPushButton()
         self.hatching_color_button.setObjectName("hatchingColorButton")
         self.hatching_color_button.setFixedSize(30, 20)
+        self.hatching_color_button.setIconSize(QSize(24, 14))
+        set_color_swatch(self.hatching_color_button, self.hatching_color)
         self.hatching_color_button.clicked.connect(self.detection_panel.select_hatching_color)
         self.hatching_color_layout.addWidget(self.hatching_color_button)
         
         # Hatching color threshold slider
-        self.hatching_threshold_layout = QHBoxLayout()
-        self.hatching_options_layout.addLayout(self.hatching_threshold_layout)
-        
-        self.hatching_threshold_label = QLabel("Color Threshold:")
-        self.hatching_threshold_layout.addWidget(self.hatching_threshold_label)
-        
-        self.hatching_threshold_slider = QSlider(Qt.Orientation.Horizontal)
-        self.hatching_threshold_slider.setMinimum(0)
-        self.hatching_threshold_slider.setMaximum(300)
-        self.hatching_threshold_slider.setValue(100)
-        self.hatching_threshold_slider.valueChanged.connect(self.detection_panel.update_hatching_threshold)
-        self.hatching_threshold_layout.addWidget(self.hatching_threshold_slider)
-
-        self.hatching_threshold_value = QDoubleSpinBox()
-        self.hatching_threshold_value.setMinimum(0.0)
-        self.hatching_threshold_value.setMaximum(30.0)
-        self.hatching_threshold_value.setSingleStep(0.1)
-        self.hatching_threshold_value.setDecimals(1)
-        self.hatching_threshold_value.setValue(10.0)
-        self.hatching_threshold_value.setFixedWidth(70)
-        self.hatching_threshold_layout.addWidget(self.hatching_threshold_value)
-        _link_slider_spinbox(self.hatching_threshold_slider, self.hatching_threshold_value,
-                             to_display=lambda v: round(v / 10.0, 1),
-                             to_slider=lambda v: round(v * 10))
+        self.hatching_threshold_control = LabeledSlider("Color Threshold:", 0, 300, 100,
+                                                      scale=0.1, decimals=1, spin_width=70)
+        self.hatching_threshold_slider = self.hatching_threshold_control.slider
+        self.hatching_threshold_value = self.hatching_threshold_control.spinbox
+        connect_slider_settled(self.hatching_threshold_slider, self.detection_panel.update_hatching_threshold)
+        self.hatching_options_layout.addWidget(self.hatching_threshold_control)
         
         # Maximum hatching width slider
-        self.hatching_width_layout = QHBoxLayout()
-        self.hatching_options_layout.addLayout(self.hatching_width_layout)
-        
-        self.hatching_width_label = QLabel("Max Width:")
-        self.hatching_width_layout.addWidget(self.hatching_width_label)
-        
-        self.hatching_width_slider = QSlider(Qt.Orientation.Horizontal)
-        self.hatching_width_slider.setMinimum(1)
-        self.hatching_width_slider.setMaximum(20)
-        self.hatching_width_slider.setValue(3)
-        self.hatching_width_slider.valueChanged.connect(self.detection_panel.update_hatching_width)
-        self.hatching_width_layout.addWidget(self.hatching_width_slider)
-
-        self.hatching_width_value = QSpinBox()
-        self.hatching_width_value.setMinimum(1)
-        self.hatching_width_value.setMaximum(20)
-        self.hatching_width_value.setValue(3)
-        self.hatching_width_value.setFixedWidth(60)
-        self.hatching_width_layout.addWidget(self.hatching_width_value)
-        _link_slider_spinbox(self.hatching_width_slider, self.hatching_width_value)
+        self.hatching_width_control = LabeledSlider("Max Width:", 1, 20, 3)
+        self.hatching_width_slider = self.hatching_width_control.slider
+        self.hatching_width_value = self.hatching_width_control.spinbox
+        connect_slider_settled(self.hatching_width_slider, self.detection_panel.update_hatching_width)
+        self.hatching_options_layout.addWidget(self.hatching_width_control)
 
         # Initially hide the hatching options until enabled
         self.hatching_options.setVisible(False)
@@ -896,30 +833,13 @@ class WallDetectionApp(QMainWindow):
         self.threshold_layout.addWidget(self.threshold_header)
         
         # Create the threshold slider
-        self.current_threshold_layout = QHBoxLayout()
-        self.threshold_layout.addLayout(self.current_threshold_layout)
-        
-        self.threshold_label = QLabel("Threshold:")
-        self.current_threshold_layout.addWidget(self.threshold_label)
-
-        self.threshold_slider = QSlider(Qt.Orientation.Horizontal)
-        self.threshold_slider.setMinimum(0)
-        self.threshold_slider.setMaximum(300)
-        self.threshold_slider.setValue(100)
-        self.threshold_slider.valueChanged.connect(self.detection_panel.update_selected_threshold)
-        self.current_threshold_layout.addWidget(self.threshold_slider)
-
-        self.threshold_spinbox = QDoubleSpinBox()
-        self.threshold_spinbox.setMinimum(0.0)
-        self.threshold_spinbox.setMaximum(30.0)
-        self.threshold_spinbox.setSingleStep(0.1)
-        self.threshold_spinbox.setDecimals(1)
-        self.threshold_spinbox.setValue(10.0)
-        self.threshold_spinbox.setFixedWidth(70)
-        self.current_threshold_layout.addWidget(self.threshold_spinbox)
-        _link_slider_spinbox(self.threshold_slider, self.threshold_spinbox,
-                             to_display=lambda v: round(v / 10.0, 1),
-                             to_slider=lambda v: round(v * 10))
+        self.threshold_control = LabeledSlider("Threshold:", 0, 300, 100,
+                                               scale=0.1, decimals=1, spin_width=70)
+        self.threshold_slider = self.threshold_control.slider
+        self.threshold_spinbox = self.threshold_control.spinbox
+        self.flush_threshold_slider = connect_slider_settled(
+            self.threshold_slider, self.detection_panel.update_selected_threshold)
+        self.threshold_layout.addWidget(self.threshold_control)
         
         # Add a separator
         separator = QFrame()
@@ -1073,92 +993,33 @@ class WallDetectionApp(QMainWindow):
         self.light_options_layout.setContentsMargins(0, 0, 0, 0)
         
         # Light brightness threshold
-        self.light_brightness_layout = QHBoxLayout()
-        self.light_brightness_label = QLabel("Brightness Threshold:")
-        self.light_brightness_layout.addWidget(self.light_brightness_label)
-        
-        self.light_brightness_slider = QSlider(Qt.Orientation.Horizontal)
-        self.light_brightness_slider.setMinimum(30)
-        self.light_brightness_slider.setMaximum(100)
-        self.light_brightness_slider.setValue(80)
-        self.light_brightness_slider.valueChanged.connect(self.detection_panel.update_light_brightness)
-        self.light_brightness_layout.addWidget(self.light_brightness_slider)
-
-        self.light_brightness_value = QDoubleSpinBox()
-        self.light_brightness_value.setMinimum(0.30)
-        self.light_brightness_value.setMaximum(1.00)
-        self.light_brightness_value.setSingleStep(0.01)
-        self.light_brightness_value.setDecimals(2)
-        self.light_brightness_value.setValue(0.80)
-        self.light_brightness_value.setFixedWidth(70)
-        self.light_brightness_layout.addWidget(self.light_brightness_value)
-        _link_slider_spinbox(self.light_brightness_slider, self.light_brightness_value,
-                             to_display=lambda v: round(v / 100.0, 2),
-                             to_slider=lambda v: round(v * 100))
-        self.light_options_layout.addLayout(self.light_brightness_layout)
+        self.light_brightness_control = LabeledSlider("Brightness Threshold:", 30, 100, 80,
+                                                    scale=0.01, decimals=2, spin_width=70)
+        self.light_brightness_slider = self.light_brightness_control.slider
+        self.light_brightness_value = self.light_brightness_control.spinbox
+        connect_slider_settled(self.light_brightness_slider, self.detection_panel.update_light_brightness)
+        self.light_options_layout.addWidget(self.light_brightness_control)
         
         # Light minimum size
-        self.light_min_size_layout = QHBoxLayout()
-        self.light_min_size_label = QLabel("Min Light Size:")
-        self.light_min_size_layout.addWidget(self.light_min_size_label)
-        
-        self.light_min_size_slider = QSlider(Qt.Orientation.Horizontal)
-        self.light_min_size_slider.setMinimum(1)
-        self.light_min_size_slider.setMaximum(50)
-        self.light_min_size_slider.setValue(5)
-        self.light_min_size_slider.valueChanged.connect(self.detection_panel.update_light_min_size)
-        self.light_min_size_layout.addWidget(self.light_min_size_slider)
-
-        self.light_min_size_value = QSpinBox()
-        self.light_min_size_value.setMinimum(1)
-        self.light_min_size_value.setMaximum(50)
-        self.light_min_size_value.setValue(5)
-        self.light_min_size_value.setFixedWidth(60)
-        self.light_min_size_layout.addWidget(self.light_min_size_value)
-        _link_slider_spinbox(self.light_min_size_slider, self.light_min_size_value)
-        self.light_options_layout.addLayout(self.light_min_size_layout)
+        self.light_min_size_control = LabeledSlider("Min Light Size:", 1, 50, 5)
+        self.light_min_size_slider = self.light_min_size_control.slider
+        self.light_min_size_value = self.light_min_size_control.spinbox
+        connect_slider_settled(self.light_min_size_slider, self.detection_panel.update_light_min_size)
+        self.light_options_layout.addWidget(self.light_min_size_control)
         
         # Light maximum size
-        self.light_max_size_layout = QHBoxLayout()
-        self.light_max_size_label = QLabel("Max Light Size:")
-        self.light_max_size_layout.addWidget(self.light_max_size_label)
-        
-        self.light_max_size_slider = QSlider(Qt.Orientation.Horizontal)
-        self.light_max_size_slider.setMinimum(50)
-        self.light_max_size_slider.setMaximum(2000)
-        self.light_max_size_slider.setValue(500)
-        self.light_max_size_slider.valueChanged.connect(self.detection_panel.update_light_max_size)
-        self.light_max_size_layout.addWidget(self.light_max_size_slider)
-
-        self.light_max_size_value = QSpinBox()
-        self.light_max_size_value.setMinimum(50)
-        self.light_max_size_value.setMaximum(2000)
-        self.light_max_size_value.setValue(500)
-        self.light_max_size_value.setFixedWidth(65)
-        self.light_max_size_layout.addWidget(self.light_max_size_value)
-        _link_slider_spinbox(self.light_max_size_slider, self.light_max_size_value)
-        self.light_options_layout.addLayout(self.light_max_size_layout)
+        self.light_max_size_control = LabeledSlider("Max Light Size:", 50, 2000, 500, spin_width=65)
+        self.light_max_size_slider = self.light_max_size_control.slider
+        self.light_max_size_value = self.light_max_size_control.spinbox
+        connect_slider_settled(self.light_max_size_slider, self.detection_panel.update_light_max_size)
+        self.light_options_layout.addWidget(self.light_max_size_control)
         
         # Light merge distance
-        self.light_merge_distance_layout = QHBoxLayout()
-        self.light_merge_distance_label = QLabel("Merge Distance:")
-        self.light_merge_distance_layout.addWidget(self.light_merge_distance_label)
-        
-        self.light_merge_distance_slider = QSlider(Qt.Orientation.Horizontal)
-        self.light_merge_distance_slider.setMinimum(0)
-        self.light_merge_distance_slider.setMaximum(100)
-        self.light_merge_distance_slider.setValue(20)
-        self.light_merge_distance_slider.valueChanged.connect(self.detection_panel.update_light_merge_distance)
-        self.light_merge_distance_layout.addWidget(self.light_merge_distance_slider)
-
-        self.light_merge_distance_value = QSpinBox()
-        self.light_merge_distance_value.setMinimum(0)
-        self.light_merge_distance_value.setMaximum(100)
-        self.light_merge_distance_value.setValue(20)
-        self.light_merge_distance_value.setFixedWidth(60)
-        self.light_merge_distance_layout.addWidget(self.light_merge_distance_value)
-        _link_slider_spinbox(self.light_merge_distance_slider, self.light_merge_distance_value)
-        self.light_options_layout.addLayout(self.light_merge_distance_layout)
+        self.light_merge_distance_control = LabeledSlider("Merge Distance:", 0, 100, 20)
+        self.light_merge_distance_slider = self.light_merge_distance_control.slider
+        self.light_merge_distance_value = self.light_merge_distance_control.spinbox
+        connect_slider_settled(self.light_merge_distance_slider, self.detection_panel.update_light_merge_distance)
+        self.light_options_layout.addWidget(self.light_merge_distance_control)
         
         # Light color selection
         self.light_colors_layout = QVBoxLayout()
@@ -1197,30 +1058,13 @@ class WallDetectionApp(QMainWindow):
         self.light_threshold_layout.addWidget(self.light_threshold_header)
         
         # Create the threshold slider
-        self.light_current_threshold_layout = QHBoxLayout()
-        self.light_threshold_layout.addLayout(self.light_current_threshold_layout)
-        
-        self.light_threshold_label = QLabel("Threshold:")
-        self.light_current_threshold_layout.addWidget(self.light_threshold_label)
-
-        self.light_threshold_slider = QSlider(Qt.Orientation.Horizontal)
-        self.light_threshold_slider.setMinimum(50)
-        self.light_threshold_slider.setMaximum(500)
-        self.light_threshold_slider.setValue(150)
-        self.light_threshold_slider.valueChanged.connect(self.detection_panel.update_selected_light_threshold)
-        self.light_current_threshold_layout.addWidget(self.light_threshold_slider)
-
-        self.light_threshold_spinbox = QDoubleSpinBox()
-        self.light_threshold_spinbox.setMinimum(5.0)
-        self.light_threshold_spinbox.setMaximum(50.0)
-        self.light_threshold_spinbox.setSingleStep(0.1)
-        self.light_threshold_spinbox.setDecimals(1)
-        self.light_threshold_spinbox.setValue(15.0)
-        self.light_threshold_spinbox.setFixedWidth(70)
-        self.light_current_threshold_layout.addWidget(self.light_threshold_spinbox)
-        _link_slider_spinbox(self.light_threshold_slider, self.light_threshold_spinbox,
-                             to_display=lambda v: round(v / 10.0, 1),
-                             to_slider=lambda v: round(v * 10))
+        self.light_threshold_control = LabeledSlider("Threshold:", 50, 500, 150,
+                                                     scale=0.1, decimals=1, spin_width=70)
+        self.light_threshold_slider = self.light_threshold_control.slider
+        self.light_threshold_spinbox = self.light_threshold_control.spinbox
+        self.flush_light_threshold_slider = connect_slider_settled(
+            self.light_threshold_slider, self.detection_panel.update_selected_light_threshold)
+        self.light_threshold_layout.addWidget(self.light_threshold_control)
         
         self.light_colors_layout.addWidget(self.light_threshold_container)
         
@@ -1252,22 +1096,11 @@ class WallDetectionApp(QMainWindow):
         paint_layout = QVBoxLayout(self.paint_group)
         
         # Brush size
-        brush_layout = QHBoxLayout()
-        brush_layout.addWidget(QLabel("Brush Size:"))
-        self.brush_size_slider = QSlider(Qt.Orientation.Horizontal)
-        self.brush_size_slider.setMinimum(0)
-        self.brush_size_slider.setMaximum(50)
-        self.brush_size_slider.setValue(10)
-        self.brush_size_slider.valueChanged.connect(self.drawing_tools.update_brush_size)
-        brush_layout.addWidget(self.brush_size_slider)
-        self.brush_size_value = QSpinBox()
-        self.brush_size_value.setMinimum(0)
-        self.brush_size_value.setMaximum(50)
-        self.brush_size_value.setValue(10)
-        self.brush_size_value.setFixedWidth(60)
-        brush_layout.addWidget(self.brush_size_value)
-        _link_slider_spinbox(self.brush_size_slider, self.brush_size_value)
-        paint_layout.addLayout(brush_layout)
+        self.brush_size_control = LabeledSlider("Brush Size:", 0, 50, 10)
+        self.brush_size_slider = self.brush_size_control.slider
+        self.brush_size_value = self.brush_size_control.spinbox
+        self.brush_size_control.valueChanged.connect(self.drawing_tools.update_brush_size)
+        paint_layout.addWidget(self.brush_size_control)
         
         # Draw/Erase mode
         mode_layout = QHBoxLayout()
@@ -1472,6 +1305,12 @@ class WallDetectionApp(QMainWindow):
         self.uvtt_show_grid_overlay.stateChanged.connect(self.on_grid_overlay_toggled)
         export_layout.addWidget(self.uvtt_show_grid_overlay)
         
+        # Spinbox steps (held arrows, typing) redraw the grid once they pause
+        self._grid_overlay_timer = QTimer(self)
+        self._grid_overlay_timer.setSingleShot(True)
+        self._grid_overlay_timer.setInterval(50)
+        self._grid_overlay_timer.timeout.connect(self.on_grid_overlay_setting_changed)
+        
         overlay_size_layout = QHBoxLayout()
         overlay_size_layout.addWidget(QLabel("Overlay Grid Size:"))
         self.uvtt_overlay_grid_size_spinbox = QSpinBox()
@@ -1479,7 +1318,7 @@ class WallDetectionApp(QMainWindow):
         self.uvtt_overlay_grid_size_spinbox.setSingleStep(1)
         self.uvtt_overlay_grid_size_spinbox.setValue(70)
         self.uvtt_overlay_grid_size_spinbox.setToolTip("Size of visual grid overlay in pixels")
-        self.uvtt_overlay_grid_size_spinbox.valueChanged.connect(self.on_grid_overlay_setting_changed)
+        self.uvtt_overlay_grid_size_spinbox.valueChanged.connect(lambda _value: self._grid_overlay_timer.start())
         overlay_size_layout.addWidget(self.uvtt_overlay_grid_size_spinbox)
         export_layout.addLayout(overlay_size_layout)
         
@@ -1491,7 +1330,7 @@ class WallDetectionApp(QMainWindow):
         self.uvtt_overlay_offset_x_spinbox.setSingleStep(1.0)
         self.uvtt_overlay_offset_x_spinbox.setValue(0.0)
         self.uvtt_overlay_offset_x_spinbox.setToolTip("Horizontal offset for grid overlay in pixels")
-        self.uvtt_overlay_offset_x_spinbox.valueChanged.connect(self.on_grid_overlay_setting_changed)
+        self.uvtt_overlay_offset_x_spinbox.valueChanged.connect(lambda _value: self._grid_overlay_timer.start())
         overlay_offset_x_layout.addWidget(self.uvtt_overlay_offset_x_spinbox)
         export_layout.addLayout(overlay_offset_x_layout)
         
@@ -1503,7 +1342,7 @@ class WallDetectionApp(QMainWindow):
         self.uvtt_overlay_offset_y_spinbox.setSingleStep(1.0)
         self.uvtt_overlay_offset_y_spinbox.setValue(0.0)
         self.uvtt_overlay_offset_y_spinbox.setToolTip("Vertical offset for grid overlay in pixels")
-        self.uvtt_overlay_offset_y_spinbox.valueChanged.connect(self.on_grid_overlay_setting_changed)
+        self.uvtt_overlay_offset_y_spinbox.valueChanged.connect(lambda _value: self._grid_overlay_timer.start())
         overlay_offset_y_layout.addWidget(self.uvtt_overlay_offset_y_spinbox)
         export_layout.addLayout(overlay_offset_y_layout)
         
@@ -1646,7 +1485,6 @@ class WallDetectionApp(QMainWindow):
         if tool_id == 0:  # Switching TO Detection tool
             # Warn if there are masks/drawings that will be lost
             if self.mask_layer is not None or (hasattr(self, 'history') and len(self.history) > 0):
-                from PyQt6.QtWidgets import QMessageBox
                 reply = QMessageBox.question(
                     self,
                     "Clear Drawings?",
@@ -1671,7 +1509,6 @@ class WallDetectionApp(QMainWindow):
         elif tool_id == 1:  # Switching TO Paint tool
             # Check if switching from Walls mode (UVTT preview active)
             if hasattr(self, '_last_tool_id') and self._last_tool_id == 2 and self.uvtt_preview_active:
-                from PyQt6.QtWidgets import QMessageBox
                 reply = QMessageBox.question(
                     self,
                     "Clear Wall Preview?",
@@ -2017,8 +1854,6 @@ class WallDetectionApp(QMainWindow):
             
     def open_log_folder(self):
         """Open the log folder in the system file explorer."""
-        from PyQt6.QtCore import QUrl
-        from PyQt6.QtGui import QDesktopServices
         log_dir = get_log_dir()
         os.makedirs(log_dir, exist_ok=True)
         QDesktopServices.openUrl(QUrl.fromLocalFile(log_dir))
@@ -2061,6 +1896,13 @@ class WallDetectionApp(QMainWindow):
     
 
 
+    def grid_overlay_active(self):
+        """True if refresh_display draws a grid over the processed image."""
+        if (getattr(self, 'uvtt_export_params', None) and hasattr(self, 'export_panel')
+                and self.uvtt_export_params.get('show_grid_overlay', False)):
+            return True
+        return hasattr(self, 'uvtt_show_grid_overlay') and self.uvtt_show_grid_overlay.isChecked()
+
     def refresh_display(self):
         """Refresh the image display with current processed image and any overlays."""
         if not hasattr(self, 'processed_image') or self.processed_image is None:
@@ -2083,10 +1925,7 @@ class WallDetectionApp(QMainWindow):
         if (not show_grid and 
             hasattr(self, 'uvtt_show_grid_overlay') and 
             self.uvtt_show_grid_overlay.isChecked()):
-            from src.utils.debug_logger import log_debug
             display_image = self.add_uvtt_grid_overlay(display_image)
-        elif not show_grid:
-            from src.utils.debug_logger import log_debug
         
         # Display the final image
         self.image_processor.display_image(display_image, preserve_view=True)
@@ -1,11 +1,16 @@
 from PyQt6.QtWidgets import (
-    QHBoxLayout, QLabel, QSlider, QWidget,
     QColorDialog, QListWidget, QListWidgetItem,
-    QDialog, QSpinBox, QDoubleSpinBox,
+    QDialog,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSignalBlocker
 from PyQt6.QtGui import QColor, QCursor
 
+from src.gui.widgets import LabeledSlider
+from src.utils.ui_helpers import connect_slider_settled, set_color_swatch, signals_blocked
+
+# Sliders that only apply to edge detection
+_EDGE_DETECTION_SLIDERS = ("Smoothing", "Edge Sensitivity", "Edge Threshold", "Edge Margin")
+
 class DetectionPanel:
     def __init__(self, app):
         self.app = app
@@ -20,11 +25,7 @@ class DetectionPanel:
             self.app.edge_detection_radio.setChecked(False) # Ensure consistency
 
             # Hide edge detection controls and their labels
-            sliders_to_hide = ["Smoothing", "Edge Sensitivity", "Edge Threshold", "Edge Margin"]
-            for slider_name, slider_info in self.app.sliders.items():
-                # Hide the entire container which includes both slider and label
-                if 'container' in slider_info and slider_name in sliders_to_hide:
-                    slider_info['container'].setVisible(False)
+            self._set_edge_sliders_visible(False)
 
             # Show color detection controls
             self.app.color_section.setVisible(True)
@@ -39,11 +40,7 @@ class DetectionPanel:
                  self.app.edge_detection_radio.setChecked(True)
 
             # Show edge detection controls and their labels
-            sliders_to_show = ["Smoothing", "Edge Sensitivity", "Edge Threshold", "Edge Margin"]
-            for slider_name, slider_info in self.app.sliders.items():
-                # Show the entire container which includes both slider and label
-                if 'container' in slider_info and slider_name in sliders_to_show:
-                    slider_info['container'].setVisible(True)
+            self._set_edge_sliders_visible(True)
 
             # Hide color detection controls
             self.app.color_section.setVisible(False)
@@ -54,6 +51,13 @@ class DetectionPanel:
         if self.app.current_image is not None:
             self.app.image_processor.update_image()
 
+    def _set_edge_sliders_visible(self, visible):
+        """Show or hide the containers (slider and label) of the edge detection sliders."""
+        for slider_name in _EDGE_DETECTION_SLIDERS:
+            slider_info = self.app.sliders.get(slider_name)
+            if slider_info and 'container' in slider_info:
+                slider_info['container'].setVisible(visible)
+
     def toggle_light_detection(self, checked):
         """Toggle light detection options visibility."""
         is_enabled = checked == 2  # Qt.CheckState.Checked
@@ -82,69 +86,35 @@ class DetectionPanel:
 
     def add_slider(self, label, min_val, max_val, initial_val, step=1, scale_factor=None):
         """Add a slider with a label and a synced input spinbox."""
-        slider_container = QWidget()
-        slider_layout = QHBoxLayout(slider_container)
-        slider_layout.setContentsMargins(0, 0, 0, 0)
-
-        slider_label = QLabel(f"{label}:")
-        slider = QSlider(Qt.Orientation.Horizontal)
-        slider.setMinimum(min_val)
-        slider.setMaximum(max_val)
-        slider.setValue(initial_val)
-        slider.setSingleStep(step)
-
         if scale_factor:
             decimals = 3 if scale_factor < 0.01 else 1
-            spinbox = QDoubleSpinBox()
-            spinbox.setDecimals(decimals)
-            spinbox.setMinimum(round(min_val * scale_factor, decimals))
-            spinbox.setMaximum(round(max_val * scale_factor, decimals))
-            spinbox.setSingleStep(round(step * scale_factor, decimals))
-            spinbox.setValue(round(initial_val * scale_factor, decimals))
-
-            def _on_slider(v, sb=spinbox, lbl=label):
+
+            def _to_display(v, lbl=label):
                 # Read the current scale at runtime so mode toggles (e.g. Min Area
                 # percentage <-> pixels) convert correctly without re-binding closures.
-                sf = self.app.sliders[lbl].get('scale', scale_factor)
-                d = 3 if sf < 0.01 else 1
-                sb.blockSignals(True)
-                sb.setValue(round(v * sf, d))
-                sb.blockSignals(False)
-
-            def _on_spinbox(v, sl=slider, lbl=label):
-                sf = self.app.sliders[lbl].get('scale', scale_factor)
-                sl.setValue(round(v / sf))
-        else:
-            spinbox = QSpinBox()
-            spinbox.setMinimum(min_val)
-            spinbox.setMaximum(max_val)
-            spinbox.setSingleStep(step)
-            spinbox.setValue(initial_val)
-
-            def _on_slider(v, sb=spinbox):
-                sb.blockSignals(True)
-                sb.setValue(v)
-                sb.blockSignals(False)
+                sf = self.app.sliders.get(lbl, {}).get('scale', scale_factor)
+                return round(v * sf, 3 if sf < 0.01 else 1)
 
-            def _on_spinbox(v, sl=slider):
-                sl.setValue(v)
+            def _to_slider(v, lbl=label):
+                sf = self.app.sliders.get(lbl, {}).get('scale', scale_factor)
+                return round(v / sf)
 
-        spinbox.setFixedWidth(70)
-        slider.valueChanged.connect(_on_slider)
-        slider.valueChanged.connect(self.app.image_processor.update_image)
-        spinbox.valueChanged.connect(_on_spinbox)
+            control = LabeledSlider(f"{label}:", min_val, max_val, initial_val, step=step,
+                                    scale=scale_factor, decimals=decimals, spin_width=70,
+                                    to_display=_to_display, to_slider=_to_slider)
+        else:
+            control = LabeledSlider(f"{label}:", min_val, max_val, initial_val, step=step, spin_width=70)
 
-        slider_layout.addWidget(slider_label)
-        slider_layout.addWidget(slider)
-        slider_layout.addWidget(spinbox)
+        # Re-detect once the slider settles instead of on every drag step
+        connect_slider_settled(control.slider, lambda _value: self.app.image_processor.update_image())
 
-        self.app.right_layout.addWidget(slider_container)
+        self.app.right_layout.addWidget(control)
 
         self.app.sliders[label] = {
-            'slider': slider,
-            'container': slider_container,
-            'label': slider_label,
-            'spinbox': spinbox,
+            'slider': control.slider,
+            'container': control,
+            'label': control.label,
+            'spinbox': control.spinbox,
         }
         if scale_factor:
             self.app.sliders[label]['scale'] = scale_factor
@@ -155,13 +125,12 @@ class DetectionPanel:
         spinbox = slider_info.get('spinbox')
         if spinbox is None:
             return
-        spinbox.blockSignals(True)
-        if scale_factor:
-            decimals = 3 if scale_factor < 0.01 else 1
-            spinbox.setValue(round(value * scale_factor, decimals))
-        else:
-            spinbox.setValue(value)
-        spinbox.blockSignals(False)
+        with QSignalBlocker(spinbox):
+            if scale_factor:
+                decimals = 3 if scale_factor < 0.01 else 1
+                spinbox.setValue(round(value * scale_factor, decimals))
+            else:
+                spinbox.setValue(value)
 
     def toggle_mode(self):
         """Toggle between detection, deletion, color selection, edit mask, and thinning modes."""
@@ -202,14 +171,16 @@ class DetectionPanel:
         
         if self.app.deletion_mode_enabled:
             self.app.setStatusTip("Deletion Mode: Click inside contours or on lines to delete them")
-            # Store original image for highlighting
+            # Store original image for highlighting. Shared rather than copied:
+            # highlights, brush previews and selections draw on a fresh copy of
+            # original_processed_image, never on this buffer
             if self.app.processed_image is not None:
-                self.app.original_processed_image = self.app.processed_image.copy()
+                self.app.original_processed_image = self.app.processed_image
         elif self.app.color_selection_mode_enabled:
             self.app.setStatusTip("Color Selection Mode: Drag to select an area for color extraction")
             # Store original image for selection rectangle
             if self.app.processed_image is not None:
-                self.app.original_processed_image = self.app.processed_image.copy()
+                self.app.original_processed_image = self.app.processed_image
         elif self.app.edit_mask_mode_enabled:
             self.app.setStatusTip("Edit Mask Mode: Draw or erase on the mask layer")
             # Make sure we have a mask to edit
@@ -217,7 +188,7 @@ class DetectionPanel:
                 # Create an empty mask if none exists
                 self.app.mask_processor.create_empty_mask()
             if self.app.processed_image is not None:
-                self.app.original_processed_image = self.app.processed_image.copy()
+                self.app.original_processed_image = self.app.processed_image
                 # Display the mask with the image
                 self.app.mask_processor.update_display_with_mask()
                 
@@ -232,11 +203,11 @@ class DetectionPanel:
         elif self.app.thin_mode_enabled:
             self.app.setStatusTip("Thinning Mode: Click on contours to thin them")
             if self.app.processed_image is not None:
-                self.app.original_processed_image = self.app.processed_image.copy()
+                self.app.original_processed_image = self.app.processed_image
         elif self.app.thicken_mode_enabled:
             self.app.setStatusTip("Thickening Mode: Click on contours to thicken them")
             if self.app.processed_image is not None:
-                self.app.original_processed_image = self.app.processed_image.copy()
+                self.app.original_processed_image = self.app.processed_image
         else:
             self.app.setStatusTip("")
             # Clear any highlighting
@@ -276,14 +247,13 @@ class DetectionPanel:
             self.app.sliders["Min Area"]['scale'] = 0.001
 
             # Reconfigure spinbox for percentage display
-            min_area_spinbox.blockSignals(True)
-            min_area_spinbox.setSuffix("")
-            min_area_spinbox.setDecimals(3)
-            min_area_spinbox.setMinimum(0.001)
-            min_area_spinbox.setMaximum(25.0)
-            min_area_spinbox.setSingleStep(0.001)
-            min_area_spinbox.setValue(round(min_area_slider.value() * 0.001, 3))
-            min_area_spinbox.blockSignals(False)
+            with QSignalBlocker(min_area_spinbox):
+                min_area_spinbox.setSuffix("")
+                min_area_spinbox.setDecimals(3)
+                min_area_spinbox.setMinimum(0.001)
+                min_area_spinbox.setMaximum(25.0)
+                min_area_spinbox.setSingleStep(0.001)
+                min_area_spinbox.setValue(round(min_area_slider.value() * 0.001, 3))
             print("Switched Min Area mode to Percentage")
 
         else:  # Pixels mode
@@ -307,14 +277,13 @@ class DetectionPanel:
             self.app.sliders["Min Area"]['scale'] = 1.0
 
             # Reconfigure spinbox for pixel display
-            min_area_spinbox.blockSignals(True)
-            min_area_spinbox.setDecimals(0)
-            min_area_spinbox.setSuffix(" px")
-            min_area_spinbox.setMinimum(1)
-            min_area_spinbox.setMaximum(1000)
-            min_area_spinbox.setSingleStep(1)
-            min_area_spinbox.setValue(min_area_slider.value())
-            min_area_spinbox.blockSignals(False)
+            with QSignalBlocker(min_area_spinbox):
+                min_area_spinbox.setDecimals(0)
+                min_area_spinbox.setSuffix(" px")
+                min_area_spinbox.setMinimum(1)
+                min_area_spinbox.setMaximum(1000)
+                min_area_spinbox.setSingleStep(1)
+                min_area_spinbox.setValue(min_area_slider.value())
             self.app.image_processor.update_image()
 
     # Color detection specific
@@ -336,6 +305,8 @@ class DetectionPanel:
     
     def select_color(self, item):
         """Handle selection of a color in the list."""
+        # Apply a pending threshold edit to the previously selected color first
+        self.app.flush_threshold_slider()
         self.app.selected_color_item = item
         
         # Get color data
@@ -343,12 +314,9 @@ class DetectionPanel:
         threshold = color_data["threshold"]
         
         # Update the threshold slider to show the selected color's threshold
-        self.app.threshold_slider.blockSignals(True)
-        self.app.threshold_slider.setValue(int(threshold * 10))
-        self.app.threshold_slider.blockSignals(False)
-        self.app.threshold_spinbox.blockSignals(True)
-        self.app.threshold_spinbox.setValue(threshold)
-        self.app.threshold_spinbox.blockSignals(False)
+        with signals_blocked(self.app.threshold_slider, self.app.threshold_spinbox):
+            self.app.threshold_slider.setValue(int(threshold * 10))
+            self.app.threshold_spinbox.setValue(threshold)
 
         # Show the threshold container
         self.app.threshold_container.setVisible(True)
@@ -436,6 +404,8 @@ class DetectionPanel:
     
     def select_light_color(self, item):
         """Handle selection of a light color in the list."""
+        # Apply a pending threshold edit to the previously selected color first
+        self.app.flush_light_threshold_slider()
         self.app.selected_light_color_item = item
         
         # Get color data
@@ -443,12 +413,9 @@ class DetectionPanel:
         threshold = color_data["threshold"]
         
         # Update the threshold slider to show the selected color's threshold
-        self.app.light_threshold_slider.blockSignals(True)
-        self.app.light_threshold_slider.setValue(int(threshold * 10))
-        self.app.light_threshold_slider.blockSignals(False)
-        self.app.light_threshold_spinbox.blockSignals(True)
-        self.app.light_threshold_spinbox.setValue(threshold)
-        self.app.light_threshold_spinbox.blockSignals(False)
+        with signals_blocked(self.app.light_threshold_slider, self.app.light_threshold_spinbox):
+            self.app.light_threshold_slider.setValue(int(threshold * 10))
+            self.app.light_threshold_spinbox.setValue(threshold)
 
         # Show the threshold container
         self.app.light_threshold_container.setVisible(True)
@@ -536,7 +503,7 @@ class DetectionPanel:
         if color.isValid():
             self.app.hatching_color = color
             # Update button color
-            self.app.hatching_color_button.setStyleSheet(f"background-color: rgb({color.red()}, {color.green()}, {color.blue()});")
+            set_color_swatch(self.app.hatching_color_button, color)
             
             # Update the image if one is loaded and removal is enabled
             if self.app.current_image is not None and self.app.remove_hatching_checkbox.isChecked():
@@ -4,7 +4,7 @@ import cv2
 import numpy as np
 import time
 from src.wall_detection.mask_editor import create_mask_from_contours, blend_image_with_mask, draw_on_mask, export_mask_to_foundry_json, contours_to_foundry_walls, thin_contour
-from src.utils.geometry import convert_to_image_coordinates, point_to_line_distance, line_segments_intersect
+from src.utils.geometry import convert_to_image_coordinates, point_to_line_distance
 
 class DrawingTools:
     def __init__(self, app):
@@ -107,6 +107,13 @@ class DrawingTools:
         self.last_display_coords = (x, y)
         self.last_converted_coords = (img_x, img_y)
         
+        # Move the overlay widget when available; the image pixmap is untouched
+        if hasattr(self.app.image_label, 'show_brush_overlay'):
+            is_erase_mode = not self.app.draw_radio.isChecked()
+            self.app.image_label.show_brush_overlay(img_x, img_y, self.brush_size, is_erase_mode)
+            self.app.brush_preview_active = True
+            return
+        
         # First, clear any existing brush preview to ensure a clean state
         was_active = hasattr(self.app, 'brush_preview_active') and self.app.brush_preview_active
         if was_active:
@@ -214,6 +221,11 @@ class DrawingTools:
                 
     def clear_brush_preview(self):
         """Clear the brush preview when mouse leaves the widget or drawing starts."""
+        # The overlay widget can be hidden regardless of the active flag
+        if hasattr(self.app.image_label, 'hide_brush_overlay'):
+            self.app.image_label.hide_brush_overlay()
+            self.app.brush_preview_active = False
+            return
         if not hasattr(self.app, 'brush_preview_active') or not self.app.brush_preview_active:
             return
             
@@ -4,11 +4,33 @@ from PyQt6.QtWidgets import (
     QDialog, QDialogButtonBox, QFrame, QSpinBox, QDoubleSpinBox,
     QMessageBox, QComboBox, QButtonGroup, QRadioButton
 )
+import copy
 import cv2
 import json
 import base64
+import functools
 import numpy as np
 
+from src.wall_detection.light_detector import draw_lights_on_image
+
+def _blend_selection_rect(image, x1, y1, x2, y2, color, alpha):
+    """Blend a filled, outlined rectangle into image in place.
+
+    Only the region under the rectangle and its 2px outline is copied and
+    blended; every other pixel would blend with itself and stay unchanged.
+    """
+    height, width = image.shape[:2]
+    rx1, ry1 = max(min(x1, x2) - 2, 0), max(min(y1, y2) - 2, 0)
+    rx2, ry2 = min(max(x1, x2) + 3, width), min(max(y1, y2) + 3, height)
+    if rx1 >= rx2 or ry1 >= ry2:
+        return
+    roi = image[ry1:ry2, rx1:rx2]
+    overlay = roi.copy()
+    corner1, corner2 = (x1 - rx1, y1 - ry1), (x2 - rx1, y2 - ry1)
+    cv2.rectangle(overlay, corner1, corner2, color, 2)  # Outline
+    cv2.rectangle(overlay, corner1, corner2, color, -1)  # Filled rectangle
+    cv2.addWeighted(overlay, alpha, roi, 1 - alpha, 0, roi)
+
 class ExportPanel:
     def __init__(self, app):
         self.app = app
@@ -54,9 +76,7 @@ class ExportPanel:
         preset_layout = QHBoxLayout()
         preset_label = QLabel("Export Preset:")
         preset_combo = QComboBox()
-        preset_combo.addItem("-- Select Preset --")
-        for name in sorted(self.app.preset_manager.export_presets.keys()):
-            preset_combo.addItem(name)
+        preset_combo.addItems(["-- Select Preset --", *sorted(self.app.preset_manager.export_presets)])
         preset_layout.addWidget(preset_label)
         preset_layout.addWidget(preset_combo, 1)
         
@@ -174,7 +194,7 @@ class ExportPanel:
 
         # Grid section
         grid_section_label = QLabel("Grid Settings:")
-        grid_section_label.setStyleSheet("font-weight: bold;")
+        grid_section_label.setProperty("headerLabel", True)
         layout.addWidget(grid_section_label)
 
         # Grid overlay toggle
@@ -189,7 +209,7 @@ class ExportPanel:
                                    "This visual grid helps align walls with your VTT's grid\n"
                                    "The overlay grid can use different settings than wall snapping")
         # When changed in the dialog, update the app params and refresh preview
-        show_grid_overlay.stateChanged.connect(lambda state: self._on_dialog_grid_overlay_changed(state))
+        show_grid_overlay.stateChanged.connect(self._on_dialog_grid_overlay_changed)
         layout.addWidget(show_grid_overlay)
 
         # Grid overlay size
@@ -231,7 +251,7 @@ class ExportPanel:
 
         # Wall snapping section
         wall_snap_label = QLabel("Wall Snapping:")
-        wall_snap_label.setStyleSheet("font-weight: bold;")
+        wall_snap_label.setProperty("headerLabel", True)
         layout.addWidget(wall_snap_label)
 
         # Grid size
@@ -344,9 +364,7 @@ class ExportPanel:
                 
                 # Clear and rebuild the preset list to ensure it's sorted
                 preset_combo.clear()
-                preset_combo.addItem("-- Select Preset --")
-                for name in sorted(self.app.preset_manager.export_presets.keys()):
-                    preset_combo.addItem(name)
+                preset_combo.addItems(["-- Select Preset --", *sorted(self.app.preset_manager.export_presets)])
                 
                 # Select the new preset
                 index = preset_combo.findText(new_preset_name)
@@ -504,7 +522,6 @@ class ExportPanel:
         
         # Save the initial state to history with a deep copy to ensure it's preserved properly
         if 'line_of_sight' in uvtt_walls and '_preview_pixels' in uvtt_walls:
-            import copy
             initial_state = {
                 'line_of_sight': copy.deepcopy(uvtt_walls['line_of_sight']),
                 'preview_pixels': copy.deepcopy(uvtt_walls['_preview_pixels'])
@@ -834,11 +851,8 @@ class ExportPanel:
             x2 = max(start_x, current_x)
             y2 = max(start_y, current_y)
             
-            # Draw semi-transparent selection rectangle
-            selection_overlay = preview_image.copy()
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), 2)  # Orange outline
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), -1)  # Filled rectangle
-            cv2.addWeighted(selection_overlay, 0.25, preview_image, 0.75, 0, preview_image)  # 25% opacity
+            # Draw semi-transparent selection rectangle (orange, 25% opacity)
+            _blend_selection_rect(preview_image, int(x1), int(y1), int(x2), int(y2), (0, 150, 255), 0.25)
             
             # Add selection count if any walls are selected
             if self.app.selected_wall_indices:
@@ -1007,7 +1021,6 @@ class ExportPanel:
         
         # Draw lights if they exist
         if 'lights' in self.app.uvtt_walls_preview and self.app.uvtt_walls_preview['lights']:
-            from src.wall_detection.light_detector import draw_lights_on_image
             pixels_per_grid = self.app.uvtt_walls_preview.get('resolution', {}).get('pixels_per_grid', 70)
             
             # Draw lights on the preview
@@ -1029,11 +1042,8 @@ class ExportPanel:
             x2 = max(start_x, current_x)
             y2 = max(start_y, current_y)
             
-            # Draw semi-transparent selection rectangle
-            selection_overlay = preview_image.copy()
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), 2)  # Orange outline
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), -1)  # Filled rectangle
-            cv2.addWeighted(selection_overlay, 0.25, preview_image, 0.75, 0, preview_image)  # 25% opacity
+            # Draw semi-transparent selection rectangle (orange, 25% opacity)
+            _blend_selection_rect(preview_image, int(x1), int(y1), int(x2), int(y2), (0, 150, 255), 0.25)
             
             # Add selection count if any walls are selected
             if self.app.selected_wall_indices:
@@ -1137,7 +1147,6 @@ class ExportPanel:
         
         # Draw lights if they exist
         if 'lights' in self.app.uvtt_walls_preview and self.app.uvtt_walls_preview['lights']:
-            from src.wall_detection.light_detector import draw_lights_on_image
             pixels_per_grid = self.app.uvtt_walls_preview.get('resolution', {}).get('pixels_per_grid', 70)
             
             # Draw lights on the preview
@@ -1159,11 +1168,8 @@ class ExportPanel:
             x2 = max(start_x, current_x)
             y2 = max(start_y, current_y)
             
-            # Draw semi-transparent selection rectangle
-            selection_overlay = preview_image.copy()
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), 2)  # Orange outline
-            cv2.rectangle(selection_overlay, (int(x1), int(y1)), (int(x2), int(y2)), (0, 150, 255), -1)  # Filled rectangle
-            cv2.addWeighted(selection_overlay, 0.25, preview_image, 0.75, 0, preview_image)  # 25% opacity
+            # Draw semi-transparent selection rectangle (orange, 25% opacity)
+            _blend_selection_rect(preview_image, int(x1), int(y1), int(x2), int(y2), (0, 150, 255), 0.25)
             
             # Add selection count if any walls are selected
             if self.app.selected_wall_indices:
@@ -1267,7 +1273,6 @@ class ExportPanel:
         
         # Draw lights if they exist
         if 'lights' in self.app.uvtt_walls_preview and self.app.uvtt_walls_preview['lights']:
-            from src.wall_detection.light_detector import draw_lights_on_image
             pixels_per_grid = self.app.uvtt_walls_preview.get('resolution', {}).get('pixels_per_grid', 70)
             
             # Draw lights on the preview
@@ -1545,7 +1550,7 @@ class ExportPanel:
         
         # Add title
         edit_title = QLabel("Wall Editing Tools")
-        edit_title.setStyleSheet("font-weight: bold; font-size: 14px;")
+        edit_title.setObjectName("wallEditTitle")
         wall_edit_layout.addWidget(edit_title)
         
         # Create radio buttons for different editing modes
@@ -1585,7 +1590,7 @@ class ExportPanel:
         # Add a help text for multi-selection
         help_text = QLabel("Draw walls/portals with click & drag. Edit mode: Drag to select multiple walls. Click on a wall point to move it.")
         help_text.setWordWrap(True)
-        help_text.setStyleSheet("color: #666; font-style: italic; font-size: 11px;")
+        help_text.setObjectName("wallEditHelp")
         wall_edit_layout.addWidget(help_text)
         
         wall_edit_layout.addStretch()
@@ -1595,10 +1600,10 @@ class ExportPanel:
         self.app.right_layout.insertWidget(0, self.app.wall_edit_frame)  # Insert at top for visibility
         
         # Connect signals
-        draw_mode_radio.toggled.connect(lambda checked: self.toggle_wall_edit_mode('draw', checked))
-        edit_mode_radio.toggled.connect(lambda checked: self.toggle_wall_edit_mode('edit', checked))
-        delete_mode_radio.toggled.connect(lambda checked: self.toggle_wall_edit_mode('delete', checked))
-        portal_mode_radio.toggled.connect(lambda checked: self.toggle_wall_edit_mode('portal', checked))
+        draw_mode_radio.toggled.connect(functools.partial(self.toggle_wall_edit_mode, 'draw'))
+        edit_mode_radio.toggled.connect(functools.partial(self.toggle_wall_edit_mode, 'edit'))
+        delete_mode_radio.toggled.connect(functools.partial(self.toggle_wall_edit_mode, 'delete'))
+        portal_mode_radio.toggled.connect(functools.partial(self.toggle_wall_edit_mode, 'portal'))
         
         # Store references to the controls
         self.app.draw_mode_radio = draw_mode_radio
@@ -1677,7 +1682,6 @@ class ExportPanel:
         
         # Restore the previous state with deep copy to ensure complete separation
         if last_state:
-            import copy
             self.app.uvtt_walls_preview['line_of_sight'] = copy.deepcopy(last_state['line_of_sight'])
             self.app.uvtt_walls_preview['_preview_pixels'] = copy.deepcopy(last_state['preview_pixels'])
             self.app.uvtt_walls_preview['portals'] = copy.deepcopy(last_state.get('portals', []))
@@ -1737,7 +1741,6 @@ class ExportPanel:
             self.app.wall_edit_history = []
             
         # Save a deep copy of the current walls to the wall edit history
-        import copy
         current_state = {
             'line_of_sight': copy.deepcopy(self.app.uvtt_walls_preview.get('line_of_sight', [])),
             'preview_pixels': copy.deepcopy(self.app.uvtt_walls_preview.get('_preview_pixels', [])),
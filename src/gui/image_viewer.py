@@ -1,9 +1,11 @@
-from PyQt6.QtWidgets import (QLabel)
-from PyQt6.QtCore import Qt, QPoint, QPointF
-from PyQt6.QtGui import QWheelEvent, QTransform, QPainter, QPixmap, QImage, QCursor
+from PyQt6.QtWidgets import QFrame, QLabel
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer
+from PyQt6.QtGui import QWheelEvent, QTransform, QPainter, QPixmap, QImage, QCursor, QPen, QColor, QPainterPath, QPolygonF
+import math
 import cv2
+import numpy as np
 
-from src.utils.geometry import convert_to_image_coordinates
+from src.utils.geometry import convert_to_image_coordinates, find_contour_near_point, contour_bounding_boxes, nearest_segment
 
 class InteractiveImageLabel(QLabel):
     """Custom QLabel that handles mouse events for contour/line deletion and mask editing, with zoom and pan support."""
@@ -14,7 +16,7 @@ class InteractiveImageLabel(QLabel):
         self.setMouseTracking(True)
         # Enable mouse interaction
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-        # For drag selection
+        # For drag selection, as display (x, y) tuples
         self.selection_start = None
         self.selection_current = None
         # For drawing
@@ -26,6 +28,11 @@ class InteractiveImageLabel(QLabel):
         self.max_zoom = 10.0
         self.pan_offset = QPointF(0, 0)
         self.base_pixmap = None
+        # ((base_pixmap cacheKey, zoom_factor), scaled pixmap) from the last update_display
+        self._scaled_pixmap_cache = None
+        # (pan_offset, zoom_factor, pan x, pan y, pixmap width, pixmap height)
+        # for display_to_image_xy; rebuilt when the view or pixmap changes
+        self._coord_cache = None
           # Pan state
         self.panning = False
         self.pan_start_pos = None
@@ -33,10 +40,114 @@ class InteractiveImageLabel(QLabel):
         
         # For region-based updates
         self.last_updated_region = None
+        
+        # Mouse moves are coalesced to one dispatch per frame using the latest
+        # (position, buttons, modifiers); the event itself is gone by then
+        self._pending_move = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setInterval(16)  # ~60 Hz
+        self._move_timer.timeout.connect(self._flush_move)
+        
+        # Hover hit-testing is coalesced to at most one scan per frame
+        self._pending_hover = None
+        self._last_hover = None  # (working_x, working_y, contour boxes, highlighted index)
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(16)  # ~60 Hz
+        self._hover_timer.timeout.connect(self._do_hover)
+        
+        # Brush preview: a small transparent child label moved over the image,
+        # so hovering repaints only the circle instead of the whole pixmap
+        self.brush_overlay = QLabel(self)
+        self.brush_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.brush_overlay.hide()
+        self._brush_overlay_key = None  # (display radius, erase mode) of the current circle
+        
+        # Highlight drawing state: the buffers the last highlight was drawn into
+        # and the region it covered, so the next one only restores that region
+        self._highlight_target = None
+        self._highlight_source = None
+        self._prev_highlighted_bbox = None
+        self._highlight_pixmap = None  # base pixmap the last full highlight redraw produced
+        
+        # The widget-sized pixmap on screen. paintEvent draws from it directly
+        # so update_region can patch it in place and repaint just that rect
+        self._display_pixmap = None
+        # (rect, color, contour path, highlight color) painted over the pixmap
+        # while a selection is dragged; see set_selection_overlay
+        self._selection_overlay = None
+    
+    def setPixmap(self, pixmap):
+        self._display_pixmap = pixmap
+        super().setPixmap(pixmap)
+    
+    def pixmap(self):
+        if self._display_pixmap is not None:
+            return self._display_pixmap
+        return super().pixmap()
+    
+    def paintEvent(self, event):
+        """Draw only the exposed part of the display pixmap."""
+        if self._display_pixmap is None or self._display_pixmap.isNull():
+            super().paintEvent(event)
+            return
+        # Frame and stylesheet background, then the pixmap centred as QLabel would
+        QFrame.paintEvent(self, event)
+        offset_x = (self.width() - self._display_pixmap.width()) // 2
+        offset_y = (self.height() - self._display_pixmap.height()) // 2
+        rect = event.rect()
+        painter = QPainter(self)
+        painter.drawPixmap(rect, self._display_pixmap, rect.translated(-offset_x, -offset_y))
+        if self._selection_overlay is not None and self.base_pixmap is not None:
+            # Overlay items are in image coordinates; map them like update_display does
+            painter.translate(offset_x + int(self.pan_offset.x()), offset_y + int(self.pan_offset.y()))
+            painter.scale(self.zoom_factor, self.zoom_factor)
+            self._paint_selection_overlay(painter)
+        painter.end()
+    
+    def set_selection_overlay(self, rect, color, contours=(), highlight_color=None):
+        """Show a selection rectangle, and optionally highlighted contours, over the image.
+
+        The overlay is painted on top of the display pixmap, so dragging a
+        selection never re-renders the image underneath.
+
+        Args:
+            rect: (x1, y1, x2, y2) in image coordinates, inclusive
+            color: (B,G,R) of the rectangle, drawn at 30% opacity
+            contours: Contours in image coordinates to outline
+            highlight_color: (B,G,R) of the contour outlines
+        """
+        path = QPainterPath()
+        for contour in contours:
+            points = contour.reshape(-1, 2)
+            path.addPolygon(QPolygonF([QPointF(float(px), float(py)) for px, py in points]))
+            path.closeSubpath()
+        self._selection_overlay = (rect, color, path, highlight_color)
+        self.update()
+    
+    def clear_selection_overlay(self):
+        """Remove the selection overlay, if one is shown."""
+        if self._selection_overlay is not None:
+            self._selection_overlay = None
+            self.update()
+    
+    def _paint_selection_overlay(self, painter):
+        (x1, y1, x2, y2), (b, g, r), path, highlight_color = self._selection_overlay
+        # Same footprint as a 2px cv2.rectangle plus fill blended at 0.3
+        painter.fillRect(QRectF(x1 - 1, y1 - 1, x2 - x1 + 3, y2 - y1 + 3), QColor(r, g, b, 77))
+        if highlight_color is not None and not path.isEmpty():
+            hb, hg, hr = highlight_color
+            pen = QPen(QColor(hr, hg, hb))
+            pen.setWidthF(2.0)
+            painter.setPen(pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(path)
     
     def set_base_pixmap(self, pixmap, preserve_view=False):
         """Set the base pixmap for zoom and pan operations."""
         self.base_pixmap = pixmap
+        self._coord_cache = None
         if not preserve_view:
             # Fit the image to the window and center it when setting a new pixmap
             self.fit_to_window()
@@ -55,19 +166,24 @@ class InteractiveImageLabel(QLabel):
         # Create a pixmap that fits the widget size
         display_pixmap = QPixmap(widget_size)
         # Fill with the application's background color instead of black
-        from PyQt6.QtGui import QColor
         app_bg_color = QColor(30, 30, 30)  # #1e1e1e from the stylesheet
         display_pixmap.fill(app_bg_color)
         
-        # Calculate the scaled image size
-        scaled_size = self.base_pixmap.size() * self.zoom_factor
-        
-        # Create the scaled image
-        scaled_pixmap = self.base_pixmap.scaled(
-            scaled_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        # Reuse the scaled image while the pixmap and zoom are unchanged, so
+        # panning and resizing only recompose instead of rescaling
+        scale_key = (self.base_pixmap.cacheKey(), self.zoom_factor)
+        if self._scaled_pixmap_cache is None or self._scaled_pixmap_cache[0] != scale_key:
+            # Calculate the scaled image size
+            scaled_size = self.base_pixmap.size() * self.zoom_factor
+            
+            # Create the scaled image
+            scaled = self.base_pixmap.scaled(
+                scaled_size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            self._scaled_pixmap_cache = (scale_key, scaled)
+        scaled_pixmap = self._scaled_pixmap_cache[1]
         
         # Calculate the position to draw the scaled image (considering pan offset)
         draw_x = int(self.pan_offset.x())
@@ -81,6 +197,8 @@ class InteractiveImageLabel(QLabel):
         # Store this clean pixmap as our original for overlays
         # This ensures we have a clean base to draw overlays on top of
         self.original_display_pixmap = display_pixmap.copy()
+        # A redraw clears overlays, the brush preview included
+        self.brush_overlay.hide()
         # Set the clipped pixmap (this won't change the widget size)
         self.setPixmap(display_pixmap)
         
@@ -117,26 +235,37 @@ class InteractiveImageLabel(QLabel):
         
     def display_to_image_coords(self, display_point):
         """Convert display coordinates to image coordinates accounting for zoom and pan."""
+        return self.display_to_image_xy(display_point.x(), display_point.y())
+
+    def display_to_image_xy(self, display_x, display_y):
+        """Convert a display position given as plain numbers to image coordinates.
+
+        The pan offset, zoom and pixmap size are cached, so hot paths like hover
+        do no Qt geometry queries unless the view has changed since the last call.
+        """
         if self.base_pixmap is None:
             return None
-            
-        # Get the current pixmap dimensions - this is the display image (full resolution)
-        pixmap_size = self.base_pixmap.size()
-        
+
+        cache = self._coord_cache
+        if cache is None or cache[0] is not self.pan_offset or cache[1] != self.zoom_factor:
+            # Get the current pixmap dimensions - this is the display image (full resolution)
+            pixmap_size = self.base_pixmap.size()
+            cache = self._coord_cache = (self.pan_offset, self.zoom_factor,
+                                         self.pan_offset.x(), self.pan_offset.y(),
+                                         pixmap_size.width(), pixmap_size.height())
+        _, zoom, pan_x, pan_y, pixmap_width, pixmap_height = cache
+
         # Convert from display coordinates to pixmap coordinates
         # Account for pan offset and zoom factor
-        pixmap_x = (display_point.x() - self.pan_offset.x()) / self.zoom_factor
-        pixmap_y = (display_point.y() - self.pan_offset.y()) / self.zoom_factor
-        
         # The pixmap coordinates are already in the display image coordinate space
-        image_x = int(pixmap_x)
-        image_y = int(pixmap_y)
-        
+        image_x = int((display_x - pan_x) / zoom)
+        image_y = int((display_y - pan_y) / zoom)
+
         # Check bounds against the pixmap (display image) dimensions
-        if (image_x < 0 or image_x >= pixmap_size.width() or 
-            image_y < 0 or image_y >= pixmap_size.height()):
+        if (image_x < 0 or image_x >= pixmap_width or
+            image_y < 0 or image_y >= pixmap_height):
             return None
-            
+
         return (image_x, image_y)
         
     def reset_view(self):
@@ -166,6 +295,8 @@ class InteractiveImageLabel(QLabel):
         
     def mousePressEvent(self, event):
         """Handle mouse click events."""
+        # Apply any queued move first so the press sees the state it followed
+        self._flush_move()
         if self.parent_app:
             pos = event.position()
             x, y = int(pos.x()), int(pos.y())
@@ -178,11 +309,11 @@ class InteractiveImageLabel(QLabel):
                 self.setCursor(Qt.CursorShape.ClosedHandCursor)
                 return
             
-            self.selection_start = QPoint(x, y)
+            self.selection_start = (x, y)
             self.selection_current = self.selection_start
             
             # Convert display coordinates to image coordinates
-            img_pos = self.display_to_image_coords(QPoint(x, y))
+            img_pos = self.display_to_image_xy(x, y)
             if img_pos is None:
                 super().mousePressEvent(event)
                 return
@@ -801,27 +932,39 @@ class InteractiveImageLabel(QLabel):
                     self.parent_app.selection_manager.start_selection(x, y)
                 elif self.parent_app.edit_mask_mode_enabled:
                     # Start drawing on mask
-                    self.last_point = QPoint(x, y)
+                    self.last_point = (x, y)
                     self.parent_app.drawing_tools.start_drawing(x, y)
                 elif self.parent_app.thin_mode_enabled or self.parent_app.thicken_mode_enabled:
                     self.parent_app.selection_manager.start_selection(x, y)                
         super().mousePressEvent(event)
     
     def mouseMoveEvent(self, event):
-        """Handle mouse move events for hover highlighting, drag selection, drawing, and panning."""
+        """Queue a mouse move; only the latest one is dispatched when the move timer fires."""
+        if self.parent_app:
+            self._pending_move = (QPointF(event.position()), event.buttons(), event.modifiers())
+            if not self._move_timer.isActive():
+                self._move_timer.start()
+        super().mouseMoveEvent(event)
+
+    def _flush_move(self):
+        """Handle the most recent mouse move for hover highlighting, drag selection, drawing, and panning."""
+        self._move_timer.stop()
+        if self._pending_move is None:
+            return
+        pos, buttons, modifiers = self._pending_move
+        self._pending_move = None
         if self.parent_app:
-            pos = event.position()
             x, y = int(pos.x()), int(pos.y())
             
             # Handle panning with right mouse button
-            if self.panning and event.buttons() & Qt.MouseButton.RightButton:
+            if self.panning and buttons & Qt.MouseButton.RightButton:
                 delta = pos - self.pan_start_pos
                 self.pan_offset = self.pan_start_offset + delta
                 self.update_display()
                 return
                 
             # Convert display coordinates to image coordinates
-            img_pos = self.display_to_image_coords(QPoint(x, y))
+            img_pos = self.display_to_image_xy(x, y)
             
             # Handle UVTT preview mode
             if self.parent_app.uvtt_preview_active and img_pos is not None:
@@ -830,7 +973,7 @@ class InteractiveImageLabel(QLabel):
                 # Show wall preview when Ctrl is held in drawing mode (but not actively drawing)
                 if (self.parent_app.uvtt_draw_mode and 
                     not self.parent_app.drawing_new_wall and 
-                    event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+                    modifiers & Qt.KeyboardModifier.ControlModifier):
                     
                     # Store mouse position for preview line display
                     self.parent_app.preview_mouse_pos = (img_x, img_y)
@@ -849,7 +992,7 @@ class InteractiveImageLabel(QLabel):
                 # Show portal preview when Ctrl is held in portal mode (but not actively drawing)
                 elif (self.parent_app.uvtt_portal_mode and 
                       not self.parent_app.drawing_new_portal and 
-                      event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+                      modifiers & Qt.KeyboardModifier.ControlModifier):
                     
                     # Store mouse position for preview line display
                     self.parent_app.preview_mouse_pos = (img_x, img_y)
@@ -868,7 +1011,7 @@ class InteractiveImageLabel(QLabel):
                 # Show portal preview when Ctrl is held in portal mode (but not actively drawing)
                 elif (self.parent_app.uvtt_portal_mode and 
                       not self.parent_app.drawing_new_portal and 
-                      event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+                      modifiers & Qt.KeyboardModifier.ControlModifier):
                     
                     # Store mouse position for preview line display
                     self.parent_app.preview_mouse_pos = (img_x, img_y)
@@ -885,7 +1028,7 @@ class InteractiveImageLabel(QLabel):
                     self.parent_app.export_panel.display_uvtt_preview()
                 
                 # Left button dragging for various UVTT editing operations
-                if event.buttons() & Qt.MouseButton.LeftButton:
+                if buttons & Qt.MouseButton.LeftButton:
                     if self.parent_app.uvtt_draw_mode and self.parent_app.drawing_new_wall:
                         # Update the end point of the wall being drawn
                         self.parent_app.new_wall_end = (img_x, img_y)
@@ -1028,28 +1171,30 @@ class InteractiveImageLabel(QLabel):
                         return
             
             # If dragging with left button in regular mode
-            if self.selection_start and event.buttons() & Qt.MouseButton.LeftButton:
-                self.selection_current = QPoint(x, y)
+            if self.selection_start and buttons & Qt.MouseButton.LeftButton:
+                self.selection_current = (x, y)
                 if self.parent_app.deletion_mode_enabled or self.parent_app.color_selection_mode_enabled:
                     self.parent_app.selection_manager.update_selection(x, y)
                 elif self.parent_app.edit_mask_mode_enabled and self.last_point:
                     # Continue drawing on mask
-                    current_point = QPoint(x, y)
-                    self.parent_app.drawing_tools.continue_drawing(self.last_point.x(), self.last_point.y(), x, y)
-                    self.last_point = current_point
+                    last_x, last_y = self.last_point
+                    self.parent_app.drawing_tools.continue_drawing(last_x, last_y, x, y)
+                    self.last_point = (x, y)
                 elif self.parent_app.thin_mode_enabled or self.parent_app.thicken_mode_enabled:
                     self.parent_app.selection_manager.update_selection(x, y)
             # Just hovering - this always runs for any mouse movement
             else:
                 if self.parent_app.deletion_mode_enabled or self.parent_app.thin_mode_enabled or self.parent_app.thicken_mode_enabled:
-                    self.handle_hover(pos.x(), pos.y())
+                    # Already once per frame, so hit-test now rather than queue again
+                    self._pending_hover = (pos.x(), pos.y())
+                    self._do_hover()
                 elif self.parent_app.edit_mask_mode_enabled:
                     # Always update brush preview when hovering in edit mask mode
                     self.parent_app.drawing_tools.update_brush_preview(x, y)                
-        super().mouseMoveEvent(event)
-    
+
     def mouseReleaseEvent(self, event):
         """Handle mouse release events for completing drag selection, drawing, or panning."""
+        self._flush_move()
         if self.parent_app:
             # Handle panning end
             if event.button() == Qt.MouseButton.RightButton and self.panning:
@@ -1060,12 +1205,12 @@ class InteractiveImageLabel(QLabel):
             if self.selection_start and event.button() == Qt.MouseButton.LeftButton:
                 pos = event.position()
                 x, y = int(pos.x()), int(pos.y())
-                self.selection_current = QPoint(x, y)
+                self.selection_current = (x, y)
                 
                 # Handle UVTT preview mode
                 if self.parent_app.uvtt_preview_active:
                     # Convert display coordinates to image coordinates
-                    img_pos = self.display_to_image_coords(QPoint(x, y))
+                    img_pos = self.display_to_image_xy(x, y)
                     if img_pos is not None:
                         img_x, img_y = img_pos
                         
@@ -1144,7 +1289,6 @@ class InteractiveImageLabel(QLabel):
                                     bound2_y = end_y / grid_size
                                     
                                     # Calculate rotation based on the line direction
-                                    import math
                                     dx = end_x - start_x
                                     dy = end_y - start_y
                                     rotation = math.atan2(dy, dx)
@@ -1355,6 +1499,9 @@ class InteractiveImageLabel(QLabel):
 
     def leaveEvent(self, event):
         """Handle mouse leaving the widget."""
+        # A queued move would re-highlight or redraw the brush after leaving
+        self._move_timer.stop()
+        self._pending_move = None
         if self.parent_app:
             if self.parent_app.deletion_mode_enabled or self.parent_app.thin_mode_enabled or self.parent_app.thicken_mode_enabled:
                 self.clear_hover()
@@ -1364,7 +1511,17 @@ class InteractiveImageLabel(QLabel):
         super().leaveEvent(event)
 
     def handle_hover(self, x, y):
-        """Handle mouse hover events for highlighting contours."""
+        """Queue a hover update; only the latest position is processed when the timer fires."""
+        self._pending_hover = (x, y)
+        if not self._hover_timer.isActive():
+            self._hover_timer.start()
+
+    def _do_hover(self):
+        """Highlight the contour under the most recent hover position."""
+        if self._pending_hover is None:
+            return
+        x, y = self._pending_hover
+        self._pending_hover = None
         if not self.parent_app.current_contours or self.parent_app.current_image is None:
             return
             
@@ -1382,32 +1539,29 @@ class InteractiveImageLabel(QLabel):
             working_x = int(img_x * self.parent_app.scale_factor)
             working_y = int(img_y * self.parent_app.scale_factor)
         
+        # Nothing to do if the cursor is on the same working pixel and neither the
+        # contours nor the highlight have changed since the last scan
+        boxes = contour_bounding_boxes(self.parent_app)
+        last = self._last_hover
+        if (last is not None and last[:2] == (working_x, working_y) and last[2] is boxes
+                and last[3] == self.parent_app.highlighted_contour_index):
+            return
+        
         # Find the contour under the cursor - only check edges
-        found_index = -1
-        min_distance = float('inf')
+        found_index = find_contour_near_point(self.parent_app, img_x, img_y)
         
-        # Check if cursor is on a contour edge
-        for i, contour in enumerate(self.parent_app.current_contours):
-            contour_points = contour.reshape(-1, 2)
-            
-            for j in range(len(contour_points)):
-                p1 = contour_points[j]
-                p2 = contour_points[(j + 1) % len(contour_points)]
-                
-                # Calculate distance
-                distance = self.calculate_point_to_line_distance(working_x, working_y, p1[0], p1[1], p2[0], p2[1])
-                
-                # If point is close enough to a line segment and closer than any previous match
-                if distance < 5 and distance < min_distance:  # Threshold for line detection (pixels)
-                    min_distance = distance
-                    found_index = i
-          # Update highlight if needed
+        # Update highlight if needed
         if found_index != self.parent_app.highlighted_contour_index:
             self.parent_app.highlighted_contour_index = found_index
             self.update_highlight()
+        self._last_hover = (working_x, working_y, boxes, found_index)
 
     def clear_hover(self):
         """Clear any contour highlighting."""
+        # Drop any queued hover so it can't re-highlight after the pointer left
+        self._hover_timer.stop()
+        self._pending_hover = None
+        self._last_hover = None
         if self.parent_app.highlighted_contour_index != -1:
             self.parent_app.highlighted_contour_index = -1
             self.update_highlight()
@@ -1417,8 +1571,22 @@ class InteractiveImageLabel(QLabel):
         if self.parent_app.original_processed_image is None:
             return
             
-        # Start with the original image (without highlights)
-        self.parent_app.processed_image = self.parent_app.original_processed_image.copy()
+        source = self.parent_app.original_processed_image
+        prev_bbox = None
+        in_place = (self._highlight_source is source and self._highlight_target is not None
+                    and self._highlight_target is self.parent_app.processed_image)
+        if in_place:
+            # Same buffers as the last highlight: only undo the previously highlighted region
+            prev_bbox = self._prev_highlighted_bbox
+            if self._prev_highlighted_bbox is not None:
+                x0, y0, x1, y1 = self._prev_highlighted_bbox
+                self.parent_app.processed_image[y0:y1, x0:x1] = source[y0:y1, x0:x1]
+        else:
+            # Start with the original image (without highlights)
+            self.parent_app.processed_image = source.copy()
+            self._highlight_source = source
+            self._highlight_target = self.parent_app.processed_image
+        self._prev_highlighted_bbox = None
         
         # If a contour is highlighted, draw it with a different color/thickness
         if self.parent_app.highlighted_contour_index != -1 and self.parent_app.highlighted_contour_index < len(self.parent_app.current_contours):
@@ -1449,8 +1617,30 @@ class InteractiveImageLabel(QLabel):
                 0, highlight_color, highlight_thickness
             )
             
+            # Remember the drawn region (padded by the line thickness) for the next update
+            x, y, w, h = cv2.boundingRect(scaled_contour)
+            height, width = source.shape[:2]
+            self._prev_highlighted_bbox = (
+                max(x - highlight_thickness, 0), max(y - highlight_thickness, 0),
+                min(x + w + highlight_thickness, width), min(y + h + highlight_thickness, height),
+            )
+        
+        # If the screen still shows this image with no grid drawn over it, only
+        # the old and new highlight boxes changed: redraw just their union
+        boxes = [b for b in (prev_bbox, self._prev_highlighted_bbox) if b is not None]
+        if (in_place and boxes and self._highlight_pixmap is self.base_pixmap
+                and not self.parent_app.grid_overlay_active()):
+            x0 = min(b[0] for b in boxes)
+            y0 = min(b[1] for b in boxes)
+            x1 = max(b[2] for b in boxes)
+            y1 = max(b[3] for b in boxes)
+            self.parent_app.image_processor.display_image(
+                self.parent_app.processed_image, preserve_view=True, region=(x0, y0, x1 - x0, y1 - y0))
+            return
+            
         # Use refresh_display to preserve grid overlay and other overlays
         self.parent_app.refresh_display()
+        self._highlight_pixmap = self.base_pixmap
 
     def center_image(self):
         """Center the image in the widget."""
@@ -1468,8 +1658,6 @@ class InteractiveImageLabel(QLabel):
         
     def calculate_point_to_line_distance(self, x, y, x1, y1, x2, y2):
         """Calculate the distance from point (x,y) to line segment (x1,y1)-(x2,y2)."""
-        import math
-        
         # Line segment length squared
         l2 = (x2 - x1) ** 2 + (y2 - y1) ** 2
         
@@ -1501,20 +1689,20 @@ class InteractiveImageLabel(QLabel):
         if self.base_pixmap is None:
             return
             
-        # Convert region image to QImage
+        # Wrap the region's buffer in a QImage without copying it; fromImage
+        # makes the only copy, so region_image just has to outlive that call
+        region_image = np.ascontiguousarray(region_image)
         if len(region_image.shape) == 3:
             if region_image.shape[2] == 3:  # RGB
-                bytes_per_line = 3 * width
                 qimg_format = QImage.Format.Format_RGB888
             elif region_image.shape[2] == 4:  # RGBA
-                bytes_per_line = 4 * width
                 qimg_format = QImage.Format.Format_RGBA8888
         else:  # Grayscale
-            bytes_per_line = width
             qimg_format = QImage.Format.Format_Grayscale8
             
-        region_qimg = QImage(region_image.data.tobytes(), width, height, bytes_per_line, qimg_format)
-        region_pixmap = QPixmap.fromImage(region_qimg)
+        region_qimg = QImage(region_image.data, width, height, region_image.strides[0], qimg_format)
+        image_region_pixmap = QPixmap.fromImage(region_qimg)
+        region_pixmap = image_region_pixmap
         
         # Get the display position accounting for zoom and pan
         display_x = int(x * self.zoom_factor + self.pan_offset.x())
@@ -1530,23 +1718,34 @@ class InteractiveImageLabel(QLabel):
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-        # Create a painter to update just this region of the displayed pixmap
-        current_pixmap = self.pixmap()
-        if current_pixmap is None:
+        if self._display_pixmap is None:
             self.update_display()  # Fall back to full update if no pixmap exists
             return
-            
-        painter = QPainter(current_pixmap)
-        painter.drawPixmap(display_x, display_y, region_pixmap)
-        painter.end()
         
-        # Set the updated pixmap
-        self.setPixmap(current_pixmap)
+        # Patch the full-resolution pixmap too, so a later pan or zoom shows
+        # the region; the scaled cache follows it instead of being rebuilt
+        cache = self._scaled_pixmap_cache
+        cache_valid = cache is not None and cache[0] == (self.base_pixmap.cacheKey(), self.zoom_factor)
+        painter = QPainter(self.base_pixmap)
+        painter.drawPixmap(x, y, image_region_pixmap)
+        painter.end()
+        if cache_valid:
+            painter = QPainter(cache[1])
+            painter.drawPixmap(int(x * self.zoom_factor), int(y * self.zoom_factor), region_pixmap)
+            painter.end()
+            self._scaled_pixmap_cache = ((self.base_pixmap.cacheKey(), self.zoom_factor), cache[1])
+        
+        # Patch the on-screen pixmap (and the clean copy overlays are drawn on)
+        # in place, then repaint just this region
+        for target in (self._display_pixmap, getattr(self, 'original_display_pixmap', None)):
+            if target is not None:
+                painter = QPainter(target)
+                painter.drawPixmap(display_x, display_y, region_pixmap)
+                painter.end()
         
         # Store the last updated region for potential future optimizations
         self.last_updated_region = (display_x, display_y, display_width, display_height)
         
-        # Request a repaint of just this region for efficiency
         self.update(display_x, display_y, display_width, display_height)
     def draw_brush_overlay_on_region(self, img_x, img_y, brush_size, is_erase_mode=False):
         """Draw brush overlay directly on the display pixmap for ultra-fast preview.
@@ -1592,7 +1791,6 @@ class InteractiveImageLabel(QLabel):
         temp_display_pixmap = self.original_display_pixmap.copy()
         
         # Set up for pure overlay drawing using a high-contrast outline
-        from PyQt6.QtGui import QPen
         if is_erase_mode:
             # Use a red pen for erase mode
             pen = QPen(Qt.GlobalColor.red)
@@ -1627,6 +1825,38 @@ class InteractiveImageLabel(QLabel):
         update_width = int(region_width * self.zoom_factor)
         update_height = int(region_height * self.zoom_factor)
         self.update(display_x, display_y, update_width, update_height)
+    def show_brush_overlay(self, img_x, img_y, brush_size, is_erase_mode=False):
+        """Show the brush outline centred on (img_x, img_y) by moving the overlay label.
+
+        The circle pixmap is only repainted when the zoomed radius or the
+        draw/erase colour changes.
+        """
+        radius = max(1, int(brush_size * self.zoom_factor))
+        key = (radius, is_erase_mode)
+        if key != self._brush_overlay_key:
+            size = radius * 2 + 4  # Room for the 2px pen
+            circle = QPixmap(size, size)
+            circle.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(circle)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            pen = QPen(Qt.GlobalColor.red if is_erase_mode else Qt.GlobalColor.green)
+            pen.setWidth(2)
+            painter.setPen(pen)
+            painter.drawEllipse(2, 2, radius * 2, radius * 2)
+            painter.end()
+            self.brush_overlay.setPixmap(circle)
+            self.brush_overlay.resize(size, size)
+            self._brush_overlay_key = key
+
+        display_x = int(img_x * self.zoom_factor + self.pan_offset.x())
+        display_y = int(img_y * self.zoom_factor + self.pan_offset.y())
+        self.brush_overlay.move(display_x - radius - 2, display_y - radius - 2)
+        self.brush_overlay.show()
+
+    def hide_brush_overlay(self):
+        """Hide the brush outline."""
+        self.brush_overlay.hide()
+
     def reset_brush_overlay(self):
         """Reset the brush overlay, restoring the original display without the brush preview."""
         # Reset tracking variables
@@ -1673,7 +1903,6 @@ class InteractiveImageLabel(QLabel):
         temp_display_pixmap = self.original_display_pixmap.copy()
         
         # Set up for pure overlay drawing using a high-contrast outline
-        from PyQt6.QtGui import QPen
         if is_erase_mode:
             # Use a red pen for erase mode
             pen = QPen(Qt.GlobalColor.red)
@@ -1724,7 +1953,6 @@ class InteractiveImageLabel(QLabel):
         temp_display_pixmap = self.original_display_pixmap.copy()
         
         # Set up for pure overlay drawing using a high-contrast outline
-        from PyQt6.QtGui import QPen
         if is_erase_mode:
             # Use a red pen for erase mode
             pen = QPen(Qt.GlobalColor.red)
@@ -1775,7 +2003,6 @@ class InteractiveImageLabel(QLabel):
         temp_display_pixmap = self.original_display_pixmap.copy()
         
         # Set up for pure overlay drawing using a high-contrast outline
-        from PyQt6.QtGui import QPen
         if is_erase_mode:
             # Use a red pen for erase mode
             pen = QPen(Qt.GlobalColor.red)
@@ -1826,7 +2053,6 @@ class InteractiveImageLabel(QLabel):
         temp_display_pixmap = self.original_display_pixmap.copy()
         
         # Set up for pure overlay drawing using a high-contrast outline
-        from PyQt6.QtGui import QPen
         if is_erase_mode:
             # Use a red pen for erase mode
             pen = QPen(Qt.GlobalColor.red)
@@ -1952,30 +2178,17 @@ class InteractiveImageLabel(QLabel):
            
             return -1
             
-        closest_wall = -1
-        min_distance = max_distance  # Initialize with max threshold
-        
-        # Check all wall segments
+        # Each wall is a list of points; test all wall segments in one pass
         wall_points_list = self.parent_app.uvtt_walls_preview['_preview_pixels']
-        for wall_idx, wall_points in enumerate(wall_points_list):
-            # Each wall is a list of points
-            if len(wall_points) < 2:
-                continue
-                
-            # Get wall coordinates
-            start_x = wall_points[0]["x"]
-            start_y = wall_points[0]["y"]
-            end_x = wall_points[1]["x"]
-            end_y = wall_points[1]["y"]
-            
-            # Calculate distance from point to line segment using our local method
-            distance = self.calculate_point_to_line_distance(x, y, start_x, start_y, end_x, end_y)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_wall = wall_idx
-        
-        return closest_wall
+        wall_indices = [i for i, wall_points in enumerate(wall_points_list) if len(wall_points) >= 2]
+        if not wall_indices:
+            return -1
+        p0 = np.array([(wall_points_list[i][0]["x"], wall_points_list[i][0]["y"]) for i in wall_indices],
+                      dtype=np.float32)
+        p1 = np.array([(wall_points_list[i][1]["x"], wall_points_list[i][1]["y"]) for i in wall_indices],
+                      dtype=np.float32)
+        found, _ = nearest_segment(x, y, p0, p1, max_distance * max_distance)
+        return wall_indices[found] if found != -1 else -1
     
     def update_walls_in_selection(self):
         """Update the list of wall points and portal points within the current selection box."""
@@ -2556,31 +2769,21 @@ class InteractiveImageLabel(QLabel):
         if 'portals' not in self.parent_app.uvtt_walls_preview:
             return -1
             
-        closest_portal = -1
-        min_distance = max_distance  # Initialize with max threshold
-        
-        # Check all portal segments
+        # Test all portal segments in one pass
         portals_list = self.parent_app.uvtt_walls_preview['portals']
         grid_size = self.parent_app.uvtt_walls_preview.get('resolution', {}).get('pixels_per_grid', 70)
+        portal_indices = [i for i, portal in enumerate(portals_list)
+                          if 'bounds' in portal and len(portal['bounds']) >= 2]
+        if not portal_indices:
+            return -1
         
-        for portal_idx, portal in enumerate(portals_list):
-            if 'bounds' not in portal or len(portal['bounds']) < 2:
-                continue
-                
-            # Get the two endpoints of the portal
-            x1 = float(portal['bounds'][0]['x']) * grid_size
-            y1 = float(portal['bounds'][0]['y']) * grid_size
-            x2 = float(portal['bounds'][1]['x']) * grid_size
-            y2 = float(portal['bounds'][1]['y']) * grid_size
-            
-            # Calculate distance from cursor to this portal line
-            distance = self.calculate_point_to_line_distance(x, y, x1, y1, x2, y2)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_portal = portal_idx
-        
-        return closest_portal
+        # Portal bounds are in grid units
+        p0 = np.array([(float(portals_list[i]['bounds'][0]['x']), float(portals_list[i]['bounds'][0]['y']))
+                       for i in portal_indices], dtype=np.float32) * np.float32(grid_size)
+        p1 = np.array([(float(portals_list[i]['bounds'][1]['x']), float(portals_list[i]['bounds'][1]['y']))
+                       for i in portal_indices], dtype=np.float32) * np.float32(grid_size)
+        found, _ = nearest_segment(x, y, p0, p1, max_distance * max_distance)
+        return portal_indices[found] if found != -1 else -1
 
     def move_selected_portals_absolute(self, mouse_x, mouse_y):
         """Move selected portals to absolute position based on initial positions and mouse movement."""
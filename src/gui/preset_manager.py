@@ -1,18 +1,249 @@
 import os
 import json
-import copy
+import contextlib
+import types
 
 from PyQt6.QtWidgets import QInputDialog, QMessageBox
 from PyQt6.QtGui import QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSignalBlocker, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 from src.core.image_processor import ImageProcessor
 from src.utils.debug_logger import log_debug, log_info, log_warning, log_error
+from src.utils.ui_helpers import set_color_swatch, signal_disconnected, signals_blocked, updates_disabled
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Define preset file paths
 DETECTION_PRESETS_FILE = "detection_presets.json"
 EXPORT_PRESETS_FILE = "export_presets.json"
 
+# Built-in presets, shared read-only; loading copies the top level before
+# merging user presets, and preset entries are replaced rather than edited
+_DEFAULT_DETECTION_PRESETS = types.MappingProxyType({
+    "Default": {
+        "sliders": {"Smoothing": 3, "Edge Sensitivity": 50, "Edge Threshold": 150, "Edge Margin": 2, "Min Merge Distance": 10, "Min Area": 124},
+        "checkboxes": {"High Resolution": False, "Merge Contours": True, "Remove Hatching": False},
+        "radios": {"Edge Detection": True, "Color Detection": False, "Min Area Percentage": True, "Min Area Pixels": False},
+        "colors": [], # Default: no specific colors
+        "hatching": {"color": [0, 0, 0], "threshold": 10.0, "width": 3} # Default hatching settings
+    },
+    "Fine Detail": {
+        "sliders": {
+            "Min Area": 4450,
+            "Smoothing": 3,
+            "Edge Sensitivity": 255,
+            "Edge Threshold": 140,
+            "Edge Margin": 1,
+            "Min Merge Distance": 5
+        },
+        "checkboxes": {
+            "High Resolution": False,
+            "Merge Contours": False,
+            "Remove Hatching": False
+        },
+        "radios": {
+            "Edge Detection": True,
+            "Color Detection": False,
+            "Min Area Percentage": False,
+            "Min Area Pixels": True
+        },
+        "colors": [],
+        "hatching": {
+            "color": [
+                0,
+                0,
+                0
+            ],
+            "threshold": 10.0,
+            "width": 3
+        }
+    },
+     "Color Focus (Solid Black)": {
+        "sliders": {"Smoothing": 3, "Edge Sensitivity": 50, "Edge Threshold": 150, "Edge Margin": 2, "Min Merge Distance": 10, "Min Area": 500},
+        "checkboxes": {"High Resolution": False, "Merge Contours": True, "Remove Hatching": False},
+        "radios": {"Edge Detection": False, "Color Detection": True, "Min Area Percentage": True, "Min Area Pixels": False},
+        "colors": [{"color": [0, 0, 0], "threshold": 0.0}], # Black color with threshold 0
+        "hatching": {"color": [0, 0, 0], "threshold": 10.0, "width": 3}
+    },
+    "B/W with Hatching": {
+        "sliders": {
+            "Min Area": 464,
+            "Smoothing": 5,
+            "Edge Sensitivity": 255,
+            "Edge Threshold": 106,
+            "Edge Margin": 0,
+            "Min Merge Distance": 5
+        },
+        "checkboxes": {
+            "High Resolution": False,
+            "Merge Contours": False,
+            "Remove Hatching": True
+        },
+        "radios": {
+            "Edge Detection": False,
+            "Color Detection": True,
+            "Min Area Percentage": False,
+            "Min Area Pixels": True
+        },
+        "colors": [
+            {
+                "color": [
+                    0,
+                    0,
+                    0
+                ],
+                "threshold": 0.0
+            }
+        ],
+        "hatching": {
+            "color": [
+                0,
+                0,
+                0
+            ],
+            "threshold": 0.0,
+            "width": 1
+        }
+    }
+})
+
+_DEFAULT_EXPORT_PRESETS = types.MappingProxyType({
+    "Default": {
+        "simplify_tolerance": 0.0005,
+        "max_wall_length": 50,
+        "max_walls": 5000,
+        "merge_distance": 25.0,
+        "angle_tolerance": 1.0,
+        "max_gap": 10.0,
+        "grid_size": 0,
+        "allow_half_grid": False
+    },
+    "Maze Example": {
+        "simplify_tolerance": 0.0,
+        "max_wall_length": 50,
+        "max_walls": 20000,
+        "merge_distance": 25.0,
+        "angle_tolerance": 1.0,
+        "max_gap": 10.0,
+        "grid_size": 72,
+        "allow_half_grid": False
+    },
+    "Large Optimized": {
+        "simplify_tolerance": 0.0005,
+        "max_wall_length": 200,
+        "max_walls": 20000,
+        "merge_distance": 100.0,
+        "angle_tolerance": 1.0,
+        "max_gap": 10.0,
+        "grid_size": 0,
+        "allow_half_grid": False
+    },
+    "Large Extra Optimized": {
+        "simplify_tolerance": 0.0005,
+        "max_wall_length": 200,
+        "max_walls": 20000,
+        "merge_distance": 200.0,
+        "angle_tolerance": 1.0,
+        "max_gap": 10.0,
+        "grid_size": 0,
+        "allow_half_grid": False
+    }
+})
+
+def _file_mtime(path):
+    """Modification time of path in nanoseconds, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _read_json(path):
+    """Parse a JSON file, with orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    """Write data to path as indented JSON, with orjson when it is installed.
+
+    The file is written next to path and swapped in with os.replace, so an
+    interrupted save never leaves a truncated preset file behind.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(data, indent=4).encode("utf-8")
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+def _color_list_settings(color_list):
+    """Colour/threshold entries of a colour QListWidget in preset format."""
+    role = Qt.ItemDataRole.UserRole
+    entries = (color_list.item(i).data(role) for i in range(color_list.count()))
+    return [{"color": list(data["color"].getRgb()[:3]), "threshold": data["threshold"]}
+            for data in entries]
+
+def _load_presets(path, defaults, kind):
+    """Return defaults merged with the user presets in path, overriding defaults on name clashes."""
+    presets = dict(defaults)
+    if not os.path.exists(path):
+        print(f"{path} not found. Using default {kind} presets.")
+        return presets
+    try:
+        presets.update(_read_json(path))
+        print(f"Loaded {kind} presets from {path}")
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode {path}. Using defaults.")
+    except Exception as e:
+        print(f"Error loading {kind} presets: {e}. Using defaults.")
+    return presets
+
+def _save_presets(path, presets, default_names, kind):
+    """Write the presets not named in default_names to path.
+
+    Returns:
+        The file's new mtime, or None if writing failed
+    """
+    user_presets = {name: preset for name, preset in presets.items() if name not in default_names}
+    try:
+        _write_json(path, user_presets)
+    except Exception as e:
+        print(f"Error saving {kind} presets: {e}")
+        return None
+    print(f"Saved user {kind} presets to {path}")
+    return _file_mtime(path)
+
+class PresetLoadSignals(QObject):
+    """Carries presets read off the GUI thread back to it."""
+    finished = pyqtSignal(object)
+
+class PresetLoadWorker(QRunnable):
+    """Reads the preset files on a QThreadPool thread so the window can paint first."""
+
+    def __init__(self, manager, signals):
+        super().__init__()
+        self.manager = manager
+        self.signals = signals
+
+    def run(self):
+        self.signals.finished.emit(self.manager.read_preset_files())
+
 class PresetManager:
+    # Names of the built-in presets
+    _DEFAULT_DETECTION_NAMES = frozenset(_DEFAULT_DETECTION_PRESETS)
+    _DEFAULT_EXPORT_NAMES = frozenset(_DEFAULT_EXPORT_PRESETS)
+
     def __init__(self, app):
         """Initialize the PresetManager with the application instance.
         Args:
@@ -21,235 +252,157 @@ class PresetManager:
         self.app = app
         self.detection_presets = {}
         self.export_presets = {}
+        # Modification times of the preset files as of the last load or save
+        self._detection_presets_mtime = None
+        self._export_presets_mtime = None
+        self._presets_loaded = False
+        # Preset names each combo box was last filled with
+        self._detection_combo_key = None
+        self._export_combo_key = None
         self.last_export_settings = None
+        # Preset edits are written together once they stop for a moment
+        self._save_timer = QTimer(app)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self.save_presets_to_file)
     
     def get_default_detection_presets(self):
-        """Returns a dictionary of default detection presets."""
-        return {
-            "Default": {
-                "sliders": {"Smoothing": 3, "Edge Sensitivity": 50, "Edge Threshold": 150, "Edge Margin": 2, "Min Merge Distance": 10, "Min Area": 124},
-                "checkboxes": {"High Resolution": False, "Merge Contours": True, "Remove Hatching": False},
-                "radios": {"Edge Detection": True, "Color Detection": False, "Min Area Percentage": True, "Min Area Pixels": False},
-                "colors": [], # Default: no specific colors
-                "hatching": {"color": [0, 0, 0], "threshold": 10.0, "width": 3} # Default hatching settings
-            },
-            "Fine Detail": {
-                "sliders": {
-                    "Min Area": 4450,
-                    "Smoothing": 3,
-                    "Edge Sensitivity": 255,
-                    "Edge Threshold": 140,
-                    "Edge Margin": 1,
-                    "Min Merge Distance": 5
-                },
-                "checkboxes": {
-                    "High Resolution": False,
-                    "Merge Contours": False,
-                    "Remove Hatching": False
-                },
-                "radios": {
-                    "Edge Detection": True,
-                    "Color Detection": False,
-                    "Min Area Percentage": False,
-                    "Min Area Pixels": True
-                },
-                "colors": [],
-                "hatching": {
-                    "color": [
-                        0,
-                        0,
-                        0
-                    ],
-                    "threshold": 10.0,
-                    "width": 3
-                }
-            },
-             "Color Focus (Solid Black)": {
-                "sliders": {"Smoothing": 3, "Edge Sensitivity": 50, "Edge Threshold": 150, "Edge Margin": 2, "Min Merge Distance": 10, "Min Area": 500},
-                "checkboxes": {"High Resolution": False, "Merge Contours": True, "Remove Hatching": False},
-                "radios": {"Edge Detection": False, "Color Detection": True, "Min Area Percentage": True, "Min Area Pixels": False},
-                "colors": [{"color": [0, 0, 0], "threshold": 0.0}], # Black color with threshold 0
-                "hatching": {"color": [0, 0, 0], "threshold": 10.0, "width": 3}
-            },
-            "B/W with Hatching": {
-                "sliders": {
-                    "Min Area": 464,
-                    "Smoothing": 5,
-                    "Edge Sensitivity": 255,
-                    "Edge Threshold": 106,
-                    "Edge Margin": 0,
-                    "Min Merge Distance": 5
-                },
-                "checkboxes": {
-                    "High Resolution": False,
-                    "Merge Contours": False,
-                    "Remove Hatching": True
-                },
-                "radios": {
-                    "Edge Detection": False,
-                    "Color Detection": True,
-                    "Min Area Percentage": False,
-                    "Min Area Pixels": True
-                },
-                "colors": [
-                    {
-                        "color": [
-                            0,
-                            0,
-                            0
-                        ],
-                        "threshold": 0.0
-                    }
-                ],
-                "hatching": {
-                    "color": [
-                        0,
-                        0,
-                        0
-                    ],
-                    "threshold": 0.0,
-                    "width": 1
-                }
-            }
-        }
+        """Returns a read-only mapping of default detection presets."""
+        return _DEFAULT_DETECTION_PRESETS
 
     def get_default_export_presets(self):
-        return {
-            "Default": {
-                "simplify_tolerance": 0.0005,
-                "max_wall_length": 50,
-                "max_walls": 5000,
-                "merge_distance": 25.0,
-                "angle_tolerance": 1.0,
-                "max_gap": 10.0,
-                "grid_size": 0,
-                "allow_half_grid": False
-            },
-            "Maze Example": {
-                "simplify_tolerance": 0.0,
-                "max_wall_length": 50,
-                "max_walls": 20000,
-                "merge_distance": 25.0,
-                "angle_tolerance": 1.0,
-                "max_gap": 10.0,
-                "grid_size": 72,
-                "allow_half_grid": False
-            },
-            "Large Optimized": {
-                "simplify_tolerance": 0.0005,
-                "max_wall_length": 200,
-                "max_walls": 20000,
-                "merge_distance": 100.0,
-                "angle_tolerance": 1.0,
-                "max_gap": 10.0,
-                "grid_size": 0,
-                "allow_half_grid": False
-            },
-            "Large Extra Optimized": {
-                "simplify_tolerance": 0.0005,
-                "max_wall_length": 200,
-                "max_walls": 20000,
-                "merge_distance": 200.0,
-                "angle_tolerance": 1.0,
-                "max_gap": 10.0,
-                "grid_size": 0,
-                "allow_half_grid": False
-            }
-        }
+        """Returns a read-only mapping of default export presets."""
+        return _DEFAULT_EXPORT_PRESETS
 
     def load_presets_from_file(self):
-        """Load detection and export presets from JSON files."""
-        # Load Detection Presets
-        self.detection_presets = self.get_default_detection_presets() # Start with defaults
-        if os.path.exists(DETECTION_PRESETS_FILE):
-            try:
-                with open(DETECTION_PRESETS_FILE, 'r') as f:
-                    user_presets = json.load(f)
-                    # Merge user presets, potentially overwriting defaults if names clash
-                    self.detection_presets.update(user_presets)
-                print(f"Loaded detection presets from {DETECTION_PRESETS_FILE}")
-            except json.JSONDecodeError:
-                print(f"Error: Could not decode {DETECTION_PRESETS_FILE}. Using defaults.")
-            except Exception as e:
-                print(f"Error loading detection presets: {e}. Using defaults.")
-        else:
-            print(f"{DETECTION_PRESETS_FILE} not found. Using default detection presets.")
-
-        # Load Export Presets
-        self.export_presets = self.get_default_export_presets()
-        if os.path.exists(EXPORT_PRESETS_FILE):
-            try:
-                with open(EXPORT_PRESETS_FILE, 'r') as f:
-                    user_presets = json.load(f)
-                    self.export_presets.update(user_presets)
-            except Exception as e:
-                print(f"Error loading export presets: {e}")
+        """Load detection and export presets from JSON files.
+
+        A file that has not changed since it was last loaded or saved is not
+        re-read; the presets already in memory are kept.
+        """
+        self._apply_preset_files(self.read_preset_files(reuse_unchanged=True))
+
+    def load_presets_in_background(self):
+        """Start loading the preset files on the thread pool.
+
+        The preset combo boxes are filled once the files have been read.
+        """
+        # Keep a reference so the signal object outlives the runnable
+        self.preset_load_signals = PresetLoadSignals()
+        self.preset_load_signals.finished.connect(self._on_preset_files_read)
+        QThreadPool.globalInstance().start(PresetLoadWorker(self, self.preset_load_signals))
+
+    def _on_preset_files_read(self, result):
+        if self._presets_loaded:
+            # A synchronous load already happened (e.g. a save before this arrived)
+            return
+        self._apply_preset_files(result)
+        self.update_detection_preset_combo()
+        self.update_export_preset_combo()
+
+    def read_preset_files(self, reuse_unchanged=False):
+        """Read both preset files without touching the manager's state.
+
+        Safe to call from a worker thread. With reuse_unchanged, a file whose
+        mtime matches the last load or save yields None instead of being parsed.
+
+        Returns:
+            Tuple (detection_presets, detection_mtime, export_presets, export_mtime)
+        """
+        detection_mtime = _file_mtime(DETECTION_PRESETS_FILE)
+        detection_presets = None
+        if not (reuse_unchanged and self.detection_presets and detection_mtime == self._detection_presets_mtime):
+            detection_presets = _load_presets(DETECTION_PRESETS_FILE, self.get_default_detection_presets(), "detection")
+
+        export_mtime = _file_mtime(EXPORT_PRESETS_FILE)
+        export_presets = None
+        if not (reuse_unchanged and self.export_presets and export_mtime == self._export_presets_mtime):
+            export_presets = _load_presets(EXPORT_PRESETS_FILE, self.get_default_export_presets(), "export")
+
+        return detection_presets, detection_mtime, export_presets, export_mtime
+
+    def _apply_preset_files(self, result):
+        detection_presets, detection_mtime, export_presets, export_mtime = result
+        if detection_presets is not None:
+            self.detection_presets = detection_presets
+            self._detection_presets_mtime = detection_mtime
+        if export_presets is not None:
+            self.export_presets = export_presets
+            self._export_presets_mtime = export_mtime
+        self._presets_loaded = True
 
     def save_presets_to_file(self):
         """Save user-defined detection and export presets to JSON files."""
-        # Save Detection Presets (only non-default ones)
-        default_preset_names = self.get_default_detection_presets().keys()
-        user_detection_presets = {
-            name: preset for name, preset in self.detection_presets.items()
-            if name not in default_preset_names
-        }
-        try:
-            with open(DETECTION_PRESETS_FILE, 'w') as f:
-                json.dump(user_detection_presets, f, indent=4)
-            print(f"Saved user detection presets to {DETECTION_PRESETS_FILE}")
-        except Exception as e:
-            print(f"Error saving detection presets: {e}")
-
-        # Save Export Presets
-        default_export_names = self.get_default_export_presets().keys()
-        user_export_presets = {
-            name: preset for name, preset in self.export_presets.items()
-            if name not in default_export_names
-        }
-        try:
-            with open(EXPORT_PRESETS_FILE, 'w') as f:
-                json.dump(user_export_presets, f, indent=4)
-        except Exception as e:
-            print(f"Error saving export presets: {e}")
+        if not self._presets_loaded:
+            # The background load has not finished; merge what is on disk
+            # first so saving cannot drop the user's existing presets
+            detection_changes, export_changes = self.detection_presets, self.export_presets
+            self.load_presets_from_file()
+            self.detection_presets.update(detection_changes)
+            self.export_presets.update(export_changes)
+
+        # Only user presets are written; defaults are rebuilt on load
+        mtime = _save_presets(DETECTION_PRESETS_FILE, self.detection_presets, self._DEFAULT_DETECTION_NAMES, "detection")
+        if mtime is not None:
+            self._detection_presets_mtime = mtime
+        mtime = _save_presets(EXPORT_PRESETS_FILE, self.export_presets, self._DEFAULT_EXPORT_NAMES, "export")
+        if mtime is not None:
+            self._export_presets_mtime = mtime
+
+    def schedule_save(self):
+        """Save the presets shortly, folding rapid edits into one write."""
+        self._save_timer.start()
+
+    def flush_pending_save(self):
+        """Write a scheduled save now, e.g. before the application exits."""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_presets_to_file()
 
     def update_detection_preset_combo(self):
         """Update the detection preset combo box with current preset names."""
-        self.app.detection_preset_combo.blockSignals(True) # Prevent triggering load while updating
-        current_selection = self.app.detection_preset_combo.currentText()
-        self.app.detection_preset_combo.clear()
-        # Add a placeholder item first
-        self.app.detection_preset_combo.addItem("-- Select Preset --")
-        # Add sorted preset names
-        sorted_names = sorted(self.detection_presets.keys())
-        for name in sorted_names:
-            self.app.detection_preset_combo.addItem(name)
-
-        # Try to restore previous selection
-        index = self.app.detection_preset_combo.findText(current_selection)
-        if index != -1:
-            self.app.detection_preset_combo.setCurrentIndex(index)
-        else:
-            self.app.detection_preset_combo.setCurrentIndex(0) # Select placeholder
-
-        self.app.detection_preset_combo.blockSignals(False)
+        # Editing an existing preset does not change the list
+        names = frozenset(self.detection_presets)
+        if names == self._detection_combo_key:
+            return
+        self._detection_combo_key = names
+
+        combo = self.app.detection_preset_combo
+        # Prevent triggering load while updating, and repaint the combo once
+        with (signal_disconnected(combo.currentIndexChanged, self.load_detection_preset_selected),
+              updates_disabled(combo)):
+            current_selection = combo.currentText()
+            combo.clear()
+            # Placeholder item first, then the sorted preset names, in one insert
+            combo.addItems(["-- Select Preset --", *sorted(self.detection_presets)])
+
+            # Try to restore previous selection
+            index = combo.findText(current_selection)
+            if index != -1:
+                combo.setCurrentIndex(index)
+            else:
+                combo.setCurrentIndex(0) # Select placeholder
 
     def update_export_preset_combo(self):
         """Update the UVTT export preset combo box with current preset names."""
-        self.app.uvtt_export_preset_combo.blockSignals(True)
-        current_selection = self.app.uvtt_export_preset_combo.currentText()
-        self.app.uvtt_export_preset_combo.clear()
-        self.app.uvtt_export_preset_combo.addItem("-- Select Preset --")
-        for name in sorted(self.export_presets.keys()):
-            self.app.uvtt_export_preset_combo.addItem(name)
-        
-        # Try to restore previous selection
-        index = self.app.uvtt_export_preset_combo.findText(current_selection)
-        if index != -1:
-            self.app.uvtt_export_preset_combo.setCurrentIndex(index)
-        else:
-            self.app.uvtt_export_preset_combo.setCurrentIndex(0)
-            
-        self.app.uvtt_export_preset_combo.blockSignals(False)
+        names = frozenset(self.export_presets)
+        if names == self._export_combo_key:
+            return
+        self._export_combo_key = names
+
+        combo = self.app.uvtt_export_preset_combo
+        with (signal_disconnected(combo.currentIndexChanged, self.load_export_preset_selected),
+              updates_disabled(combo)):
+            current_selection = combo.currentText()
+            combo.clear()
+            combo.addItems(["-- Select Preset --", *sorted(self.export_presets)])
+
+            # Try to restore previous selection
+            index = combo.findText(current_selection)
+            if index != -1:
+                combo.setCurrentIndex(index)
+            else:
+                combo.setCurrentIndex(0)
 
     def get_current_detection_settings(self):
         """Gather current detection settings into a dictionary."""
@@ -278,17 +431,10 @@ class PresetManager:
         settings["radios"]["Min Area Pixels"] = self.app.min_area_pixels_radio.isChecked()
 
         # Colors
-        for i in range(self.app.wall_colors_list.count()):
-            item = self.app.wall_colors_list.item(i)
-            color_data = item.data(Qt.ItemDataRole.UserRole)
-            qcolor = color_data["color"]
-            settings["colors"].append({
-                "color": [qcolor.red(), qcolor.green(), qcolor.blue()],
-                "threshold": color_data["threshold"]
-            })
+        settings["colors"] = _color_list_settings(self.app.wall_colors_list)
 
         # Hatching Settings
-        settings["hatching"]["color"] = [self.app.hatching_color.red(), self.app.hatching_color.green(), self.app.hatching_color.blue()]
+        settings["hatching"]["color"] = list(self.app.hatching_color.getRgb()[:3])
         settings["hatching"]["threshold"] = self.app.hatching_threshold
         settings["hatching"]["width"] = self.app.hatching_width
 
@@ -308,19 +454,9 @@ class PresetManager:
             "min_size": self.app.light_min_size_slider.value(),
             "max_size": self.app.light_max_size_slider.value(),
             "merge_distance": self.app.light_merge_distance_slider.value(),
-            "colors": []
+            "colors": _color_list_settings(self.app.light_colors_list)
         }
 
-        # Light Colors
-        for i in range(self.app.light_colors_list.count()):
-            item = self.app.light_colors_list.item(i)
-            color_data = item.data(Qt.ItemDataRole.UserRole)
-            qcolor = color_data["color"]
-            settings["light_detection"]["colors"].append({
-                "color": [qcolor.red(), qcolor.green(), qcolor.blue()],
-                "threshold": color_data["threshold"]
-            })
-
         # Grid Settings (for walls mode and overlay)
         settings["grid_settings"] = {
             "enable_grid": self.app.uvtt_enable_grid.isChecked(),
@@ -359,6 +495,16 @@ class PresetManager:
         }
         return settings
 
+    @contextlib.contextmanager
+    def _batch_ui_update(self, widgets):
+        """Block signals on widgets and hold repaints of the controls panel.
+
+        Every setValue/setChecked inside the block would otherwise schedule
+        its own repaint; re-enabling updates repaints the panel once.
+        """
+        with updates_disabled(self.app.right_panel), signals_blocked(*widgets):
+            yield
+
     def apply_detection_settings(self, settings):
         """Apply settings from a dictionary to the UI and internal state."""
         log_debug(f"apply_detection_settings called with {len(settings) if settings else 0} setting groups")
@@ -367,262 +513,30 @@ class PresetManager:
             return
 
         # Block signals to prevent unwanted updates during application
-        for info in self.app.sliders.values():
-            if 'slider' in info: 
-                info['slider'].blockSignals(True)
-        self.app.high_res_checkbox.blockSignals(True)
-        self.app.merge_contours.blockSignals(True)
-        self.app.remove_hatching_checkbox.blockSignals(True)
-        self.app.edge_detection_radio.blockSignals(True)
-        self.app.color_detection_radio.blockSignals(True)
-        self.app.min_area_percentage_radio.blockSignals(True)
-        self.app.min_area_pixels_radio.blockSignals(True)
-        self.app.wall_colors_list.blockSignals(True)
-        self.app.hatching_color_button.blockSignals(True)
-        self.app.hatching_threshold_slider.blockSignals(True)
-        self.app.hatching_width_slider.blockSignals(True)
-
-        # Background removal controls
-        self.app.bg_removal_checkbox.blockSignals(True)
-        self.app.bg_removal_model_combo.blockSignals(True)
-        self.app.bg_removal_res_combo.blockSignals(True)
-        self.app.bg_removal_device_combo.blockSignals(True)
-        self.app.bg_removal_preview_checkbox.blockSignals(True)
-
-        # Light detection controls
-        self.app.enable_light_detection.blockSignals(True)
-        self.app.light_brightness_slider.blockSignals(True)
-        self.app.light_min_size_slider.blockSignals(True)
-        self.app.light_max_size_slider.blockSignals(True)
-        self.app.light_merge_distance_slider.blockSignals(True)
-        self.app.light_colors_list.blockSignals(True)
-        
-        # Grid settings controls
-        self.app.uvtt_enable_grid.blockSignals(True)
-        self.app.uvtt_same_as_overlay.blockSignals(True)
-        self.app.uvtt_grid_size_spinbox.blockSignals(True)
-        self.app.uvtt_allow_half_grid.blockSignals(True)
-        self.app.uvtt_grid_offset_x_spinbox.blockSignals(True)
-        self.app.uvtt_grid_offset_y_spinbox.blockSignals(True)
-        self.app.uvtt_show_grid_overlay.blockSignals(True)
-        self.app.uvtt_overlay_grid_size_spinbox.blockSignals(True)
-        self.app.uvtt_overlay_offset_x_spinbox.blockSignals(True)
-        self.app.uvtt_overlay_offset_y_spinbox.blockSignals(True)
-
-        try:
-            # Apply Radio Buttons FIRST (handle mutually exclusive groups)
-            # This ensures min_area mode is set before we apply the slider values
-            if "radios" in settings:
-                # Set detection mode radio buttons
-                if "Edge Detection" in settings["radios"]:
-                    self.app.edge_detection_radio.setChecked(settings["radios"]["Edge Detection"])
-                if "Color Detection" in settings["radios"]:
-                    self.app.color_detection_radio.setChecked(settings["radios"]["Color Detection"])
-                
-                # Set min area mode radio buttons
-                if "Min Area Percentage" in settings["radios"] and settings["radios"]["Min Area Percentage"]:
-                    self.app.min_area_percentage_radio.setChecked(True)
-                    self.app.using_pixels_mode = False
-                elif "Min Area Pixels" in settings["radios"] and settings["radios"]["Min Area Pixels"]:
-                    self.app.min_area_pixels_radio.setChecked(True)
-                    self.app.using_pixels_mode = True
-
-            # Apply Sliders
-            if "sliders" in settings:
-                for name, value in settings["sliders"].items():
-                    if name in self.app.sliders:
-                        # Update slider with the preset value
-                        self.app.sliders[name]['slider'].setValue(value)
-                        
-                        # Update label with proper format based on mode
-                        if name == "Min Area":
-                            label = self.app.sliders[name]['label']
-                            if hasattr(self, 'using_pixels_mode') and self.app.using_pixels_mode:
-                                # In pixel mode, show raw value
-                                label.setText(f"Min Area: {value} px")
-                            elif 'scale' in self.app.sliders[name]:
-                                # In percentage mode, apply scale factor
-                                scale = self.app.sliders[name]['scale']
-                                label.setText(f"Min Area: {value * scale:.1f}")
-
-            # Apply Checkboxes
-            if "checkboxes" in settings:
-                if "High Resolution" in settings["checkboxes"]:
-                    self.app.high_res_checkbox.setChecked(settings["checkboxes"]["High Resolution"])
-                if "Merge Contours" in settings["checkboxes"]:
-                    self.app.merge_contours.setChecked(settings["checkboxes"]["Merge Contours"])
-                if "Remove Hatching" in settings["checkboxes"]:
-                    self.app.remove_hatching_checkbox.setChecked(settings["checkboxes"]["Remove Hatching"])
-
-            # Apply Colors
-            if "colors" in settings:
-                # Clear existing colors
-                self.app.wall_colors_list.clear()
-                
-                # Add all colors from the preset
-                for color_data in settings["colors"]:
-                    rgb = color_data["color"]
-                    qcolor = QColor(rgb[0], rgb[1], rgb[2])
-                    threshold = color_data["threshold"]
-                    self.app.detection_panel.add_wall_color_to_list(qcolor, threshold)
-
-            # Apply Hatching Settings
-            if "hatching" in settings:
-                if "color" in settings["hatching"]:
-                    rgb = settings["hatching"]["color"]
-                    self.app.hatching_color = QColor(rgb[0], rgb[1], rgb[2])
-                    self.app.hatching_color_button.setStyleSheet(f"background-color: rgb({rgb[0]}, {rgb[1]}, {rgb[2]});")
-                
-                if "threshold" in settings["hatching"]:
-                    self.app.hatching_threshold = settings["hatching"]["threshold"]
-                    self.app.hatching_threshold_slider.setValue(int(self.app.hatching_threshold * 10))
-                    self.app.hatching_threshold_value.setValue(self.app.hatching_threshold)
-                
-                if "width" in settings["hatching"]:
-                    self.app.hatching_width = settings["hatching"]["width"]
-                    self.app.hatching_width_slider.setValue(self.app.hatching_width)
-                    self.app.hatching_width_value.setValue(self.app.hatching_width)
-
-            # Apply Background Removal Settings
-            bg_settings = settings.get("bg_removal", {})
-            self.app.bg_removal_checkbox.setChecked(bg_settings.get("enabled", False))
-            self.app.bg_removal_options.setVisible(bg_settings.get("enabled", False))
-
-            if "model" in bg_settings:
-                idx = self.app.bg_removal_model_combo.findData(bg_settings["model"])
-                if idx >= 0:
-                    self.app.bg_removal_model_combo.setCurrentIndex(idx)
-
-            if "resolution" in bg_settings:
-                idx = self.app.bg_removal_res_combo.findData(bg_settings["resolution"])
-                if idx >= 0:
-                    self.app.bg_removal_res_combo.setCurrentIndex(idx)
-
-            if "device" in bg_settings:
-                idx = self.app.bg_removal_device_combo.findData(bg_settings["device"])
-                if idx >= 0:
-                    self.app.bg_removal_device_combo.setCurrentIndex(idx)
-
-            self.app.bg_removal_preview_checkbox.setChecked(bg_settings.get("preview", False))
-
-            # Invalidate cached bg removal result when preset changes
-            self.app.bg_removed_image = None
-
-            # Apply Light Detection Settings (always apply defaults for missing settings)
-            light_settings = settings.get("light_detection", {})
-            
-            # Enable/disable light detection with default
-            enabled = light_settings.get("enabled", False)
-            self.app.enable_light_detection.setChecked(enabled)
-            self.app.light_options.setVisible(enabled)
-            
-            # Light detection parameters with defaults
-            brightness_threshold = light_settings.get("brightness_threshold", 80)
-            self.app.light_brightness_slider.setValue(brightness_threshold)
-            brightness = brightness_threshold / 100.0
-            self.app.light_brightness_value.setValue(brightness)
-
-            min_size = light_settings.get("min_size", 5)
-            self.app.light_min_size_slider.setValue(min_size)
-            self.app.light_min_size_value.setValue(min_size)
-
-            max_size = light_settings.get("max_size", 500)
-            self.app.light_max_size_slider.setValue(max_size)
-            self.app.light_max_size_value.setValue(max_size)
-
-            merge_distance = light_settings.get("merge_distance", 20)
-            self.app.light_merge_distance_slider.setValue(merge_distance)
-            self.app.light_merge_distance_value.setValue(merge_distance)
-            
-            # Light colors - always reset and apply from preset
-            self.app.light_colors_list.clear()
-            if "colors" in light_settings:
-                for color_data in light_settings["colors"]:
-                    rgb = color_data["color"]
-                    qcolor = QColor(rgb[0], rgb[1], rgb[2])
-                    threshold = color_data["threshold"]
-                    self.app.detection_panel.add_light_color_to_list(qcolor, threshold)
-            else:
-                # Add default light color if no colors in preset
-                self.app.detection_panel.add_light_color_to_list(QColor(255, 255, 200), 15.0)
-
-            # Apply Grid Settings (always apply defaults for missing settings)
-            grid_settings = settings.get("grid_settings", {})
-            log_debug(f"Applying grid settings: {grid_settings}")
-            
-            # Grid snapping settings with defaults
-            enable_grid = grid_settings.get("enable_grid", False)
-            log_debug(f"Setting enable_grid to: {enable_grid}")
-            self.app.uvtt_enable_grid.setChecked(enable_grid)
-            
-            same_as_overlay = grid_settings.get("same_as_overlay", True)
-            log_debug(f"Setting same_as_overlay to: {same_as_overlay}")
-            self.app.uvtt_same_as_overlay.setChecked(same_as_overlay)
-            
-            self.app.uvtt_grid_size_spinbox.setValue(grid_settings.get("grid_size", 70))
-            self.app.uvtt_allow_half_grid.setChecked(grid_settings.get("allow_half_grid", False))
-            self.app.uvtt_grid_offset_x_spinbox.setValue(grid_settings.get("grid_offset_x", 0.0))
-            self.app.uvtt_grid_offset_y_spinbox.setValue(grid_settings.get("grid_offset_y", 0.0))
-            
-            # Grid overlay settings with defaults
-            show_overlay = grid_settings.get("show_grid_overlay", False)
-            log_debug(f"Setting grid overlay to: {show_overlay}")
-            self.app.uvtt_show_grid_overlay.setChecked(show_overlay)
-            self.app.uvtt_overlay_grid_size_spinbox.setValue(grid_settings.get("overlay_grid_size", 70))
-            self.app.uvtt_overlay_offset_x_spinbox.setValue(grid_settings.get("overlay_offset_x", 0.0))
-            self.app.uvtt_overlay_offset_y_spinbox.setValue(grid_settings.get("overlay_offset_y", 0.0))
-            
-            # Update UI visibility based on grid settings
-            self.app.on_grid_snapping_toggled()
-            self.app.on_same_as_overlay_toggled()
-            
-            # Always trigger grid overlay refresh (whether enabled or disabled)
-            # This ensures the display is updated properly in both cases
-            self.app.on_grid_overlay_toggled()
-
-        finally:
-            # Unblock signals
-            for info in self.app.sliders.values():
-                if 'slider' in info:
-                    info['slider'].blockSignals(False)
-            self.app.high_res_checkbox.blockSignals(False)
-            self.app.merge_contours.blockSignals(False)
-            self.app.remove_hatching_checkbox.blockSignals(False)
-            self.app.edge_detection_radio.blockSignals(False)
-            self.app.color_detection_radio.blockSignals(False)
-            self.app.min_area_percentage_radio.blockSignals(False)
-            self.app.min_area_pixels_radio.blockSignals(False)
-            self.app.wall_colors_list.blockSignals(False)
-            self.app.hatching_color_button.blockSignals(False)
-            self.app.hatching_threshold_slider.blockSignals(False)
-            self.app.hatching_width_slider.blockSignals(False)
-
-            # Unblock background removal controls
-            self.app.bg_removal_checkbox.blockSignals(False)
-            self.app.bg_removal_model_combo.blockSignals(False)
-            self.app.bg_removal_res_combo.blockSignals(False)
-            self.app.bg_removal_device_combo.blockSignals(False)
-            self.app.bg_removal_preview_checkbox.blockSignals(False)
-
-            # Unblock light detection controls
-            self.app.enable_light_detection.blockSignals(False)
-            self.app.light_brightness_slider.blockSignals(False)
-            self.app.light_min_size_slider.blockSignals(False)
-            self.app.light_max_size_slider.blockSignals(False)
-            self.app.light_merge_distance_slider.blockSignals(False)
-            self.app.light_colors_list.blockSignals(False)
-            
-            # Unblock grid settings controls
-            self.app.uvtt_enable_grid.blockSignals(False)
-            self.app.uvtt_same_as_overlay.blockSignals(False)
-            self.app.uvtt_grid_size_spinbox.blockSignals(False)
-            self.app.uvtt_allow_half_grid.blockSignals(False)
-            self.app.uvtt_grid_offset_x_spinbox.blockSignals(False)
-            self.app.uvtt_grid_offset_y_spinbox.blockSignals(False)
-            self.app.uvtt_show_grid_overlay.blockSignals(False)
-            self.app.uvtt_overlay_grid_size_spinbox.blockSignals(False)
-            self.app.uvtt_overlay_offset_x_spinbox.blockSignals(False)
-            self.app.uvtt_overlay_offset_y_spinbox.blockSignals(False)
+        app = self.app
+        blocked = [info['slider'] for info in app.sliders.values() if 'slider' in info]
+        blocked += [
+            app.high_res_checkbox, app.merge_contours, app.remove_hatching_checkbox,
+            app.edge_detection_radio, app.color_detection_radio,
+            app.min_area_percentage_radio, app.min_area_pixels_radio,
+            app.wall_colors_list, app.hatching_color_button,
+            app.hatching_threshold_slider, app.hatching_width_slider,
+            # Background removal controls
+            app.bg_removal_checkbox, app.bg_removal_model_combo, app.bg_removal_res_combo,
+            app.bg_removal_device_combo, app.bg_removal_preview_checkbox,
+            # Light detection controls
+            app.enable_light_detection, app.light_brightness_slider,
+            app.light_min_size_slider, app.light_max_size_slider,
+            app.light_merge_distance_slider, app.light_colors_list,
+            # Grid settings controls
+            app.uvtt_enable_grid, app.uvtt_same_as_overlay, app.uvtt_grid_size_spinbox,
+            app.uvtt_allow_half_grid, app.uvtt_grid_offset_x_spinbox, app.uvtt_grid_offset_y_spinbox,
+            app.uvtt_show_grid_overlay, app.uvtt_overlay_grid_size_spinbox,
+            app.uvtt_overlay_offset_x_spinbox, app.uvtt_overlay_offset_y_spinbox,
+        ]
+
+        with self._batch_ui_update(blocked):
+            self._apply_detection_settings_to_widgets(settings)
 
         # Now that all settings are applied, explicitly call toggle_detection_mode_radio
         # to ensure the UI reflects the detection mode correctly
@@ -637,6 +551,178 @@ class PresetManager:
             self.app.refresh_display()
         self.app.setStatusTip("Applied detection preset.")
 
+    def _apply_detection_settings_to_widgets(self, settings):
+        """Push a detection settings dictionary into the widgets; signals are blocked by the caller."""
+        # Apply Radio Buttons FIRST (handle mutually exclusive groups)
+        # This ensures min_area mode is set before we apply the slider values
+        if "radios" in settings:
+            # Set detection mode radio buttons
+            if "Edge Detection" in settings["radios"]:
+                self.app.edge_detection_radio.setChecked(settings["radios"]["Edge Detection"])
+            if "Color Detection" in settings["radios"]:
+                self.app.color_detection_radio.setChecked(settings["radios"]["Color Detection"])
+            
+            # Set min area mode radio buttons
+            if "Min Area Percentage" in settings["radios"] and settings["radios"]["Min Area Percentage"]:
+                self.app.min_area_percentage_radio.setChecked(True)
+                self.app.using_pixels_mode = False
+            elif "Min Area Pixels" in settings["radios"] and settings["radios"]["Min Area Pixels"]:
+                self.app.min_area_pixels_radio.setChecked(True)
+                self.app.using_pixels_mode = True
+
+        # Apply Sliders
+        if "sliders" in settings:
+            for name, value in settings["sliders"].items():
+                if name in self.app.sliders:
+                    # Update slider with the preset value
+                    slider_info = self.app.sliders[name]
+                    slider_info['slider'].setValue(value)
+
+                    # Slider signals are blocked, so sync the spinbox by hand
+                    spinbox = slider_info.get('spinbox')
+                    if spinbox is not None:
+                        scale = slider_info.get('scale')
+                        with QSignalBlocker(spinbox):
+                            if scale:
+                                spinbox.setValue(round(value * scale, 3 if scale < 0.01 else 1))
+                            else:
+                                spinbox.setValue(value)
+
+        # Apply Checkboxes
+        if "checkboxes" in settings:
+            if "High Resolution" in settings["checkboxes"]:
+                self.app.high_res_checkbox.setChecked(settings["checkboxes"]["High Resolution"])
+            if "Merge Contours" in settings["checkboxes"]:
+                self.app.merge_contours.setChecked(settings["checkboxes"]["Merge Contours"])
+            if "Remove Hatching" in settings["checkboxes"]:
+                self.app.remove_hatching_checkbox.setChecked(settings["checkboxes"]["Remove Hatching"])
+
+        # Apply Colors
+        if "colors" in settings:
+            # Clear existing colors
+            self.app.wall_colors_list.clear()
+            
+            # Add all colors from the preset
+            for color_data in settings["colors"]:
+                rgb = color_data["color"]
+                qcolor = QColor(rgb[0], rgb[1], rgb[2])
+                threshold = color_data["threshold"]
+                self.app.detection_panel.add_wall_color_to_list(qcolor, threshold)
+
+        # Apply Hatching Settings
+        if "hatching" in settings:
+            if "color" in settings["hatching"]:
+                rgb = settings["hatching"]["color"]
+                self.app.hatching_color = QColor(rgb[0], rgb[1], rgb[2])
+                set_color_swatch(self.app.hatching_color_button, self.app.hatching_color)
+            
+            if "threshold" in settings["hatching"]:
+                self.app.hatching_threshold = settings["hatching"]["threshold"]
+                self.app.hatching_threshold_slider.setValue(int(self.app.hatching_threshold * 10))
+                self.app.hatching_threshold_value.setValue(self.app.hatching_threshold)
+            
+            if "width" in settings["hatching"]:
+                self.app.hatching_width = settings["hatching"]["width"]
+                self.app.hatching_width_slider.setValue(self.app.hatching_width)
+                self.app.hatching_width_value.setValue(self.app.hatching_width)
+
+        # Apply Background Removal Settings
+        bg_settings = settings.get("bg_removal", {})
+        self.app.bg_removal_checkbox.setChecked(bg_settings.get("enabled", False))
+        self.app.bg_removal_options.setVisible(bg_settings.get("enabled", False))
+
+        if "model" in bg_settings:
+            idx = self.app.bg_removal_model_combo.findData(bg_settings["model"])
+            if idx >= 0:
+                self.app.bg_removal_model_combo.setCurrentIndex(idx)
+
+        if "resolution" in bg_settings:
+            idx = self.app.bg_removal_res_combo.findData(bg_settings["resolution"])
+            if idx >= 0:
+                self.app.bg_removal_res_combo.setCurrentIndex(idx)
+
+        if "device" in bg_settings:
+            idx = self.app.bg_removal_device_combo.findData(bg_settings["device"])
+            if idx >= 0:
+                self.app.bg_removal_device_combo.setCurrentIndex(idx)
+
+        self.app.bg_removal_preview_checkbox.setChecked(bg_settings.get("preview", False))
+
+        # Invalidate cached bg removal result when preset changes
+        self.app.bg_removed_image = None
+
+        # Apply Light Detection Settings (always apply defaults for missing settings)
+        light_settings = settings.get("light_detection", {})
+        
+        # Enable/disable light detection with default
+        enabled = light_settings.get("enabled", False)
+        self.app.enable_light_detection.setChecked(enabled)
+        self.app.light_options.setVisible(enabled)
+        
+        # Light detection parameters with defaults
+        brightness_threshold = light_settings.get("brightness_threshold", 80)
+        self.app.light_brightness_slider.setValue(brightness_threshold)
+        brightness = brightness_threshold / 100.0
+        self.app.light_brightness_value.setValue(brightness)
+
+        min_size = light_settings.get("min_size", 5)
+        self.app.light_min_size_slider.setValue(min_size)
+        self.app.light_min_size_value.setValue(min_size)
+
+        max_size = light_settings.get("max_size", 500)
+        self.app.light_max_size_slider.setValue(max_size)
+        self.app.light_max_size_value.setValue(max_size)
+
+        merge_distance = light_settings.get("merge_distance", 20)
+        self.app.light_merge_distance_slider.setValue(merge_distance)
+        self.app.light_merge_distance_value.setValue(merge_distance)
+        
+        # Light colors - always reset and apply from preset
+        self.app.light_colors_list.clear()
+        if "colors" in light_settings:
+            for color_data in light_settings["colors"]:
+                rgb = color_data["color"]
+                qcolor = QColor(rgb[0], rgb[1], rgb[2])
+                threshold = color_data["threshold"]
+                self.app.detection_panel.add_light_color_to_list(qcolor, threshold)
+        else:
+            # Add default light color if no colors in preset
+            self.app.detection_panel.add_light_color_to_list(QColor(255, 255, 200), 15.0)
+
+        # Apply Grid Settings (always apply defaults for missing settings)
+        grid_settings = settings.get("grid_settings", {})
+        log_debug(f"Applying grid settings: {grid_settings}")
+        
+        # Grid snapping settings with defaults
+        enable_grid = grid_settings.get("enable_grid", False)
+        log_debug(f"Setting enable_grid to: {enable_grid}")
+        self.app.uvtt_enable_grid.setChecked(enable_grid)
+        
+        same_as_overlay = grid_settings.get("same_as_overlay", True)
+        log_debug(f"Setting same_as_overlay to: {same_as_overlay}")
+        self.app.uvtt_same_as_overlay.setChecked(same_as_overlay)
+        
+        self.app.uvtt_grid_size_spinbox.setValue(grid_settings.get("grid_size", 70))
+        self.app.uvtt_allow_half_grid.setChecked(grid_settings.get("allow_half_grid", False))
+        self.app.uvtt_grid_offset_x_spinbox.setValue(grid_settings.get("grid_offset_x", 0.0))
+        self.app.uvtt_grid_offset_y_spinbox.setValue(grid_settings.get("grid_offset_y", 0.0))
+        
+        # Grid overlay settings with defaults
+        show_overlay = grid_settings.get("show_grid_overlay", False)
+        log_debug(f"Setting grid overlay to: {show_overlay}")
+        self.app.uvtt_show_grid_overlay.setChecked(show_overlay)
+        self.app.uvtt_overlay_grid_size_spinbox.setValue(grid_settings.get("overlay_grid_size", 70))
+        self.app.uvtt_overlay_offset_x_spinbox.setValue(grid_settings.get("overlay_offset_x", 0.0))
+        self.app.uvtt_overlay_offset_y_spinbox.setValue(grid_settings.get("overlay_offset_y", 0.0))
+        
+        # Update UI visibility based on grid settings
+        self.app.on_grid_snapping_toggled()
+        self.app.on_same_as_overlay_toggled()
+        
+        # Always trigger grid overlay refresh (whether enabled or disabled)
+        # This ensures the display is updated properly in both cases
+        self.app.on_grid_overlay_toggled()
+
     def apply_export_settings(self, settings):
         """Apply export settings from a dictionary to the UVTT panel spinboxes."""
         if not settings:
@@ -644,24 +730,15 @@ class PresetManager:
             return
         
         # Block signals during update to prevent triggering changes
-        self.app.uvtt_tolerance_spinbox.blockSignals(True)
-        self.app.uvtt_max_length_spinbox.blockSignals(True)
-        self.app.uvtt_max_walls_spinbox.blockSignals(True)
-        self.app.uvtt_merge_distance_spinbox.blockSignals(True)
-        self.app.uvtt_angle_tolerance_spinbox.blockSignals(True)
-        self.app.uvtt_max_gap_spinbox.blockSignals(True)
-        self.app.uvtt_enable_grid.blockSignals(True)
-        self.app.uvtt_same_as_overlay.blockSignals(True)
-        self.app.uvtt_grid_size_spinbox.blockSignals(True)
-        self.app.uvtt_allow_half_grid.blockSignals(True)
-        self.app.uvtt_grid_offset_x_spinbox.blockSignals(True)
-        self.app.uvtt_grid_offset_y_spinbox.blockSignals(True)
-        self.app.uvtt_show_grid_overlay.blockSignals(True)
-        self.app.uvtt_overlay_grid_size_spinbox.blockSignals(True)
-        self.app.uvtt_overlay_offset_x_spinbox.blockSignals(True)
-        self.app.uvtt_overlay_offset_y_spinbox.blockSignals(True)
-        
-        try:
+        app = self.app
+        with self._batch_ui_update([
+            app.uvtt_tolerance_spinbox, app.uvtt_max_length_spinbox, app.uvtt_max_walls_spinbox,
+            app.uvtt_merge_distance_spinbox, app.uvtt_angle_tolerance_spinbox, app.uvtt_max_gap_spinbox,
+            app.uvtt_enable_grid, app.uvtt_same_as_overlay, app.uvtt_grid_size_spinbox,
+            app.uvtt_allow_half_grid, app.uvtt_grid_offset_x_spinbox, app.uvtt_grid_offset_y_spinbox,
+            app.uvtt_show_grid_overlay, app.uvtt_overlay_grid_size_spinbox,
+            app.uvtt_overlay_offset_x_spinbox, app.uvtt_overlay_offset_y_spinbox,
+        ]):
             # Apply all settings with defaults for missing values
             self.app.uvtt_tolerance_spinbox.setValue(settings.get("simplify_tolerance", 0.001))
             self.app.uvtt_max_length_spinbox.setValue(settings.get("max_wall_length", 50))
@@ -683,36 +760,17 @@ class PresetManager:
             self.app.uvtt_overlay_grid_size_spinbox.setValue(settings.get("overlay_grid_size", 70))
             self.app.uvtt_overlay_offset_x_spinbox.setValue(settings.get("overlay_offset_x", 0.0))
             self.app.uvtt_overlay_offset_y_spinbox.setValue(settings.get("overlay_offset_y", 0.0))
-                
-        finally:
-            # Unblock signals
-            self.app.uvtt_tolerance_spinbox.blockSignals(False)
-            self.app.uvtt_max_length_spinbox.blockSignals(False)
-            self.app.uvtt_max_walls_spinbox.blockSignals(False)
-            self.app.uvtt_merge_distance_spinbox.blockSignals(False)
-            self.app.uvtt_angle_tolerance_spinbox.blockSignals(False)
-            self.app.uvtt_max_gap_spinbox.blockSignals(False)
-            self.app.uvtt_enable_grid.blockSignals(False)
-            self.app.uvtt_same_as_overlay.blockSignals(False)
-            self.app.uvtt_grid_size_spinbox.blockSignals(False)
-            self.app.uvtt_allow_half_grid.blockSignals(False)
-            self.app.uvtt_grid_offset_x_spinbox.blockSignals(False)
-            self.app.uvtt_grid_offset_y_spinbox.blockSignals(False)
-            self.app.uvtt_show_grid_overlay.blockSignals(False)
-            self.app.uvtt_overlay_grid_size_spinbox.blockSignals(False)
-            self.app.uvtt_overlay_offset_x_spinbox.blockSignals(False)
-            self.app.uvtt_overlay_offset_y_spinbox.blockSignals(False)
-            
-            # Update UI state after applying settings
-            self.app.on_grid_snapping_toggled()
-            self.app.on_same_as_overlay_toggled()
+
+        # Update UI state after applying settings
+        self.app.on_grid_snapping_toggled()
+        self.app.on_same_as_overlay_toggled()
 
     def save_detection_preset(self):
         """Save the current detection settings as a new preset."""
         preset_name, ok = QInputDialog.getText(self.app, "Save Detection Preset", "Enter preset name:")
         if ok and preset_name:
             # Check if overwriting a default preset
-            if preset_name in self.get_default_detection_presets():
+            if preset_name in self._DEFAULT_DETECTION_NAMES:
                  reply = QMessageBox.question(self.app, "Overwrite Default Preset?",
                                              f"'{preset_name}' is a default preset. Overwrite it?",
                                              QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -736,7 +794,7 @@ class PresetManager:
             index = self.app.detection_preset_combo.findText(preset_name)
             if index != -1:
                 self.app.detection_preset_combo.setCurrentIndex(index)
-            self.save_presets_to_file() # Persist changes
+            self.schedule_save() # Persist changes
             self.app.setStatusTip(f"Saved detection preset '{preset_name}'.")
         elif ok and not preset_name:
              QMessageBox.warning(self.app, "Invalid Name", "Preset name cannot be empty.")
@@ -757,8 +815,7 @@ class PresetManager:
 
     def manage_detection_presets(self):
         """Show a dialog or menu to manage (delete) user presets."""
-        default_preset_names = set(self.get_default_detection_presets().keys())
-        user_preset_names = sorted([name for name in self.detection_presets.keys() if name not in default_preset_names])
+        user_preset_names = sorted(name for name in self.detection_presets if name not in self._DEFAULT_DETECTION_NAMES)
 
         if not user_preset_names:
             QMessageBox.information(self.app, "Manage Presets", "No user-defined presets to manage.")
@@ -776,7 +833,7 @@ class PresetManager:
                 if preset_to_delete in self.detection_presets:
                     del self.detection_presets[preset_to_delete]
                     self.update_detection_preset_combo()
-                    self.save_presets_to_file() # Persist deletion
+                    self.schedule_save() # Persist deletion
                     self.app.setStatusTip(f"Deleted preset '{preset_to_delete}'.")
                     print(f"Deleted preset: {preset_to_delete}")
                 else:
@@ -789,8 +846,8 @@ class PresetManager:
 
         preset_name, ok = QInputDialog.getText(self.app, "Save Export Preset", "Enter preset name:")
         if ok and preset_name:
-            self.export_presets[preset_name] = copy.deepcopy(self.app.current_export_settings)
-            self.save_presets_to_file()
+            self.export_presets[preset_name] = dict(self.app.current_export_settings)
+            self.schedule_save()
             self.app.setStatusTip(f"Saved export preset '{preset_name}'")
 
     def load_export_preset_selected(self, index):
@@ -799,7 +856,7 @@ class PresetManager:
         if index > 0 and preset_name in self.export_presets:
             settings = self.export_presets[preset_name]
             self.apply_export_settings(settings)
-            self.app.current_export_settings = copy.deepcopy(settings)
+            self.app.current_export_settings = dict(settings)
             self.app.setStatusTip(f"Loaded export preset '{preset_name}'")
             # Refresh display to update grid overlay
             self.app.refresh_display()
@@ -808,8 +865,7 @@ class PresetManager:
 
     def manage_export_presets(self):
         """Show a dialog to manage (delete) export presets."""
-        default_preset_names = set(self.get_default_export_presets().keys())
-        user_preset_names = sorted([name for name in self.export_presets.keys() if name not in default_preset_names])
+        user_preset_names = sorted(name for name in self.export_presets if name not in self._DEFAULT_EXPORT_NAMES)
         
         if not user_preset_names:
             QMessageBox.information(self.app, "Manage Export Presets", "No user-defined export presets to manage.")
@@ -826,7 +882,7 @@ class PresetManager:
                 if preset_to_delete in self.export_presets:
                     del self.export_presets[preset_to_delete]
                     self.update_export_preset_combo()
-                    self.save_presets_to_file()
+                    self.schedule_save()
                     self.app.setStatusTip(f"Deleted export preset '{preset_to_delete}'")
                     print(f"Deleted export preset: {preset_to_delete}")
                 else:
@@ -839,7 +895,7 @@ class PresetManager:
         preset_name, ok = QInputDialog.getText(self.app, "Save Export Preset", "Enter preset name:")
         if ok and preset_name:
             # Check if overwriting a default preset
-            if preset_name in self.get_default_export_presets():
+            if preset_name in self._DEFAULT_EXPORT_NAMES:
                 reply = QMessageBox.question(self.app, "Overwrite Default Preset?",
                                             f"'{preset_name}' is a default preset. Overwrite it?",
                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -857,7 +913,7 @@ class PresetManager:
                     return  # User cancelled overwrite
 
             # Save the preset
-            self.export_presets[preset_name] = copy.deepcopy(current_settings)
+            self.export_presets[preset_name] = dict(current_settings)
             self.update_export_preset_combo()
             
             # Select the newly saved preset in the combo box
@@ -865,8 +921,8 @@ class PresetManager:
             if index != -1:
                 self.app.uvtt_export_preset_combo.setCurrentIndex(index)
                 
-            self.save_presets_to_file()
-            self.app.current_export_settings = copy.deepcopy(current_settings)
+            self.schedule_save()
+            self.app.current_export_settings = dict(current_settings)
             self.app.setStatusTip(f"Saved export preset '{preset_name}'")
         elif ok and not preset_name:
             QMessageBox.warning(self.app, "Invalid Name", "Preset name cannot be empty.")
@@ -876,7 +932,7 @@ class PresetManager:
         preset_name, ok = QInputDialog.getText(self.app, "Save Export Preset", "Enter preset name:")
         if ok and preset_name:
             # Check if overwriting a default preset
-            if preset_name in self.get_default_export_presets():
+            if preset_name in self._DEFAULT_EXPORT_NAMES:
                 reply = QMessageBox.question(self.app, "Overwrite Default Preset?",
                                             f"'{preset_name}' is a default preset. Overwrite it?",
                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -913,7 +969,7 @@ class PresetManager:
             
             # Store the preset and save to file
             self.export_presets[preset_name] = new_preset
-            self.save_presets_to_file()
+            self.schedule_save()
             
             # Also update current_export_settings for consistency
             self.app.current_export_settings = new_preset.copy()
@@ -0,0 +1,2 @@
+# Reusable GUI widgets
+from src.gui.widgets.labeled_slider import LabeledSlider
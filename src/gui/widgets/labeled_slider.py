@@ -0,0 +1,65 @@
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QSlider, QSpinBox, QDoubleSpinBox
+from PyQt6.QtCore import Qt, QSignalBlocker, pyqtSignal
+
+
+class LabeledSlider(QWidget):
+    """A label, a horizontal slider and a synced spinbox in one row.
+
+    The slider always holds the integer value; the spinbox shows it converted
+    with to_display (or multiplied by scale) and writes back through to_slider.
+    The spinbox has a fixed width so value changes never re-layout the row.
+    """
+    valueChanged = pyqtSignal(int)
+
+    def __init__(self, text, minimum, maximum, value, step=1, scale=None, decimals=1,
+                 spin_width=60, to_display=None, to_slider=None, parent=None):
+        super().__init__(parent)
+
+        if scale is not None:
+            to_display = to_display or (lambda v: round(v * scale, decimals))
+            to_slider = to_slider or (lambda v: round(v / scale))
+        self._to_display = to_display or (lambda v: v)
+        self._to_slider = to_slider or (lambda v: int(round(v)))
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.label = QLabel(text)
+        layout.addWidget(self.label)
+
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setMinimum(minimum)
+        self.slider.setMaximum(maximum)
+        self.slider.setSingleStep(step)
+        self.slider.setValue(value)
+        layout.addWidget(self.slider)
+
+        if scale is not None:
+            self.spinbox = QDoubleSpinBox()
+            self.spinbox.setDecimals(decimals)
+            self.spinbox.setSingleStep(round(step * scale, decimals))
+        else:
+            self.spinbox = QSpinBox()
+            self.spinbox.setSingleStep(step)
+        self.spinbox.setMinimum(self._to_display(minimum))
+        self.spinbox.setMaximum(self._to_display(maximum))
+        self.spinbox.setValue(self._to_display(value))
+        self.spinbox.setFixedWidth(spin_width)
+        layout.addWidget(self.spinbox)
+
+        self.slider.valueChanged.connect(self._on_slider)
+        self.spinbox.valueChanged.connect(self._on_spinbox)
+        self.slider.valueChanged.connect(self.valueChanged)
+
+    def _on_slider(self, v):
+        with QSignalBlocker(self.spinbox):
+            self.spinbox.setValue(self._to_display(v))
+
+    def _on_spinbox(self, v):
+        self.slider.setValue(self._to_slider(v))
+
+    def value(self):
+        return self.slider.value()
+
+    def setValue(self, value):
+        self.slider.setValue(value)
@@ -0,0 +1,169 @@
+"""
+Optional numba kernels for contour hit-testing.
+
+Each kernel has a numpy fallback; callers check NUMBA_AVAILABLE and use the
+fallback when numba is not installed. Distances are kept squared so callers
+compare against threshold**2 and take at most one sqrt. Points and query
+coordinates are float32 throughout so the compiled loops stay in 32-bit lanes.
+"""
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def _point_to_segment_dist2(x, y, x1, y1, x2, y2):
+    dx = x2 - x1
+    dy = y2 - y1
+    l2 = dx * dx + dy * dy
+    # Clamp the projection to the segment; a zero-length segment projects to (x1,y1).
+    # float32 constants keep float32 inputs from being promoted to float64
+    t = np.float32(0.0)
+    if l2 > 0:
+        t = max(np.float32(0.0), min(np.float32(1.0), ((x - x1) * dx + (y - y1) * dy) / l2))
+    px = x1 + t * dx - x
+    py = y1 + t * dy - y
+    return px * px + py * py
+
+
+def _closest_contour_kernel(x, y, flat_points, offsets, candidates, threshold2):
+    found = -1
+    best = threshold2
+    for c in range(candidates.shape[0]):
+        i = candidates[c]
+        start = offsets[i]
+        end = offsets[i + 1]
+        for j in range(start, end):
+            k = j + 1 if j + 1 < end else start
+            d2 = _point_to_segment_dist2(x, y, flat_points[j, 0], flat_points[j, 1],
+                                         flat_points[k, 0], flat_points[k, 1])
+            if d2 < best:
+                best = d2
+                found = i
+        if best < 1.0:
+            # Under a pixel away; no other contour would change the result
+            break
+    return found, best
+
+
+def _nearest_segment_kernel(x, y, p0, p1, threshold2):
+    found = -1
+    best = threshold2
+    for i in range(p0.shape[0]):
+        d2 = _point_to_segment_dist2(x, y, p0[i, 0], p0[i, 1], p1[i, 0], p1[i, 1])
+        if d2 < best:
+            best = d2
+            found = i
+    return found, best
+
+
+if NUMBA_AVAILABLE:
+    try:
+        _point_to_segment_dist2 = numba.njit(cache=True, fastmath=True, inline='always')(_point_to_segment_dist2)
+        _closest_contour_numba = numba.njit(cache=True, fastmath=True)(_closest_contour_kernel)
+        _nearest_segment_numba = numba.njit(cache=True, fastmath=True)(_nearest_segment_kernel)
+    except Exception as e:
+        # e.g. no writable cache location in a frozen build
+        print(f"Numba geometry kernels unavailable, using numpy fallback: {e}")
+        NUMBA_AVAILABLE = False
+
+
+def _contour_min_dist2_numpy(x, y, points):
+    ab = np.roll(points, -1, axis=0) - points
+    ap = np.array([x, y], dtype=np.float32) - points
+    # Projection onto each segment, clamped to its endpoints; zero-length
+    # segments get t=0, i.e. the distance to the point itself
+    t = np.clip((ap * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-9), 0.0, 1.0)
+    d = ap - t[:, None] * ab
+    return float((d * d).sum(axis=1).min())
+
+
+def _closest_contour_numpy(x, y, flat_points, offsets, candidates, threshold2):
+    found = -1
+    best = threshold2
+    for i in candidates:
+        d2 = _contour_min_dist2_numpy(x, y, flat_points[offsets[i]:offsets[i + 1]])
+        if d2 < best:
+            best = d2
+            found = int(i)
+            if best < 1.0:
+                break
+    return found, best
+
+
+def closest_contour(x, y, flat_points, offsets, candidates, threshold2):
+    """
+    Find the contour with the nearest edge to (x,y) among candidates.
+
+    Parameters:
+    - x, y: Query point
+    - flat_points: (P,2) float32 array of every contour's points concatenated
+    - offsets: (M+1,) int64 array; contour i is flat_points[offsets[i]:offsets[i+1]]
+    - candidates: int64 array of contour indices to test, in ascending order
+    - threshold2: Only edges with squared distance below this count
+
+    The search stops at the first contour with an edge under one pixel away.
+
+    Returns:
+    - (index, squared distance), with index -1 if no edge is close enough
+    """
+    if NUMBA_AVAILABLE:
+        try:
+            found, best = _closest_contour_numba(np.float32(x), np.float32(y), flat_points, offsets, candidates,
+                                                 np.float32(threshold2))
+            return int(found), float(best)
+        except Exception as e:
+            print(f"Numba closest contour failed, using numpy fallback: {e}")
+    return _closest_contour_numpy(x, y, flat_points, offsets, candidates, threshold2)
+
+
+def _nearest_segment_numpy(x, y, p0, p1, threshold2):
+    if p0.shape[0] == 0:
+        return -1, threshold2
+    ab = p1 - p0
+    ap = np.array([x, y], dtype=np.float32) - p0
+    t = np.clip((ap * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-9), 0.0, 1.0)
+    d = ap - t[:, None] * ab
+    d2 = (d * d).sum(axis=1)
+    i = int(np.argmin(d2))
+    if d2[i] < threshold2:
+        return i, float(d2[i])
+    return -1, threshold2
+
+
+def nearest_segment(x, y, p0, p1, threshold2):
+    """
+    Find the segment nearest to (x,y) among independent line segments.
+
+    Parameters:
+    - x, y: Query point
+    - p0, p1: (N,2) float32 arrays; segment i runs from p0[i] to p1[i]
+    - threshold2: Only segments with squared distance below this count
+
+    Returns:
+    - (index, squared distance), with index -1 if no segment is close enough;
+      ties go to the lowest index
+    """
+    if NUMBA_AVAILABLE:
+        try:
+            found, best = _nearest_segment_numba(np.float32(x), np.float32(y), p0, p1, np.float32(threshold2))
+            return int(found), float(best)
+        except Exception as e:
+            print(f"Numba nearest segment failed, using numpy fallback: {e}")
+    return _nearest_segment_numpy(x, y, p0, p1, threshold2)
+
+
+def warm_up():
+    """Compile the kernels on a tiny input so the first hover is fast."""
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        points = np.zeros((2, 2), dtype=np.float32)
+        closest_contour(0.0, 0.0, points, np.array([0, 2], dtype=np.int64), np.array([0], dtype=np.int64), 25.0)
+        nearest_segment(0.0, 0.0, points, points, 25.0)
+    except Exception as e:
+        print(f"Numba geometry warm-up failed: {e}")
@@ -94,6 +94,12 @@ class DebugLogger:
 # Global logger instance
 debug_logger = DebugLogger()
 
+# Per-run detection diagnostics. They would be formatted and written on every
+# slider change, so DEBUG records are dropped unless AUTO_WALL_PIPELINE_DEBUG is set
+PIPELINE_LOGGER_NAME = "auto_wall.pipeline"
+logging.getLogger(PIPELINE_LOGGER_NAME).setLevel(
+    logging.DEBUG if os.environ.get("AUTO_WALL_PIPELINE_DEBUG") else logging.INFO)
+
 def log_debug(message):
     """Convenience function for debug logging."""
     debug_logger.debug(message)
@@ -1,5 +1,10 @@
 import math
 
+import cv2
+import numpy as np
+
+from src.utils._geom import closest_contour, nearest_segment
+
 def point_to_line_distance(x, y, x1, y1, x2, y2):
     """Calculate the distance from point (x,y) to line segment (x1,y1)-(x2,y2)."""
     # Line segment length squared
@@ -22,27 +27,162 @@ def point_to_line_distance(x, y, x1, y1, x2, y2):
     proj_y = y1 + t * (y2 - y1)
     return math.sqrt((x - proj_x) ** 2 + (y - proj_y) ** 2)
 
-def line_segments_intersect(app, x1, y1, x2, y2, x3, y3, x4, y4):
-    """Check if two line segments (x1,y1)-(x2,y2) and (x3,y3)-(x4,y4) intersect."""
-    # Calculate the direction vectors
-    dx1 = x2 - x1
-    dy1 = y2 - y1
-    dx2 = x4 - x3
-    dy2 = y4 - y3
-    
-    # Calculate the determinant
-    d = dx1 * dy2 - dy1 * dx2
-    
-    # If determinant is zero, lines are parallel and don't intersect
-    if d == 0:
-        return False
-        
-    # Calculate the parameters for the intersection point
-    t1 = ((x3 - x1) * dy2 - (y3 - y1) * dx2) / d
-    t2 = ((x1 - x3) * dy1 - (y1 - y3) * dx1) / (-d)
-    
-    # Check if the intersection point lies on both line segments
-    return 0 <= t1 <= 1 and 0 <= t2 <= 1
+# Cell size (working-image pixels) of the uniform grid used to index contours
+CONTOUR_GRID_CELL = 64
+
+# Tolerance (working-image pixels) of the simplified contours used for hit-testing
+HIT_TEST_EPSILON = 1.0
+
+def contour_bounding_boxes(app):
+    """Return an (M,4) array of xmin, ymin, xmax, ymax for app.current_contours.
+
+    Cached on the app and rebuilt only when the contour list no longer holds the
+    same array objects, so pops, slice replacements and undo all invalidate it.
+    Rebuilt alongside:
+    - app._contour_grid: uniform grid mapping cells to the contours whose box
+      overlaps them, for contours_near_point
+    - app._contour_flat_points / app._contour_offsets: all points concatenated,
+      contour i spanning flat_points[offsets[i]:offsets[i+1]], for the compiled
+      nearest-contour kernel
+    - app._contour_hit_points / app._contour_hit_offsets: the same layout for
+      the contours simplified with approxPolyDP(HIT_TEST_EPSILON), which every
+      contour edge stays within
+    - app._contours_union_bbox: (xmin, ymin, xmax, ymax) around every contour,
+      or None when there are none
+    """
+    contours = app.current_contours or []
+    source = app._contour_bboxes_source
+    if (source is None or len(source) != len(contours)
+            or any(a is not b for a, b in zip(source, contours))):
+        points_2d = [np.asarray(contour.reshape(-1, 2), dtype=np.float32) for contour in contours]
+        boxes = np.empty((len(contours), 4), dtype=np.float32)
+        for i, points in enumerate(points_2d):
+            boxes[i, :2] = points.min(axis=0)
+            boxes[i, 2:] = points.max(axis=0)
+
+        grid = {}
+        cells = np.floor_divide(boxes, CONTOUR_GRID_CELL).astype(np.int64)
+        for i, (cx0, cy0, cx1, cy1) in enumerate(cells.tolist()):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    grid.setdefault((cx, cy), []).append(i)
+
+        app._contour_bboxes = boxes
+        app._contours_union_bbox = ((float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                                     float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+                                    if len(boxes) else None)
+        app._contour_grid = grid
+        app._contour_flat_points = (np.concatenate(points_2d) if points_2d
+                                    else np.empty((0, 2), dtype=np.float32))
+        app._contour_offsets = np.cumsum([0] + [len(p) for p in points_2d]).astype(np.int64)
+        hit_points = [cv2.approxPolyDP(contour, HIT_TEST_EPSILON, True).reshape(-1, 2).astype(np.float32)
+                      for contour in contours]
+        app._contour_hit_points = (np.concatenate(hit_points) if hit_points
+                                   else np.empty((0, 2), dtype=np.float32))
+        app._contour_hit_offsets = np.cumsum([0] + [len(p) for p in hit_points]).astype(np.int64)
+        app._contour_bboxes_source = list(contours)
+    return app._contour_bboxes
+
+def contours_near_point(app, x, y, margin=5):
+    """Indices (ascending) of contours whose bounding box, grown by margin, contains (x,y).
+
+    Only the grid cells under the margin square are visited, so the cost depends
+    on how many contours are nearby rather than on the total count.
+    """
+    boxes = contour_bounding_boxes(app)
+    union = app._contours_union_bbox
+    # Points away from every contour (most of the blank map) stop here
+    if (union is None or not (union[0] - margin <= x <= union[2] + margin
+                              and union[1] - margin <= y <= union[3] + margin)):
+        return []
+    grid = app._contour_grid
+    candidates = set()
+    for cx in range(int((x - margin) // CONTOUR_GRID_CELL), int((x + margin) // CONTOUR_GRID_CELL) + 1):
+        for cy in range(int((y - margin) // CONTOUR_GRID_CELL), int((y + margin) // CONTOUR_GRID_CELL) + 1):
+            candidates.update(grid.get((cx, cy), ()))
+    return sorted(i for i in candidates
+                  if boxes[i, 0] - margin <= x <= boxes[i, 2] + margin
+                  and boxes[i, 1] - margin <= y <= boxes[i, 3] + margin)
+
+def contours_overlapping_rect(app, x1, y1, x2, y2, margin=0):
+    """Indices (ascending) of contours whose bounding box overlaps the rectangle.
+
+    The rectangle (x1,y1)-(x2,y2) is in working coordinates and is grown by
+    margin on every side. Only contours returned here can touch it, so
+    selection tests run the exact per-edge check on these alone.
+    """
+    boxes = contour_bounding_boxes(app)
+    overlap = ((boxes[:, 0] <= x2 + margin) & (boxes[:, 2] >= x1 - margin)
+               & (boxes[:, 1] <= y2 + margin) & (boxes[:, 3] >= y1 - margin))
+    return np.flatnonzero(overlap).tolist()
+
+def find_contour_near_point(app, img_x, img_y, threshold=5):
+    """Return the index of the contour whose edge is nearest to (img_x, img_y), or -1.
+
+    img_x, img_y are in display image coordinates (full resolution); contours
+    are in working resolution, so the point is scaled down first if needed.
+    Only edges closer than threshold pixels count.
+
+    The simplified contours are searched first. Every edge is within
+    HIT_TEST_EPSILON of its simplified version, so a miss there by more than
+    epsilon is final. A hit bounds the true nearest distance, and the full
+    contours are searched again within that bound. That pass usually covers
+    fewer contours than the threshold would, and it gives the same pick as
+    searching the full contours directly.
+    """
+    working_x, working_y = img_x, img_y
+    if app.scale_factor != 1.0 and app.original_image is not None:
+        working_x = int(img_x * app.scale_factor)
+        working_y = int(img_y * app.scale_factor)
+
+    candidates = contours_near_point(app, working_x, working_y, margin=threshold)
+    if not candidates:
+        return -1
+    outer = threshold + HIT_TEST_EPSILON
+    found_index, dist2 = closest_contour(working_x, working_y, app._contour_hit_points, app._contour_hit_offsets,
+                                         np.asarray(candidates, dtype=np.int64), outer * outer)
+    if found_index == -1:
+        return -1
+    # The nearest real edge is at most epsilon further than the simplified
+    # hit; any contour beyond that bound can never be the closest
+    bound = min(threshold, math.sqrt(dist2) + 2 * HIT_TEST_EPSILON)
+    candidates = contours_near_point(app, working_x, working_y, margin=bound)
+    found_index, _ = closest_contour(working_x, working_y, app._contour_flat_points, app._contour_offsets,
+                                     np.asarray(candidates, dtype=np.int64), bound * bound)
+    return found_index
+
+def _points_in_rect(points, x1, y1, x2, y2):
+    """Boolean mask of the (N,2) points inside the rectangle, edges included."""
+    return ((points[:, 0] >= x1) & (points[:, 0] <= x2)
+            & (points[:, 1] >= y1) & (points[:, 1] <= y2))
+
+def contour_has_point_in_rect(contour, x1, y1, x2, y2):
+    """True if any vertex of contour lies inside the rectangle (x1,y1)-(x2,y2)."""
+    return bool(_points_in_rect(contour.reshape(-1, 2), x1, y1, x2, y2).any())
+
+def contour_touches_rect(contour, x1, y1, x2, y2):
+    """True if any edge of the closed contour touches the rectangle (x1,y1)-(x2,y2).
+
+    Edges with a vertex inside are caught first; the rest are clipped against
+    the rectangle with Liang-Barsky, all edges at once, so an edge that
+    crosses the rectangle without stopping in it also counts.
+    """
+    points = contour.reshape(-1, 2).astype(np.float64)
+    if _points_in_rect(points, x1, y1, x2, y2).any():
+        return True
+    d = np.roll(points, -1, axis=0) - points
+    px, py, dx, dy = points[:, 0], points[:, 1], d[:, 0], d[:, 1]
+    t_enter = np.zeros(len(points))
+    t_exit = np.ones(len(points))
+    hit = np.ones(len(points), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, px - x1), (dx, x2 - px), (-dy, py - y1), (dy, y2 - py)):
+            # Parallel to this side and outside it: never inside
+            hit &= (p != 0) | (q >= 0)
+            r = q / p
+            t_enter = np.where(p < 0, np.maximum(t_enter, r), t_enter)
+            t_exit = np.where(p > 0, np.minimum(t_exit, r), t_exit)
+    return bool((hit & (t_enter <= t_exit)).any())
 
 def convert_to_image_coordinates(app, display_x, display_y):
     """Convert display coordinates to image coordinates, accounting for zoom and pan."""
@@ -50,11 +190,9 @@ def convert_to_image_coordinates(app, display_x, display_y):
         return None, None
     
     # Check if image_label has zoom and pan capabilities
-    if hasattr(app.image_label, 'zoom_factor') and hasattr(app.image_label, 'pan_offset'):
+    if hasattr(app.image_label, 'display_to_image_xy'):
         # Use the new zoom/pan aware conversion
-        from PyQt6.QtCore import QPointF
-        point = QPointF(display_x, display_y)
-        result = app.image_label.display_to_image_coords(point)
+        result = app.image_label.display_to_image_xy(display_x, display_y)
         if result:
             return result[0], result[1]
         return None, None
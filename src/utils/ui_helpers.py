@@ -1,38 +1,131 @@
+import contextlib
+import functools
 import os
+import sys
+
+from PyQt6.QtCore import QSignalBlocker, QTimer
+from PyQt6.QtGui import QColor, QIcon, QPixmap
+
+def _stylesheet_path():
+    """Return the location of style.qss for source runs and PyInstaller builds."""
+    if getattr(sys, 'frozen', False):
+        # Running as PyInstaller bundle
+        if hasattr(sys, '_MEIPASS') and sys.platform != "darwin":
+            # PyInstaller --onefile mode (Windows/Linux)
+            return os.path.join(sys._MEIPASS, 'src', 'styles', 'style.qss')
+        elif sys.platform == "darwin":
+            # macOS app bundle
+            return os.path.join(os.path.dirname(sys.executable), '..', 'Resources', 'src', 'styles', 'style.qss')
+        else:
+            # Other platforms
+            return os.path.join(os.path.dirname(sys.executable), 'src', 'styles', 'style.qss')
+    # Running as script
+    return os.path.join(os.path.dirname(__file__), '..', 'styles', 'style.qss')
+
+@functools.lru_cache(maxsize=1)
+def _load_stylesheet():
+    """Read style.qss once; later calls reuse the string. Returns None if missing."""
+    style_path = _stylesheet_path()
+    if not os.path.exists(style_path):
+        print(f"Warning: Stylesheet not found at {style_path}")
+        return None
+    with open(style_path, 'r') as f:
+        print(f"Loaded stylesheet from {style_path}")
+        return f.read()
 
 def apply_stylesheet(self):
     """Apply the application stylesheet from the CSS file."""
     try:
-        # Get the path to the stylesheet
-        import sys
-        if getattr(sys, 'frozen', False):
-            # Running as PyInstaller bundle
-            if hasattr(sys, '_MEIPASS') and sys.platform != "darwin":
-                # PyInstaller --onefile mode (Windows/Linux)
-                style_path = os.path.join(sys._MEIPASS, 'src', 'styles', 'style.qss')
-            elif sys.platform == "darwin":
-                # macOS app bundle
-                style_path = os.path.join(os.path.dirname(sys.executable), '..', 'Resources', 'src', 'styles', 'style.qss')
-            else:
-                # Other platforms
-                style_path = os.path.join(os.path.dirname(sys.executable), 'src', 'styles', 'style.qss')
-        else:
-            # Running as script
-            style_path = os.path.join(os.path.dirname(__file__), '..', 'styles', 'style.qss')
-        
-        # Check if the file exists
-        if not os.path.exists(style_path):
-            print(f"Warning: Stylesheet not found at {style_path}")
-            return
-            
-        # Read and apply the stylesheet
-        with open(style_path, 'r') as f:
-            stylesheet = f.read()
+        stylesheet = _load_stylesheet()
+        if stylesheet is not None:
             self.setStyleSheet(stylesheet)
-            print(f"Applied stylesheet from {style_path}")
     except Exception as e:
         print(f"Error applying stylesheet: {e}")
 
+@functools.lru_cache(maxsize=64)
+def _color_swatch_icon(rgb, width, height):
+    """Solid-colour icon for a QColor.rgb() value, painted once per colour and size."""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor.fromRgb(rgb))
+    return QIcon(pixmap)
+
+def set_color_swatch(button, color):
+    """Show color on a colour-picker button as an icon instead of restyling it.
+
+    Changing a widget's stylesheet makes Qt re-parse and re-polish it; swapping
+    a cached icon does not.
+    """
+    size = button.iconSize()
+    button.setIcon(_color_swatch_icon(color.rgb(), size.width(), size.height()))
+
+@contextlib.contextmanager
+def signals_blocked(*widgets):
+    """Hold a QSignalBlocker on each widget for the duration of the block.
+
+    Each widget's previous blocked state is restored on exit, including when
+    the block raises, so no control is left silently disconnected.
+    """
+    with contextlib.ExitStack() as stack:
+        for widget in widgets:
+            stack.enter_context(QSignalBlocker(widget))
+        yield
+
+@contextlib.contextmanager
+def signal_disconnected(signal, slot):
+    """Disconnect slot from signal for the duration of the block.
+
+    Unlike blocking signals, the widget's other signals keep firing. The slot
+    is reconnected on exit, including when the block raises.
+    """
+    signal.disconnect(slot)
+    try:
+        yield
+    finally:
+        signal.connect(slot)
+
+@contextlib.contextmanager
+def updates_disabled(widget):
+    """Hold repaints of widget for the duration of the block.
+
+    Re-enabling updates on exit, including when the block raises, repaints
+    the widget once instead of after every change made inside the block.
+    """
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+
+def connect_slider_settled(slider, handler, delay_ms=150):
+    """Call handler(value) when a slider change settles rather than on every step.
+
+    While the handle is held down only cheap listeners (e.g. the synced spinbox)
+    follow along; the handler runs once on release. Keyboard, wheel and spinbox
+    edits restart a short single-shot timer, so a burst of steps runs the
+    handler once after the last one.
+
+    Returns a flush() callable that runs a pending handler call immediately.
+    Call it before the handler's target changes (e.g. the selected item the
+    slider edits), so a pending edit is applied to the target it was made for.
+    """
+    timer = QTimer(slider)
+    timer.setSingleShot(True)
+    timer.setInterval(delay_ms)
+    timer.timeout.connect(lambda: handler(slider.value()))
+
+    def on_released():
+        timer.stop()
+        handler(slider.value())
+
+    def flush():
+        if timer.isActive():
+            timer.stop()
+            handler(slider.value())
+
+    slider.valueChanged.connect(lambda value: None if slider.isSliderDown() else timer.start())
+    slider.sliderReleased.connect(on_released)
+    return flush
+
 def resizeEvent(self, event):
     """Handle window resize events to update the image display."""
     super().resizeEvent(event)
@@ -46,7 +139,7 @@ def resizeEvent(self, event):
         self.export_panel.display_uvtt_preview()
     
     # Update the position of the update notification
-    if hasattr(self, 'update_notification'):
+    if getattr(self, 'update_notification', None) is not None:
         self.update_notification.setGeometry(
             self.width() - 250, 10, 240, 40
         )
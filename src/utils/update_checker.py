@@ -4,7 +4,7 @@ from urllib.request import Request, urlopen
 from urllib.error import URLError
 
 from PyQt6.QtGui import QDesktopServices
-from PyQt6.QtCore import QUrl
+from PyQt6.QtCore import QUrl, QObject, QRunnable, QThreadPool, pyqtSignal
 
 def parse_version(version_str):
     """Parse a version string into a tuple for comparison.
@@ -79,20 +79,48 @@ def fetch_version(current_version, github_repo):
 
     return False, current_version, ""
 
+class UpdateCheckSignals(QObject):
+    """Carries the update check result back to the GUI thread."""
+    finished = pyqtSignal(bool, str, str)
+
+class UpdateCheckWorker(QRunnable):
+    """Runs fetch_version on a QThreadPool thread so startup never waits on the network."""
+
+    def __init__(self, current_version, github_repo, signals):
+        super().__init__()
+        self.current_version = current_version
+        self.github_repo = github_repo
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = fetch_version(self.current_version, self.github_repo)
+        except Exception as e:
+            print(f"Error checking for updates: {e}")
+            return
+        self.signals.finished.emit(*result)
+
 def check_for_updates(self):
-    """Check for updates and show notification if available."""
+    """Start a background update check; the notification is shown when it finishes."""
+    # Keep a reference so the signal object outlives the runnable
+    self.update_check_signals = UpdateCheckSignals()
+    self.update_check_signals.finished.connect(
+        lambda available, version, url: show_update_notification(self, available, version, url)
+    )
+    QThreadPool.globalInstance().start(
+        UpdateCheckWorker(self.app_version, self.github_repo, self.update_check_signals)
+    )
+
+def show_update_notification(self, is_update_available, latest_version, download_url):
+    """Show the update notification if a newer version was found."""
     try:
-        is_update_available, latest_version, download_url = fetch_version(
-            self.app_version, self.github_repo
-        )
-        
         if is_update_available:
             self.update_available = True
             self.update_url = download_url
+            # Most runs find no update, so the widget is only built here
+            if self.update_notification is None:
+                self.setup_update_notification()
             self.update_text.setText(f"Update {latest_version} Available!")
-            # Ensure dismiss button is still visible and connected
-            if hasattr(self, 'dismiss_button'):
-                self.dismiss_button.show()
             self.update_notification.show()
             # Position the notification after it's shown and sized
             self.position_update_notification()
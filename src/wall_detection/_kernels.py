@@ -0,0 +1,150 @@
+"""
+Optional numba kernels for per-pixel hot loops in wall detection.
+
+Each kernel has a numpy fallback; callers check NUMBA_AVAILABLE and use the
+fallback when numba is not installed.
+"""
+import math
+import os
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+    prange = numba.prange
+    # The parallel kernels run on the detection worker thread; the TBB layer
+    # deadlocks at interpreter exit after being used off the main thread
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba.config.THREADING_LAYER = 'workqueue'
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+    prange = range
+
+
+def _color_distance_mask_kernel(image, target, weight, dark_boost, distance_threshold, out):
+    height, width = out.shape
+    tb, tg, tr = target[0], target[1], target[2]
+    for y in prange(height):
+        for x in range(width):
+            b = np.float32(image[y, x, 0])
+            g = np.float32(image[y, x, 1])
+            r = np.float32(image[y, x, 2])
+            db = b - tb
+            dg = g - tg
+            dr = r - tr
+            distance2 = weight * (db * db + dg * dg + dr * dr)
+            limit = distance_threshold
+            if dark_boost:
+                # Boost for dark pixels (reduces distance for darker pixels):
+                # max(d - boost, 0) <= t  is the same as  d <= t + boost
+                average_value = (b + g + r) / np.float32(3.0)
+                limit = limit + np.float32(math.exp(-(average_value / np.float32(30.0)))) * np.float32(20.0)
+            out[y, x] = 255 if distance2 <= limit * limit else 0
+
+
+if NUMBA_AVAILABLE:
+    try:
+        _color_distance_mask_numba = numba.njit(cache=True, parallel=True)(_color_distance_mask_kernel)
+    except Exception as e:
+        # e.g. no writable cache location in a frozen build
+        print(f"Numba kernels unavailable, using numpy fallback: {e}")
+        NUMBA_AVAILABLE = False
+
+
+class ColorDistanceScratch:
+    """Per-image buffers reused when masking the same image against several colours.
+
+    Holds a contiguous copy of the image, its float32 version, the squared
+    distance buffers and the dark-pixel boost, so each extra colour costs no
+    new full-size temporaries.
+    """
+
+    def __init__(self, image):
+        self.image = np.ascontiguousarray(image)
+        self._image_f32 = None
+        self._diff = None
+        self._dist2 = None
+        self._limit = None
+        self._dark_boost = None
+
+    def image_f32(self):
+        if self._image_f32 is None:
+            self._image_f32 = self.image.astype(np.float32)
+        return self._image_f32
+
+    def distance_buffers(self):
+        if self._diff is None:
+            self._diff = np.empty(self.image.shape[:2] + (3,), dtype=np.float32)
+            self._dist2 = np.empty(self.image.shape[:2], dtype=np.float32)
+        return self._diff, self._dist2
+
+    def dark_boost(self):
+        if self._dark_boost is None:
+            average_value = self.image_f32().sum(axis=-1) / np.float32(3.0)
+            self._dark_boost = np.exp(-(average_value / np.float32(30.0))) * np.float32(20.0)
+            self._limit = np.empty_like(self._dark_boost)
+        return self._dark_boost, self._limit
+
+
+def _color_distance_mask_numpy(image, target, weight, dark_boost, distance_threshold, out, scratch=None):
+    if scratch is None:
+        scratch = ColorDistanceScratch(image)
+    diff, dist2 = scratch.distance_buffers()
+    # Compare squared distances so no sqrt is needed
+    np.subtract(scratch.image_f32(), target, out=diff)
+    np.square(diff, out=diff)
+    diff.sum(axis=-1, out=dist2)
+    if weight != 1.0:
+        dist2 *= np.float32(weight)
+    match = out.view(np.bool_)
+    if dark_boost:
+        # max(d - boost, 0) <= t  is the same as  d <= t + boost
+        boost, limit = scratch.dark_boost()
+        np.add(boost, np.float32(distance_threshold), out=limit)
+        np.square(limit, out=limit)
+        np.less_equal(dist2, limit, out=match)
+    else:
+        np.less_equal(dist2, np.float32(distance_threshold) ** 2, out=match)
+    out *= 255
+
+
+def color_distance_mask(image, target_color, distance_threshold, weight=1.0, dark_boost=False, scratch=None):
+    """
+    Binary mask of pixels within distance_threshold of target_color.
+
+    Parameters:
+    - image: 3-channel BGR image (uint8)
+    - target_color: (B,G,R) tuple
+    - distance_threshold: Maximum weighted Euclidean distance in color space
+    - weight: Per-channel weight applied to the squared differences
+    - dark_boost: Subtract a darkness bonus from the distance (used for black targets)
+    - scratch: Optional ColorDistanceScratch for image, shared across colours
+
+    Returns:
+    - uint8 mask with matching pixels as 255
+    """
+    out = np.empty(image.shape[:2], dtype=np.uint8)
+    target = np.asarray(target_color, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        contiguous = scratch.image if scratch is not None else np.ascontiguousarray(image)
+        try:
+            _color_distance_mask_numba(contiguous, target, np.float32(weight),
+                                       bool(dark_boost), np.float32(distance_threshold), out)
+            return out
+        except Exception as e:
+            print(f"Numba color mask failed, using numpy fallback: {e}")
+    _color_distance_mask_numpy(image, target, weight, dark_boost, distance_threshold, out, scratch)
+    return out
+
+
+def warm_up():
+    """Compile the kernels on a tiny input so the first real call is fast."""
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        color_distance_mask(np.zeros((2, 2, 3), dtype=np.uint8), (0, 0, 0), 1.0)
+        color_distance_mask(np.zeros((2, 2, 3), dtype=np.uint8), (0, 0, 0), 1.0, weight=0.8, dark_boost=True)
+    except Exception as e:
+        print(f"Numba kernel warm-up failed: {e}")
@@ -1,10 +1,98 @@
+import logging
+
 import cv2
 import numpy as np
 from .light_detector import detect_lights, scale_lights_to_grid
+from ._kernels import color_distance_mask, ColorDistanceScratch
+
+# Per-run diagnostics; the application drops them below INFO by default
+logger = logging.getLogger("auto_wall.pipeline")
+
+def blurred_grayscale(image, blur_kernel_size=5):
+    """
+    Grayscale version of a BGR image with Gaussian blur applied, as fed to Canny.
+
+    Parameters:
+    - image: Input BGR image
+    - blur_kernel_size: Kernel size for Gaussian blur (use 1 for no blur)
+
+    Returns:
+    - Single-channel uint8 image
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    # Apply Gaussian Blur to reduce noise if blur_kernel_size > 1
+    if blur_kernel_size > 1:
+        return cv2.GaussianBlur(gray, (blur_kernel_size, blur_kernel_size), 0)
+    return gray  # No blur if kernel size is 1
+
+def edge_components(blurred, canny_threshold1=50, canny_threshold2=150):
+    """
+    Connected components of the filled Canny contours of a blurred grayscale image.
+
+    Touching contours are merged by a one-pixel dilation first. This is the
+    part of edge detection that does not depend on the area or edge margin
+    settings, so it can be reused while only those change.
+
+    Parameters:
+    - blurred: Result of blurred_grayscale()
+    - canny_threshold1: Lower threshold for Canny edge detection
+    - canny_threshold2: Upper threshold for Canny edge detection
+
+    Returns:
+    - Tuple (num_labels, labels, stats) as from cv2.connectedComponentsWithStats
+    """
+    # Apply Canny edge detection
+    edges = cv2.Canny(blurred, canny_threshold1, canny_threshold2)
+    
+    # Find contours - changed to retrieve hierarchical contours
+    contours, hierarchy = cv2.findContours(edges, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # Process contours - Generate filled mask
+    contour_mask = np.zeros(blurred.shape, dtype=np.uint8)
+    cv2.drawContours(contour_mask, contours, -1, 255, thickness=cv2.FILLED)
+    
+    # Find touching contours - dilate slightly and run connectedComponents
+    kernel = np.ones((3, 3), np.uint8)
+    working_mask = cv2.dilate(contour_mask, kernel, iterations=1)
+    
+    # Find connected components (treats touching contours as one)
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(working_mask)
+    return num_labels, labels, stats
+
+def color_contours(image, wall_colors, color_threshold=20):
+    """
+    Contours of the pixels matching any of the wall colours, before area filtering.
+
+    Parameters:
+    - image: Input BGR image
+    - wall_colors: Colours in any of the forms detect_walls accepts
+    - color_threshold: Default threshold for colors without specific threshold (0-100)
+
+    Returns:
+    - Tuple (contours, hierarchy) as from cv2.findContours with RETR_CCOMP
+    """
+    if not isinstance(wall_colors, list):
+        # Convert single color to list with default threshold
+        wall_colors = [(wall_colors, color_threshold)]
+    elif len(wall_colors) > 0 and not isinstance(wall_colors[0], tuple):
+        # Convert list of colors to list of (color, default_threshold) tuples
+        wall_colors = [(color, color_threshold) for color in wall_colors]
+    elif len(wall_colors) > 0 and isinstance(wall_colors[0], tuple) and len(wall_colors[0]) == 3:
+        # It's a list of color tuples, convert to (color, threshold) format
+        wall_colors = [(color, color_threshold) for color in wall_colors]
+    
+    # Create a mask that combines all specified colors with their thresholds
+    color_mask = create_multi_color_mask(image, wall_colors)
+    
+    # Find contours directly on the color mask
+    # Changed from RETR_EXTERNAL to RETR_CCOMP to detect holes/interior walls
+    return cv2.findContours(color_mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
 
 def detect_walls(image, min_contour_area=100, max_contour_area=None, blur_kernel_size=5, 
                 canny_threshold1=50, canny_threshold2=150, edge_margin=0,
-                wall_colors=None, color_threshold=20):
+                wall_colors=None, color_threshold=20, blurred=None, components=None,
+                color_regions=None):
     """
     Detect walls in an image with adjustable parameters.
     
@@ -22,66 +110,38 @@ def detect_walls(image, min_contour_area=100, max_contour_area=None, blur_kernel
                   - A list of BGR color tuples
                   - A list of (BGR color tuple, threshold) pairs for per-color thresholds
     - color_threshold: Default threshold for colors without specific threshold (0-100)
+    - blurred: Optional result of blurred_grayscale(image, blur_kernel_size) to
+               reuse, e.g. when only the Canny thresholds changed
+    - components: Optional result of edge_components() for these settings to
+                  reuse, e.g. when only the area or edge margin changed
+    - color_regions: Optional result of color_contours() for these colours to
+                     reuse, e.g. when only the area changed
     
     Returns:
     - List of contours representing walls
     """
-    # Create a copy of the image for processing
-    working_image = image.copy()
-    
     # If wall colors are provided, use direct color-based contour detection
     if wall_colors is not None:
-        if not isinstance(wall_colors, list):
-            # Convert single color to list with default threshold
-            wall_colors = [(wall_colors, color_threshold)]
-        elif len(wall_colors) > 0 and not isinstance(wall_colors[0], tuple):
-            # Convert list of colors to list of (color, default_threshold) tuples
-            wall_colors = [(color, color_threshold) for color in wall_colors]
-        elif len(wall_colors) > 0 and isinstance(wall_colors[0], tuple) and len(wall_colors[0]) == 3:
-            # It's a list of color tuples, convert to (color, threshold) format
-            wall_colors = [(color, color_threshold) for color in wall_colors]
-        
-        # Create a mask that combines all specified colors with their thresholds
-        color_mask = create_multi_color_mask(image, wall_colors)
-        
-        # Find contours directly on the color mask
-        # Changed from RETR_EXTERNAL to RETR_CCOMP to detect holes/interior walls
-        color_contours, hierarchy = cv2.findContours(color_mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        if color_regions is None:
+            color_regions = color_contours(image, wall_colors, color_threshold)
+        found_contours, hierarchy = color_regions
         
         # Process contours based on hierarchy to include both outer and inner contours
-        result_contours = process_contours_with_hierarchy(color_contours, hierarchy, min_contour_area, max_contour_area)
+        result_contours = process_contours_with_hierarchy(found_contours, hierarchy, min_contour_area, max_contour_area)
         
-        print(f"Color-based detection found {len(color_contours)} contours, {len(result_contours)} after filtering by area")
+        logger.debug("Color-based detection found %d contours, %d after filtering by area",
+                     len(found_contours), len(result_contours))
         
         # Return the filtered contours
         return result_contours
     
     # If no wall colors provided, continue with standard edge detection approach
-    # Convert to grayscale
-    gray = cv2.cvtColor(working_image, cv2.COLOR_BGR2GRAY)
-
-    # Apply Gaussian Blur to reduce noise if blur_kernel_size > 1
-    if blur_kernel_size > 1:
-        blurred = cv2.GaussianBlur(gray, (blur_kernel_size, blur_kernel_size), 0)
-    else:
-        blurred = gray  # No blur if kernel size is 1
-
-    # Apply Canny edge detection
-    edges = cv2.Canny(blurred, canny_threshold1, canny_threshold2)
-    
-    # Find contours - changed to retrieve hierarchical contours
-    contours, hierarchy = cv2.findContours(edges, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
-    
-    # Process contours - Generate filled mask
-    contour_mask = np.zeros(gray.shape, dtype=np.uint8)
-    cv2.drawContours(contour_mask, contours, -1, 255, thickness=cv2.FILLED)
-    
-    # Find touching contours - dilate slightly and run connectedComponents
+    if components is None:
+        if blurred is None:
+            blurred = blurred_grayscale(image, blur_kernel_size)
+        components = edge_components(blurred, canny_threshold1, canny_threshold2)
+    num_labels, labels, stats = components
     kernel = np.ones((3, 3), np.uint8)
-    working_mask = cv2.dilate(contour_mask, kernel, iterations=1)
-    
-    # Find connected components (treats touching contours as one)
-    num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(working_mask)
 
     # Process each connected component
     result_contours = []
@@ -94,13 +154,17 @@ def detect_walls(image, min_contour_area=100, max_contour_area=None, blur_kernel
             
             # Apply area filtering
             if area >= min_contour_area and (max_contour_area is None or area <= max_contour_area):
-                # Extract the contours for this component
-                component_mask = np.zeros_like(labels, dtype=np.uint8)
-                component_mask[labels == i] = 255
+                # Extract the contours for this component from its bounding box,
+                # padded by a pixel so the mask edge stays background
+                x0 = max(stats[i, cv2.CC_STAT_LEFT] - 1, 0)
+                y0 = max(stats[i, cv2.CC_STAT_TOP] - 1, 0)
+                x1 = stats[i, cv2.CC_STAT_LEFT] + stats[i, cv2.CC_STAT_WIDTH] + 1
+                y1 = stats[i, cv2.CC_STAT_TOP] + stats[i, cv2.CC_STAT_HEIGHT] + 1
+                component_mask = (labels[y0:y1, x0:x1] == i).view(np.uint8)
                 
                 # Find all contours in this component (including holes)
                 component_contours, component_hierarchy = cv2.findContours(
-                    component_mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE
+                    component_mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE, offset=(int(x0), int(y0))
                 )
                 
                 # Process and add contours from this component
@@ -112,9 +176,9 @@ def detect_walls(image, min_contour_area=100, max_contour_area=None, blur_kernel
     # Handle edge margin case
     else:
         # Create center mask and edge boundary
-        height, width = gray.shape
-        center_mask = np.zeros_like(gray, dtype=np.uint8)
-        edge_boundary = np.zeros_like(gray, dtype=np.uint8)
+        height, width = labels.shape
+        center_mask = np.zeros((height, width), dtype=np.uint8)
+        edge_boundary = np.zeros((height, width), dtype=np.uint8)
         
         # Draw the center region and boundary
         cv2.rectangle(
@@ -132,7 +196,7 @@ def detect_walls(image, min_contour_area=100, max_contour_area=None, blur_kernel
         )
         
         # Create edge mask for detecting edge intersections
-        edge_mask = np.zeros_like(gray, dtype=np.uint8)
+        edge_mask = np.zeros((height, width), dtype=np.uint8)
         cv2.rectangle(edge_mask, (0, 0), (width-1, height-1), 255, 1)
         
         # Process each connected component separately
@@ -308,18 +372,72 @@ def create_multi_color_mask(image, color_threshold_pairs):
     """
     if not color_threshold_pairs:
         return np.zeros(image.shape[:2], dtype=np.uint8)
+    
+    # Check if input image has an alpha channel and handle it
+    if len(image.shape) > 2 and image.shape[2] == 4:
+        image = image[:, :, :3]
         
     # Start with an empty mask
     combined_mask = np.zeros(image.shape[:2], dtype=np.uint8)
     
-    # Create a mask for each color and threshold pair, combining them with OR operation
+    # Buffers shared by every color so each one doesn't reallocate the float image
+    scratch = {}
+    
+    # Exact-match colors (threshold 0) get no morphology, so all of them can be
+    # matched in one pass per source image; dark targets match the normalized image
+    exact_colors = {False: [], True: []}
+    for color, threshold in color_threshold_pairs:
+        if threshold == 0:
+            exact_colors[sum(color) < 60].append(color)
+    for is_dark, colors in exact_colors.items():
+        if colors:
+            source = _dark_normalized_image(image, scratch) if is_dark else image
+            cv2.bitwise_or(combined_mask, _exact_colors_mask(source, colors), dst=combined_mask)
+    
+    # Create a mask for each remaining color and threshold pair, combining them with OR operation
     for color, threshold in color_threshold_pairs:
-        color_mask = create_color_mask(image, color, threshold)
-        combined_mask = cv2.bitwise_or(combined_mask, color_mask)
+        if threshold == 0:
+            continue
+        color_mask = create_color_mask(image, color, threshold, scratch)
+        cv2.bitwise_or(combined_mask, color_mask, dst=combined_mask)
     
     return combined_mask
 
-def create_color_mask(image, target_color, threshold):
+def _exact_colors_mask(image, colors):
+    """Mask of pixels exactly equal to any of colors, via packed 24-bit BGR values."""
+    image = image.astype(np.uint32)
+    packed = image[:, :, 0] | (image[:, :, 1] << 8) | (image[:, :, 2] << 16)
+    targets = np.array([int(b) | (int(g) << 8) | (int(r) << 16) for b, g, r in colors], dtype=np.uint32)
+    return np.isin(packed, targets).astype(np.uint8) * 255
+
+def _dark_normalized_image(image, scratch):
+    """Image used to match near-black targets, computed once per scratch dict.
+
+    If the image has any near-black pixels every channel is scaled by 0.9 so
+    that subtle PNG/WebP differences in blacks collapse together; otherwise
+    the image itself is used.
+    """
+    if 'normalized' not in scratch:
+        normalized_image = image
+        # Get RGB channels
+        b, g, r = cv2.split(image)
+        
+        # Detect "near black" pixels - pixels that are very dark but not pure black
+        dark_mask = (b <= 30) & (g <= 30) & (r <= 30)
+        
+        # Normalize very dark pixels to increase detection consistency
+        if np.any(dark_mask):
+            # Force near-black pixels to be more similar
+            normalized_b = np.clip(b.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
+            normalized_g = np.clip(g.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
+            normalized_r = np.clip(r.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
+            
+            # Create normalized image specifically for black detection
+            normalized_image = cv2.merge([normalized_b, normalized_g, normalized_r])
+        scratch['normalized'] = normalized_image
+    return scratch['normalized']
+
+def create_color_mask(image, target_color, threshold, scratch=None):
     """
     Create a binary mask where pixels similar to target_color are white (255),
     and all other pixels are black (0). Enhanced for consistent WebP/PNG color matching.
@@ -330,6 +448,8 @@ def create_color_mask(image, target_color, threshold):
     - threshold: How close a color needs to be to target_color (0-100)
                 Higher values are more lenient, lower values more strict
                 A value of 0 means exact color match only
+    - scratch: Optional dict reused across calls on the same image to hold
+               the distance buffers and the normalized dark image
     
     Returns:
     - Binary mask with matching pixels as white (255)
@@ -341,28 +461,16 @@ def create_color_mask(image, target_color, threshold):
     
     # Make a normalized copy for consistent color detection, especially for blacks
     # This helps with subtle variations between PNG and WebP color spaces
-    normalized_image = image.copy().astype(np.float32)
+    normalized_image = image
     
     # Special handling for very dark colors (blacks)
     is_dark_target = sum(target_color) < 60  # Check if target is near black
+    if scratch is None:
+        scratch = {}
     
     # For black colors specifically, apply a normalization step
     if is_dark_target:
-        # Get RGB channels
-        b, g, r = cv2.split(image)
-        
-        # Detect "near black" pixels - pixels that are very dark but not pure black
-        dark_mask = (b <= 30) & (g <= 30) & (r <= 30)
-        
-        # Normalize very dark pixels to increase detection consistency
-        if np.any(dark_mask):
-            # Force near-black pixels to be more similar
-            normalized_b = np.clip(b.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
-            normalized_g = np.clip(g.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
-            normalized_r = np.clip(r.astype(np.float32) * 0.9, 0, 255).astype(np.uint8)
-            
-            # Create normalized image specifically for black detection
-            normalized_image = cv2.merge([normalized_b, normalized_g, normalized_r])
+        normalized_image = _dark_normalized_image(image, scratch)
     
     # Special case for threshold=0: exact color match only
     if threshold == 0:
@@ -397,38 +505,19 @@ def create_color_mask(image, target_color, threshold):
     else:  # Medium to bright colors
         distance_threshold = (threshold / 100.0) * (max_distance / 2.5)
     
-    # Extract channels
-    if is_dark_target:
-        # Use normalized image for dark colors
-        b, g, r = cv2.split(normalized_image)
-    else:
-        # Use original image for other colors
-        b, g, r = cv2.split(image)
-    
-    # Calculate absolute difference from target color for each channel
-    b_diff = np.abs(b.astype(np.float32) - target_color[0])
-    g_diff = np.abs(g.astype(np.float32) - target_color[1])
-    r_diff = np.abs(r.astype(np.float32) - target_color[2])
-    
-    # Calculate weighted Euclidean distance in color space
-    # For black detection, emphasize overall darkness over exact channel matching
+    # Calculate weighted Euclidean distance in color space and threshold it
     if is_dark_target:
-        # For blacks, weight the overall darkness more heavily
-        color_distance = np.sqrt(0.8*b_diff*b_diff + 0.8*g_diff*g_diff + 0.8*r_diff*r_diff)
-        
-        # Add an extra condition for very dark pixels
-        average_value = (b.astype(np.float32) + g.astype(np.float32) + r.astype(np.float32)) / 3
-        darkness_boost = np.exp(-(average_value / 30.0)) * 20  # Boost for dark pixels
-        
-        # Apply the darkness boost (reduces distance for darker pixels)
-        color_distance = np.maximum(color_distance - darkness_boost, 0)
+        # Use normalized image for dark colors; for blacks, weight the overall
+        # darkness more heavily and boost very dark pixels
+        if 'normalized_buffers' not in scratch:
+            scratch['normalized_buffers'] = ColorDistanceScratch(normalized_image)
+        mask = color_distance_mask(normalized_image, target_color, distance_threshold, weight=0.8, dark_boost=True,
+                                   scratch=scratch['normalized_buffers'])
     else:
-        # Standard distance for non-black colors
-        color_distance = np.sqrt(b_diff*b_diff + g_diff*g_diff + r_diff*r_diff)
-    
-    # Create binary mask where pixels closer than threshold are white (255)
-    mask = np.zeros_like(b, dtype=np.uint8)
-    mask[color_distance <= distance_threshold] = 255
+        # Standard distance for non-black colors on the original image
+        if 'buffers' not in scratch:
+            scratch['buffers'] = ColorDistanceScratch(image)
+        mask = color_distance_mask(image, target_color, distance_threshold, scratch=scratch['buffers'])
     
     # Apply morphological operations to clean up the mask
     kernel = np.ones((3,3), np.uint8)
@@ -671,8 +760,9 @@ def split_edge_contours(image, contours):
             unchanged_count += 1
     
     # Print detailed statistics
-    print(f"Split edge contours: {original_count} original, {edge_touching_count} edge-touching, "
-          f"{new_contours_count} new contours created, {unchanged_count} kept unchanged, {len(result_contours)} total")
+    logger.debug("Split edge contours: %d original, %d edge-touching, %d new contours created, "
+                 "%d kept unchanged, %d total", original_count, edge_touching_count,
+                 new_contours_count, unchanged_count, len(result_contours))
     
     return result_contours
 
@@ -721,7 +811,7 @@ def remove_hatching_lines(image, color, threshold, max_width):
     # Save original mask size for reporting
     original_mask_size = cv2.countNonZero(color_mask)
     if original_mask_size == 0:
-        print("No pixels matching the specified color found")
+        logger.debug("No pixels matching the specified color found")
         return result
     
     # 1. Create a structuring element for morphological operations
@@ -758,26 +848,15 @@ def remove_hatching_lines(image, color, threshold, max_width):
             # Use a medium color that's not too dark
             replacement_b, replacement_g, replacement_r = 120, 120, 120
         
-        # 5. Replace the hatching lines with the replacement color
-        # First create a 3-channel mask for each BGR channel
-        hatching_mask_bgr = cv2.merge([hatching_mask, hatching_mask, hatching_mask])
-        
-        # Create an image of the replacement color, same shape as the input image
-        replacement = np.zeros_like(result)
-        replacement[:] = (replacement_b, replacement_g, replacement_r)
-        
-        # Replace only the hatching pixels with the replacement color
-        # Keep original pixels where mask is 0, use replacement color where mask is 255
-        masked_replacement = cv2.bitwise_and(replacement, hatching_mask_bgr)
-        masked_original = cv2.bitwise_and(result, cv2.bitwise_not(hatching_mask_bgr))
-        result = cv2.add(masked_original, masked_replacement)
+        # 5. Replace only the hatching pixels with the replacement color, in place
+        result[hatching_mask != 0] = (replacement_b, replacement_g, replacement_r)
         
         # Report the results
         hatching_percentage = (hatching_pixel_count / original_mask_size) * 100 if original_mask_size > 0 else 0
-        print(f"Removed {hatching_pixel_count} hatching pixels ({hatching_percentage:.1f}% of colored pixels)")
-        print(f"Replaced with color BGR: {replacement_b}, {replacement_g}, {replacement_r}")
+        logger.debug("Removed %d hatching pixels (%.1f%% of colored pixels)", hatching_pixel_count, hatching_percentage)
+        logger.debug("Replaced with color BGR: %d, %d, %d", replacement_b, replacement_g, replacement_r)
     else:
-        print("No hatching lines detected that match the criteria")
+        logger.debug("No hatching lines detected that match the criteria")
     
     return result
 
@@ -810,8 +889,10 @@ def detect_lights_in_image(image, brightness_threshold=0.8, min_area=5, max_area
     scaled_lights = scale_lights_to_grid(lights, image.shape, grid_size, scale_factor)
     
     if light_colors:
-        print(f"Detected {len(scaled_lights)} lights using {len(light_colors)} specified colors (merged within {merge_distance}px)")
+        logger.debug("Detected %d lights using %d specified colors (merged within %spx)",
+                     len(scaled_lights), len(light_colors), merge_distance)
     else:
-        print(f"Detected {len(scaled_lights)} lights with brightness threshold {brightness_threshold} (merged within {merge_distance}px)")
+        logger.debug("Detected %d lights with brightness threshold %s (merged within %spx)",
+                     len(scaled_lights), brightness_threshold, merge_distance)
     
     return scaled_lights
\ No newline at end of file
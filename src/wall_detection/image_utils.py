@@ -2,7 +2,6 @@ import cv2
 import numpy as np
 import os
 from urllib.parse import urlparse
-import requests
 from io import BytesIO
 import traceback
 
@@ -36,7 +35,8 @@ def load_image(image_path):
         # Load image
         image = None
         if is_url:
-            # Handle URL loading
+            # Handle URL loading; requests is slow to import, so only load it here
+            import requests
             response = requests.get(image_path)
             img_array = np.frombuffer(response.content, np.uint8)
             image = cv2.imdecode(img_array, cv2.IMREAD_UNCHANGED)
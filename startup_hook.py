@@ -58,12 +58,6 @@ try:
 except Exception as e:
     print(f"Error importing OpenCV: {e}")
 
-try:
-    import sklearn
-    print(f"scikit-learn version: {sklearn.__version__}")
-except Exception as e:
-    print(f"Error importing scikit-learn: {e}")
-
 try:
     from PyQt6.QtWidgets import QApplication
     print("PyQt6 imported successfully")
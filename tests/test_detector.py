@@ -7,7 +7,8 @@ import sys
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.wall_detection.detector import detect_walls, draw_walls
+from src.wall_detection.detector import detect_walls, draw_walls, create_color_mask, create_multi_color_mask, remove_hatching_lines
+from src.wall_detection import _kernels
 
 class TestDetector(unittest.TestCase):
     def setUp(self):
@@ -26,5 +27,30 @@ class TestDetector(unittest.TestCase):
         result = draw_walls(self.test_image, contours)
         self.assertEqual(result.shape, self.test_image.shape)
 
+    def test_color_distance_mask_matches_numpy(self):
+        image = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+        for target, threshold, weight, dark_boost in [((10, 10, 10), 30.0, 0.8, True), ((120, 50, 200), 60.0, 1.0, False)]:
+            expected = np.empty(image.shape[:2], dtype=np.uint8)
+            _kernels._color_distance_mask_numpy(image, np.asarray(target, dtype=np.float32), weight, dark_boost, threshold, expected)
+            result = _kernels.color_distance_mask(image, target, threshold, weight=weight, dark_boost=dark_boost)
+            np.testing.assert_array_equal(result, expected)
+
+    def test_multi_color_mask_matches_per_color_masks(self):
+        image = np.random.default_rng(1).integers(0, 8, (64, 64, 3), dtype=np.uint8) * 4
+        pairs = [((0, 4, 8), 0), ((12, 12, 0), 0), ((28, 28, 28), 0), ((20, 4, 16), 15.0)]
+        expected = np.zeros(image.shape[:2], dtype=np.uint8)
+        for color, threshold in pairs:
+            expected |= create_color_mask(image, color, threshold)
+        np.testing.assert_array_equal(create_multi_color_mask(image, pairs), expected)
+
+    def test_remove_hatching_lines_keeps_thick_walls(self):
+        image = np.full((100, 100, 3), 255, dtype=np.uint8)
+        cv2.rectangle(image, (10, 10), (40, 40), (0, 0, 0), -1)
+        cv2.line(image, (60, 5), (60, 95), (0, 0, 0), 3)
+        result = remove_hatching_lines(image, (0, 0, 0), 10.0, 3)
+        np.testing.assert_array_equal(result[60, 60], (180, 180, 180))
+        np.testing.assert_array_equal(result[25, 25], (0, 0, 0))
+        np.testing.assert_array_equal(result[80, 20], (255, 255, 255))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import cv2
+import numpy as np
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import _geom
+from src.utils.geometry import contours_near_point, find_contour_near_point
+
+class TestGeometry(unittest.TestCase):
+    def test_contours_near_point_follows_list_changes(self):
+        contours = [np.array([[[10, 10]], [[20, 10]], [[20, 20]]], dtype=np.int32),
+                    np.array([[[200, 200]], [[300, 200]], [[300, 260]]], dtype=np.int32)]
+        app = SimpleNamespace(current_contours=contours, _contour_bboxes=None,
+                              _contour_grid=None, _contour_bboxes_source=None)
+        self.assertEqual(contours_near_point(app, 12, 24), [0])
+        self.assertEqual(contours_near_point(app, 250, 195), [1])
+        self.assertEqual(contours_near_point(app, 100, 100), [])
+        contours.pop(0)
+        self.assertEqual(contours_near_point(app, 12, 24), [])
+        self.assertEqual(contours_near_point(app, 250, 195), [0])
+
+    def test_closest_contour_matches_numpy(self):
+        rng = np.random.default_rng(1)
+        contours = [rng.integers(0, 200, (int(rng.integers(1, 30)), 2)).astype(np.float32) for _ in range(20)]
+        flat_points = np.concatenate(contours)
+        offsets = np.cumsum([0] + [len(c) for c in contours]).astype(np.int64)
+        candidates = np.arange(len(contours), dtype=np.int64)
+        for x, y in rng.integers(0, 200, (100, 2)):
+            found, dist2 = _geom.closest_contour(x, y, flat_points, offsets, candidates, 25.0)
+            expected, expected_dist2 = _geom._closest_contour_numpy(x, y, flat_points, offsets, candidates, 25.0)
+            self.assertEqual(found, expected)
+            self.assertAlmostEqual(dist2, expected_dist2, places=2)
+
+    def test_closest_contour_stops_at_first_contour_under_a_pixel(self):
+        # Contour 0 is half a pixel away; contour 1 passes through the point
+        # but comes later, so the search never reaches it
+        contours = [np.array([[0, 0.5], [10, 0.5]], dtype=np.float32),
+                    np.array([[0, 0], [10, 0]], dtype=np.float32)]
+        flat_points = np.concatenate(contours)
+        offsets = np.array([0, 2, 4], dtype=np.int64)
+        candidates = np.array([0, 1], dtype=np.int64)
+        for search in (_geom.closest_contour, _geom._closest_contour_numpy):
+            found, dist2 = search(5, 0, flat_points, offsets, candidates, 25.0)
+            self.assertEqual(found, 0)
+            self.assertAlmostEqual(dist2, 0.25, places=4)
+
+    def test_find_contour_near_point_matches_brute_force(self):
+        mask = np.zeros((300, 300), dtype=np.uint8)
+        rng = np.random.default_rng(2)
+        for _ in range(12):
+            center = tuple(int(v) for v in rng.integers(0, 300, 2))
+            axes = (int(rng.integers(5, 100)), int(rng.integers(3, 40)))
+            cv2.ellipse(mask, center, axes, float(rng.uniform(0, 180)), 0, 360, 255, int(rng.integers(1, 5)))
+        contours, _ = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        app = SimpleNamespace(current_contours=list(contours), scale_factor=1.0, original_image=None,
+                              _contour_bboxes=None, _contour_grid=None, _contour_bboxes_source=None)
+
+        def edge_distances(x, y):
+            # Exact float64 distance from (x,y) to every edge of every full contour
+            distances = []
+            for contour in contours:
+                points = contour.reshape(-1, 2).astype(np.float64)
+                ab = np.roll(points, -1, axis=0) - points
+                ap = np.array([x, y]) - points
+                t = np.clip((ap * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-12), 0.0, 1.0)
+                distances.append(np.sqrt(((ap - t[:, None] * ab) ** 2).sum(axis=1).min()))
+            return distances
+
+        hits = 0
+        for x, y in rng.uniform(0, 300, (300, 2)):
+            distances = edge_distances(x, y)
+            # Nearest edge under the threshold; the first contour under a pixel wins
+            expected, best = -1, 5
+            for i, distance in enumerate(distances):
+                if distance < best:
+                    expected, best = i, distance
+                if best < 1:
+                    break
+            found = find_contour_near_point(app, x, y)
+            if expected == -1 or found == -1:
+                self.assertEqual(found, expected)
+            else:
+                # Both sides of a thin wall can be exactly as far away
+                hits += 1
+                self.assertAlmostEqual(distances[found], distances[expected], places=4)
+        self.assertGreater(hits, 0)
+
+    def test_find_contour_near_point_picks_nearest_edge(self):
+        contours = [np.array([[[10, 10]], [[40, 10]], [[40, 40]], [[10, 40]]], dtype=np.int32),
+                    np.array([[[12, 12]], [[38, 12]], [[38, 38]], [[12, 38]]], dtype=np.int32)]
+        app = SimpleNamespace(current_contours=contours, scale_factor=1.0, original_image=None,
+                              _contour_bboxes=None, _contour_grid=None, _contour_bboxes_source=None)
+        self.assertEqual(find_contour_near_point(app, 25, 10), 0)
+        self.assertEqual(find_contour_near_point(app, 25, 13), 1)
+        self.assertEqual(find_contour_near_point(app, 25, 25), -1)
+
+if __name__ == "__main__":
+    unittest.main()